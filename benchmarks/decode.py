@@ -0,0 +1,60 @@
+"""
+    Benchmark for decoding response pages to models.
+
+    Run from the project root: python benchmarks/decode.py [items per page]
+"""
+
+import json
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Import the package from the project root, not an installed version.
+sys.path.insert(0, ROOT)
+
+from pinterest.models import CatalogItemsResponse, PinsResponse
+from pinterest.models.base import MODEL_MODES
+
+
+def load_data(filename):
+    with open(filename, "rb") as f:
+        return json.loads(f.read().decode("utf-8"))
+
+
+def main(size: int = 250, number: int = 20):
+    pin_data = load_data(os.path.join(ROOT, "tests/data/pins/pin_data.json"))
+    items_data = load_data(
+        os.path.join(ROOT, "tests/data/catalogs/get_catalog_items_resp.json")
+    )
+    pages = {
+        PinsResponse: {"items": [pin_data] * size, "bookmark": "bookmark"},
+        CatalogItemsResponse: {"items": items_data["items"] * size, "bookmark": None},
+    }
+    for model, page in pages.items():
+        assert model.from_dict(page) == model.new_from_json_dict(page)
+        slow = timeit.timeit(lambda: model.from_dict(page), number=number)
+        fast = timeit.timeit(lambda: model.new_from_json_dict(page), number=number)
+        print(
+            f"{model.__name__} ({len(page['items'])} items): "
+            f"from_dict {slow / number * 1000:.2f}ms, "
+            f"new_from_json_dict {fast / number * 1000:.2f}ms, "
+            f"{slow / fast:.1f}x"
+        )
+
+    # Shallow consumers only read the ids of the items.
+    for model, page in pages.items():
+        timings = []
+        for mode in MODEL_MODES:
+
+            def shallow():
+                for item in model.new_from_json_dict(page, mode=mode).items:
+                    getattr(item, "id", None) or getattr(item, "item_id", None)
+
+            cost = timeit.timeit(shallow, number=number)
+            timings.append(f"{mode} {cost / number * 1000:.2f}ms")
+        print(f"{model.__name__} read ids: {', '.join(timings)}")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,205 @@
+"""
+    Benchmark for HTTP/1.1 and HTTP/2 clients under concurrent requests, against a local server
+    which replies after a fixed latency and counts the connections opened by the client.
+
+    The local server has no TLS, so HTTP/2 is used by prior knowledge. For api.pinterest.com,
+    HTTP/2 is negotiated in the TLS handshake with http2=True.
+    The sync Api only runs HTTP/1.1 before httpcore 1.0, see pinterest.api.SYNC_HTTP2.
+
+    Need the h2 package: pip install python-pinterest[http2]
+    Run from the project root: python benchmarks/http2.py [requests] [concurrency] [latency_ms]
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import h2.config
+import h2.connection
+import h2.events
+import h2.exceptions
+from httpx import AsyncClient, Client, Limits
+
+# Import the package from the project root, not an installed version.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pinterest as pin
+from pinterest.api import SYNC_HTTP2
+from pinterest.utils.concurrency import run_in_threads
+
+BODY = b'{"id": "1", "title": "benchmark"}'
+
+
+class LocalServer:
+    """Server for HTTP/1.1 and HTTP/2 without TLS, in a background thread."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.connections = 0
+        self.tasks = set()
+        self.loop = asyncio.new_event_loop()
+        self.server = self.loop.run_until_complete(
+            asyncio.start_server(self.handle, "127.0.0.1", 0)
+        )
+        self.url = f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}/v5/"
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        asyncio.run_coroutine_threadsafe(self.shutdown(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+    async def shutdown(self):
+        self.server.close()
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        task = asyncio.current_task()
+        self.tasks.add(task)
+        try:
+            data = await reader.read(65535)
+            if data.startswith(b"PRI * HTTP/2.0"):
+                await self.handle_http2(reader, writer, data)
+            else:
+                await self.handle_http1(reader, writer, data)
+        except (ConnectionError, asyncio.CancelledError):
+            # Closed by the client, or cancelled by shutdown.
+            pass
+        finally:
+            self.tasks.discard(task)
+            writer.close()
+
+    async def handle_http1(self, reader, writer, data):
+        while data:
+            while b"\r\n\r\n" not in data:
+                chunk = await reader.read(65535)
+                if not chunk:
+                    return
+                data += chunk
+            _, data = data.split(b"\r\n\r\n", 1)
+            await asyncio.sleep(self.latency)
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                b"Content-Length: %d\r\n\r\n%s" % (len(BODY), BODY)
+            )
+            await writer.drain()
+            if not data:
+                data = await reader.read(65535)
+
+    async def handle_http2(self, reader, writer, data):
+        conn = h2.connection.H2Connection(
+            config=h2.config.H2Configuration(client_side=False)
+        )
+        conn.initiate_connection()
+
+        async def respond(stream_id):
+            await asyncio.sleep(self.latency)
+            if conn.state_machine.state == h2.connection.ConnectionState.CLOSED:
+                return
+            conn.send_headers(
+                stream_id,
+                [
+                    (":status", "200"),
+                    ("content-type", "application/json"),
+                    ("content-length", str(len(BODY))),
+                ],
+            )
+            conn.send_data(stream_id, BODY, end_stream=True)
+            writer.write(conn.data_to_send())
+
+        while data:
+            try:
+                events = conn.receive_data(data)
+            except h2.exceptions.ProtocolError:
+                # Like a real server, close the connection with GOAWAY for the invalid frames.
+                writer.write(conn.data_to_send())
+                return
+            for event in events:
+                if isinstance(event, h2.events.RequestReceived):
+                    asyncio.ensure_future(respond(event.stream_id))
+                elif isinstance(event, h2.events.ConnectionTerminated):
+                    return
+            writer.write(conn.data_to_send())
+            await writer.drain()
+            data = await reader.read(65535)
+
+
+def _local_client(api, client_class):
+    # No TLS to negotiate the protocol with the local server, so use HTTP/2 by prior knowledge.
+    if api.http2:
+        api.client = client_class(
+            http1=False, http2=True, limits=api.limits, timeout=api.timeout
+        )
+
+
+def bench_sync(server, http2, requests, concurrency):
+    api = pin.Api(
+        access_token="token",
+        http2=http2,
+        limits=Limits(max_connections=concurrency),
+        timeout=30,
+    )
+    _local_client(api, Client)
+    api.DEFAULT_API_URL = server.url
+    calls = [lambda: api.pins.get(pin_id="1") for _ in range(requests)]
+    start = time.perf_counter()
+    results = run_in_threads(calls, max_workers=concurrency)
+    elapsed = time.perf_counter() - start
+    api.client.close()
+    return elapsed, sum(isinstance(r, Exception) for r in results)
+
+
+def bench_async(server, http2, requests, concurrency):
+    async def run():
+        api = pin.AsyncApi(
+            access_token="token",
+            http2=http2,
+            limits=Limits(max_connections=concurrency),
+            timeout=30,
+        )
+        _local_client(api, AsyncClient)
+        api.DEFAULT_API_URL = server.url
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def call():
+            async with semaphore:
+                return await api.pins.get(pin_id="1")
+
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(call() for _ in range(requests)), return_exceptions=True
+        )
+        elapsed = time.perf_counter() - start
+        await api.client.aclose()
+        return elapsed, sum(isinstance(r, Exception) for r in results)
+
+    return asyncio.run(run())
+
+
+def main(requests: int = 2000, concurrency: int = 100, latency_ms: int = 20):
+    print(
+        f"{requests} requests, concurrency {concurrency}, server latency {latency_ms}ms"
+    )
+    for name, bench in (("Api", bench_sync), ("AsyncApi", bench_async)):
+        for http2 in (False, True):
+            if http2 and name == "Api" and not SYNC_HTTP2:
+                continue
+            server = LocalServer(latency=latency_ms / 1000)
+            elapsed, errors = bench(server, http2, requests, concurrency)
+            server.close()
+            print(
+                f"{name} {'HTTP/2  ' if http2 else 'HTTP/1.1'}: "
+                f"{requests / elapsed:.0f} req/s, "
+                f"{server.connections} connections, {errors} errors"
+            )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:4]])
@@ -0,0 +1,48 @@
+"""
+    Benchmark for the json codecs on the payloads in tests/data.
+
+    Run from the project root: python benchmarks/json_codec.py [repeat]
+"""
+
+import glob
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Import the package from the project root, not an installed version.
+sys.path.insert(0, ROOT)
+
+from pinterest.codec import CODECS
+
+
+def main(number: int = 2000):
+    payloads = []
+    for filename in sorted(
+        glob.glob(os.path.join(ROOT, "tests/data/**/*.json"), recursive=True)
+    ):
+        with open(filename, "rb") as f:
+            payloads.append(f.read())
+    codecs = {}
+    for name, codec_class in CODECS.items():
+        try:
+            codecs[name] = codec_class()
+        except ImportError:
+            print(f"{name}: not installed")
+    objects = [codecs["json"].loads(content) for content in payloads]
+    print(f"{len(payloads)} payloads, {sum(map(len, payloads))} bytes")
+    for name, codec in codecs.items():
+        loads = timeit.timeit(
+            lambda: [codec.loads(content) for content in payloads], number=number
+        )
+        dumps = timeit.timeit(
+            lambda: [codec.dumps(obj) for obj in objects], number=number
+        )
+        print(
+            f"{name}: loads {loads / number * 1000:.3f}ms, "
+            f"dumps {dumps / number * 1000:.3f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,58 @@
+"""
+    Benchmark for memory of the decoded models.
+
+    Run from the project root: python benchmarks/memory.py [number of objects]
+"""
+
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Import the package from the project root, not an installed version.
+sys.path.insert(0, ROOT)
+
+from pinterest.models import CatalogItem, DailyMetric, Pin
+
+
+def load_data(filename):
+    with open(filename, "rb") as f:
+        return json.loads(f.read().decode("utf-8"))
+
+
+def measure(model, data, mode, size):
+    gc.collect()
+    tracemalloc.start()
+    objects = [model.new_from_json_dict(data, mode=mode) for _ in range(size)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return current
+
+
+def main(size: int = 100000):
+    pin_data = load_data(os.path.join(ROOT, "tests/data/pins/pin_data.json"))
+    item_data = load_data(
+        os.path.join(ROOT, "tests/data/catalogs/get_catalog_items_resp.json")
+    )
+    metric_data = load_data(os.path.join(ROOT, "tests/data/pins/pin_analytics.json"))
+    samples = {
+        Pin: pin_data,
+        CatalogItem: item_data["items"][0],
+        DailyMetric: next(iter(metric_data.values()))["daily_metrics"][0],
+    }
+    for model, data in samples.items():
+        normal = measure(model, data, "dataclass", size)
+        compact = measure(model, data, "compact", size)
+        print(
+            f"{model.__name__} x {size}: "
+            f"dataclass {normal / 1024 / 1024:.1f}MiB, "
+            f"compact {compact / 1024 / 1024:.1f}MiB, "
+            f"saved {(1 - compact / normal) * 100:.0f}%"
+        )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -1,15 +1,61 @@
 """
     Api implementation.
 """
+import asyncio
+import functools
+import hashlib
 import inspect
-from typing import List, Optional, Tuple, Union
-
+import threading
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import httpcore
 from authlib.integrations.httpx_client import OAuth2Client, AsyncOAuth2Client
-from httpx import AsyncClient, Client, Headers, Response
+from httpx import URL, AsyncClient, Client, Headers, Limits, Response
 
 from pinterest import sync, asynchronous
 from pinterest.base_endpoint import BaseEndpoint
+from pinterest.cache import BaseCache, CacheEntry, cache_key, invalidation_prefixes
+from pinterest.codec import JsonCodec, get_codec
 from pinterest.exceptions import PinterestException
+from pinterest.models.base import MODEL_MODES
+from pinterest.ratelimit import RateLimiter, endpoint_category
+from pinterest.retry import RetryPolicy
+from pinterest.utils.concurrency import (
+    AsyncSingleFlight,
+    SingleFlight,
+    run_in_threads,
+)
+from pinterest.utils.json_stream import JsonArrayParser
+
+# Same as the default of httpx. Keep-alive connections are closed after idle for keepalive_expiry seconds.
+DEFAULT_LIMITS = Limits(
+    max_connections=100, max_keepalive_connections=20, keepalive_expiry=5.0
+)
+
+# Whether the sync Api supports HTTP/2. Before httpcore 1.0, a HTTP/2 connection shared by threads
+# may send the streams out of order, which the server rejects, so HTTP/2 is only for AsyncApi.
+SYNC_HTTP2 = int(httpcore.__version__.split(".", 1)[0]) >= 1
+
+# Codec for BaseApi.parse_response, apis decode by their own json_codec.
+DEFAULT_JSON_CODEC = get_codec("auto")
+
+
+def _decode_response(codec: JsonCodec, response: Response) -> dict:
+    if response.is_success:
+        return codec.loads(response.content)
+    raise PinterestException(**codec.loads(response.content))
 
 
 def _is_resource_endpoint(obj):
@@ -41,6 +87,17 @@ class BaseApi:
         timeout: Optional[int] = None,
         proxies: Optional[dict] = None,
         headers: Optional[dict] = None,
+        max_in_flight: Optional[int] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[BaseCache] = None,
+        validator_cache: Optional[BaseCache] = None,
+        single_flight: bool = False,
+        model_mode: str = "dataclass",
+        keep_raw: bool = False,
+        json_codec: Union[str, JsonCodec] = "auto",
+        http2: bool = False,
+        limits: Optional[Limits] = None,
     ):
         """
         :param app_id: ID for the app.
@@ -49,6 +106,24 @@ class BaseApi:
         :param timeout: Timeout for request.
         :param proxies: Proxies for the request.
         :param headers: Headers for the request.
+        :param max_in_flight: Maximum number of requests in flight at the same time for this api.
+        :param rate_limiter: Limiter to pace requests, like TokenBucketRateLimiter.
+        :param retry_policy: Policy to retry failed requests. Default not retry.
+        :param cache: Cache for the responses of GET requests, like MemoryCache.
+        :param validator_cache: Cache for the responses with ETag or Last-Modified, to send conditional GET requests.
+            The cached response is used when server replies 304 Not Modified.
+        :param single_flight: Merge the identical concurrent GET requests into one request.
+        :param model_mode: Type for the returned models. "dataclass" for the dataclass models,
+            "compact" for the models keep fields in slots, which need less memory for large crawls.
+            "lazy" for the models decode the nested models only when accessed, which is faster for shallow reads.
+        :param keep_raw: Keep the origin json dict on the returned models, as model.raw_json.
+        :param json_codec: Codec to decode responses and encode request bodies, a JsonCodec or one of
+            "orjson", "msgspec", "json". Default "auto" uses orjson or msgspec if installed, else json.
+        :param http2: Use HTTP/2 if the server supports it, concurrent requests are multiplexed on one connection.
+            Need the h2 package, install with `pip install python-pinterest[http2]`.
+            Only for AsyncApi, unless SYNC_HTTP2 with httpcore 1.0 or later.
+        :param limits: Limits for the connection pool, like httpx.Limits(max_connections=100,
+            max_keepalive_connections=20, keepalive_expiry=5.0). Default is DEFAULT_LIMITS.
         """
         self.app_id = app_id
         self.app_secret = app_secret
@@ -56,6 +131,21 @@ class BaseApi:
         self.timeout = timeout
         self.proxies = proxies
         self.headers = headers
+        self.max_in_flight = max_in_flight
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.cache = cache
+        self.validator_cache = validator_cache
+        self.single_flight = single_flight
+        if model_mode not in MODEL_MODES:
+            raise ValueError(
+                f"Unknown model mode {model_mode}, should be one of {MODEL_MODES}"
+            )
+        self.model_mode = model_mode
+        self.keep_raw = keep_raw
+        self.json_codec = get_codec(json_codec)
+        self.http2 = http2
+        self.limits = limits or DEFAULT_LIMITS
         self.client: Optional[Union[Client, AsyncClient]] = None
         self.build_client()
 
@@ -65,16 +155,149 @@ class BaseApi:
     def add_access_token_to_headers(self) -> Headers:
         return Headers({"Authorization": "Bearer " + self.access_token})
 
+    @property
+    def token_fingerprint(self) -> str:
+        """
+        Short hash for the access token, to separate the state for each token without keeping it.
+        """
+        token = self.access_token or ""
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+
+    def api_path(self, url: str) -> str:
+        """
+        :param url: URL for request.
+        :return: Path for the api, like "boards/xxx/pins".
+        """
+        if url.startswith(self.DEFAULT_API_URL):
+            return url[len(self.DEFAULT_API_URL) :]
+        return URL(url).path.lstrip("/")
+
+    def rate_limit_key(self, method: str, url: str) -> Tuple[str, str]:
+        """
+        Key for the rate limiter, requests are paced per access token and per endpoint category.
+        :param method: Http method.
+        :param url: URL for request.
+        :return: Access token fingerprint and category.
+        """
+        category = endpoint_category(method=method, path=self.api_path(url))
+        return self.token_fingerprint, category
+
+    def _request_key(
+        self,
+        method: str,
+        url: str,
+        params: Optional[dict] = None,
+        json: Optional[dict] = None,
+    ) -> Optional[str]:
+        """
+        Key to identify a GET request for cache and single flight.
+        :return: Key for the request, None if no feature needs it.
+        """
+        if method.upper() != "GET":
+            return None
+        if (
+            self.cache is None
+            and self.validator_cache is None
+            and not self.single_flight
+        ):
+            return None
+        return cache_key(
+            method=method,
+            url=url,
+            params=params,
+            json_data=json,
+            token=self.token_fingerprint,
+        )
+
+    def _lookup_cache(
+        self, key: Optional[str], method: str, url: str
+    ) -> Optional[Response]:
+        """
+        Find the cached response for a GET request.
+        :return: The cached response.
+        """
+        if key is None or self.cache is None:
+            return None
+        entry = self.cache.get(key)
+        return None if entry is None else entry.to_response(method, url)
+
+    def _lookup_validated(
+        self, key: Optional[str], headers: Optional[Headers]
+    ) -> Tuple[Optional[CacheEntry], Optional[Headers]]:
+        """
+        Find the response with validators for a GET request, and add the conditional headers.
+        :return: Validated response and the headers for the request.
+        """
+        if key is None or self.validator_cache is None:
+            return None, headers
+        entry = self.validator_cache.get(key)
+        if entry is None:
+            return None, headers
+        entry_headers = Headers(entry.headers)
+        headers = Headers(headers)
+        if "ETag" in entry_headers:
+            headers["If-None-Match"] = entry_headers["ETag"]
+        if "Last-Modified" in entry_headers:
+            headers["If-Modified-Since"] = entry_headers["Last-Modified"]
+        return entry, headers
+
+    def _update_cache(
+        self, key: Optional[str], method: str, url: str, response: Response
+    ) -> None:
+        """
+        Save the response for a GET request, or invalidate the related responses for a successful write.
+        """
+        if not response.is_success:
+            return
+        path = self.api_path(url)
+        if key is not None:
+            entry = CacheEntry.from_response(response)
+            if self.cache is not None:
+                ttl = self.cache.ttl_for(path)
+                if ttl > 0:
+                    self.cache.set(key, entry, ttl=ttl)
+            if self.validator_cache is not None and (
+                "ETag" in response.headers or "Last-Modified" in response.headers
+            ):
+                ttl = self.validator_cache.ttl_for(path)
+                if ttl > 0:
+                    self.validator_cache.set(key, entry, ttl=ttl)
+        elif self.cache is not None and method.upper() != "GET":
+            for prefix in invalidation_prefixes(self.DEFAULT_API_URL, path):
+                self.cache.delete_prefix(prefix)
+
     @staticmethod
     def parse_response(response: Response) -> dict:
         """
-        Response parser.
+        Response parser, with the default json codec.
         :param response: Response for the request.
         :return: response data.
         """
-        if response.is_success:
-            return response.json()
-        raise PinterestException(**response.json())
+        return _decode_response(DEFAULT_JSON_CODEC, response)
+
+    def decode_response(self, response: Response) -> dict:
+        """
+        Response parser, with the json codec of the api.
+        :param response: Response for the request.
+        :return: response data.
+        """
+        return _decode_response(self.json_codec, response)
+
+    def encode_json(
+        self, json: Optional[dict], headers: Optional[Headers]
+    ) -> Tuple[Optional[bytes], Optional[Headers]]:
+        """
+        Encode the json data for request body by the json codec.
+
+        :param json: Json data for request.
+        :param headers: Headers for request.
+        :return: Request body and headers with the content type.
+        """
+        if json is None:
+            return None, headers
+        headers = Headers(headers)
+        headers["Content-Type"] = "application/json"
+        return self.json_codec.dumps(json), headers
 
 
 class Api(BaseApi):
@@ -86,9 +309,24 @@ class Api(BaseApi):
     ad_accounts = sync.AdAccountsEndpoint()
 
     def build_client(self):
+        if self.http2 and not SYNC_HTTP2:
+            raise ValueError(
+                f"http2 is not supported by Api with httpcore {httpcore.__version__}, "
+                "use AsyncApi for HTTP/2"
+            )
         self.client = Client(
-            headers=self.headers, proxies=self.proxies, timeout=self.timeout
+            headers=self.headers,
+            proxies=self.proxies,
+            timeout=self.timeout,
+            http2=self.http2,
+            limits=self.limits,
+        )
+        self.in_flight: Optional[threading.BoundedSemaphore] = (
+            threading.BoundedSemaphore(self.max_in_flight)
+            if self.max_in_flight
+            else None
         )
+        self.flights = SingleFlight()
 
     def request(
         self,
@@ -97,6 +335,8 @@ class Api(BaseApi):
         params: Optional[dict] = None,
         json: Optional[dict] = None,
         auth_need: bool = True,
+        idempotent: Optional[bool] = None,
+        use_cache: bool = True,
     ) -> Response:
         """
         :param method: Http method.
@@ -104,6 +344,9 @@ class Api(BaseApi):
         :param params: URL parameters for request.
         :param json: Json data for request.
         :param auth_need: Is request authorization required.
+        :param idempotent: Is request safe to retry. Default decided by the method.
+        :param use_cache: Use the cached response for a GET request. Pass False for the polls of a status,
+            the fresh response still updates the cache.
         :return: Response for the request.
         """
         # Add Authorize Info
@@ -112,18 +355,182 @@ class Api(BaseApi):
         if not url.startswith("http"):
             url = self.DEFAULT_API_URL + url
 
+        key = self._request_key(method=method, url=url, params=params, json=json)
+        kwargs = dict(
+            method=method,
+            url=url,
+            params=params,
+            json=json,
+            headers=headers,
+            idempotent=idempotent,
+            key=key,
+            use_cache=use_cache,
+        )
+        if key is not None and self.single_flight:
+            # a call skipping the cache doesn't join a call which may be answered by the cache.
+            flight_key = key if use_cache else (key, "no-cache")
+            return self.flights.do(
+                flight_key, functools.partial(self._request, **kwargs)
+            )
+        return self._request(**kwargs)
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[dict] = None,
+        json: Optional[dict] = None,
+        headers: Optional[Headers] = None,
+        idempotent: Optional[bool] = None,
+        key: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> Response:
+        """
+        Do the request through cache, retry, rate limiter and so on.
+        """
+        if use_cache:
+            cached = self._lookup_cache(key=key, method=method, url=url)
+            if cached is not None:
+                return cached
+        validated, headers = self._lookup_validated(key=key, headers=headers)
+
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                resp = self._send(
+                    method=method, url=url, params=params, json=json, headers=headers
+                )
+            except Exception as e:
+                resp = e
+            if self.retry_policy is None or not self.retry_policy.should_retry(
+                attempt=attempt, method=method, result=resp, idempotent=idempotent
+            ):
+                break
+            event = self.retry_policy.retry_event(
+                attempt=attempt, method=method, url=url, result=resp
+            )
+            time.sleep(event.delay)
+
+        if isinstance(resp, Exception):
+            raise Exception(resp)
+        if validated is not None and resp.status_code == 304:
+            resp = validated.to_response(method, url)
+        self._update_cache(key=key, method=method, url=url, response=resp)
+        return resp
+
+    def _pace(self, method: str, url: str) -> Optional[Tuple[str, str]]:
+        """
+        Wait for the rate limiter.
+
+        :return: Key for the rate limiter, None if no rate limiter.
+        """
+        if self.rate_limiter is None:
+            return None
+        rate_limit_key = self.rate_limit_key(method=method, url=url)
+        delay = self.rate_limiter.acquire(rate_limit_key)
+        if delay > 0:
+            time.sleep(delay)
+        return rate_limit_key
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        params: Optional[dict] = None,
+        json: Optional[dict] = None,
+        headers: Optional[Headers] = None,
+    ) -> Response:
+        """
+        Send one attempt for the request, paced by the rate limiter and max_in_flight.
+        """
+        rate_limit_key = self._pace(method=method, url=url)
+        content, headers = self.encode_json(json=json, headers=headers)
+        if self.in_flight is not None:
+            self.in_flight.acquire()
         try:
             resp = self.client.request(
                 method=method,
                 url=url,
                 params=params,
-                json=json,
+                content=content,
                 headers=headers,
             )
-        except Exception as e:
-            raise Exception(e)
+        finally:
+            if self.in_flight is not None:
+                self.in_flight.release()
+
+        if rate_limit_key is not None:
+            self.rate_limiter.update(rate_limit_key, resp)
         return resp
 
+    def stream_json(
+        self,
+        method: str,
+        url: str,
+        path: Sequence[str] = (),
+        params: Optional[dict] = None,
+        json: Optional[dict] = None,
+        auth_need: bool = True,
+    ) -> Iterator[Any]:
+        """
+        Send the request and yield the elements of a json array in the response body while it is
+        being read, the whole body is never kept in memory. Streamed responses are not cached or retried.
+
+        :param method: Http method.
+        :param url: URL for request.
+        :param path: Keys to the array in the response, like ["items"]. Empty for the response which is an array.
+        :param params: URL parameters for request.
+        :param json: Json data for request.
+        :param auth_need: Is request authorization required.
+        :return: Elements generator.
+        """
+        headers = self.add_access_token_to_headers() if auth_need else None
+        if not url.startswith("http"):
+            url = self.DEFAULT_API_URL + url
+        rate_limit_key = self._pace(method=method, url=url)
+        content, headers = self.encode_json(json=json, headers=headers)
+        # The permit is kept only until the response headers arrive, the body is read without it,
+        # so other requests can be sent while the stream is being iterated.
+        in_flight = self.in_flight
+        if in_flight is not None:
+            in_flight.acquire()
+        try:
+            with self.client.stream(
+                method=method,
+                url=url,
+                params=params,
+                content=content,
+                headers=headers,
+            ) as resp:
+                if in_flight is not None:
+                    in_flight.release()
+                    in_flight = None
+                if rate_limit_key is not None:
+                    self.rate_limiter.update(rate_limit_key, resp)
+                if not resp.is_success:
+                    resp.read()
+                    self.decode_response(response=resp)
+                parser = JsonArrayParser(path=path)
+                for chunk in resp.iter_bytes():
+                    yield from parser.feed(chunk)
+                yield from parser.close()
+        finally:
+            if in_flight is not None:
+                in_flight.release()
+
+    def bulk(
+        self, calls: Iterable[Callable[[], Any]], max_workers: int = 10
+    ) -> List[Any]:
+        """
+        Run many api calls in a thread pool. All the threads share the connection pool of this api.
+
+        :param calls: Callables without parameters, like functools.partial(api.pins.get, pin_id="xxx").
+        :param max_workers: Maximum number of threads.
+        :return: Results in the same order of calls. A failed call is replaced by its exception.
+        """
+        return run_in_threads(calls, max_workers=max_workers)
+
     def _get_oauth_client(
         self,
         redirect_uri: Optional[str] = None,
@@ -222,8 +629,23 @@ class AsyncApi(BaseApi):
 
     def build_client(self):
         self.client = AsyncClient(
-            headers=self.headers, proxies=self.proxies, timeout=self.timeout
+            headers=self.headers,
+            proxies=self.proxies,
+            timeout=self.timeout,
+            http2=self.http2,
+            limits=self.limits,
         )
+        self._in_flight: Optional[asyncio.Semaphore] = None
+        self.flights = AsyncSingleFlight()
+
+    @property
+    def in_flight(self) -> Optional[asyncio.Semaphore]:
+        """
+        Semaphore for max_in_flight. Created on first use to bind the running event loop.
+        """
+        if self.max_in_flight and self._in_flight is None:
+            self._in_flight = asyncio.Semaphore(self.max_in_flight)
+        return self._in_flight
 
     async def request(
         self,
@@ -232,6 +654,8 @@ class AsyncApi(BaseApi):
         params: Optional[dict] = None,
         json: Optional[dict] = None,
         auth_need: bool = True,
+        idempotent: Optional[bool] = None,
+        use_cache: bool = True,
     ) -> Response:
         """
         :param method: Http method.
@@ -239,6 +663,9 @@ class AsyncApi(BaseApi):
         :param params: URL parameters for request.
         :param json: Json data for request.
         :param auth_need: Is request authorization required.
+        :param idempotent: Is request safe to retry. Default decided by the method.
+        :param use_cache: Use the cached response for a GET request. Pass False for the polls of a status,
+            the fresh response still updates the cache.
         :return: Response for the request.
         """
         # Add Authorize Info
@@ -247,18 +674,173 @@ class AsyncApi(BaseApi):
         if not url.startswith("http"):
             url = self.DEFAULT_API_URL + url
 
+        key = self._request_key(method=method, url=url, params=params, json=json)
+        kwargs = dict(
+            method=method,
+            url=url,
+            params=params,
+            json=json,
+            headers=headers,
+            idempotent=idempotent,
+            key=key,
+            use_cache=use_cache,
+        )
+        if key is not None and self.single_flight:
+            # a call skipping the cache doesn't join a call which may be answered by the cache.
+            flight_key = key if use_cache else (key, "no-cache")
+            return await self.flights.do(
+                flight_key, functools.partial(self._request, **kwargs)
+            )
+        return await self._request(**kwargs)
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[dict] = None,
+        json: Optional[dict] = None,
+        headers: Optional[Headers] = None,
+        idempotent: Optional[bool] = None,
+        key: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> Response:
+        """
+        Do the request through cache, retry, rate limiter and so on.
+        """
+        if use_cache:
+            cached = self._lookup_cache(key=key, method=method, url=url)
+            if cached is not None:
+                return cached
+        validated, headers = self._lookup_validated(key=key, headers=headers)
+
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                resp = await self._send(
+                    method=method, url=url, params=params, json=json, headers=headers
+                )
+            except Exception as e:
+                resp = e
+            if self.retry_policy is None or not self.retry_policy.should_retry(
+                attempt=attempt, method=method, result=resp, idempotent=idempotent
+            ):
+                break
+            event = self.retry_policy.retry_event(
+                attempt=attempt, method=method, url=url, result=resp
+            )
+            await asyncio.sleep(event.delay)
+
+        if isinstance(resp, Exception):
+            raise Exception(resp)
+        if validated is not None and resp.status_code == 304:
+            resp = validated.to_response(method, url)
+        self._update_cache(key=key, method=method, url=url, response=resp)
+        return resp
+
+    async def _pace(self, method: str, url: str) -> Optional[Tuple[str, str]]:
+        """
+        Wait for the rate limiter.
+
+        :return: Key for the rate limiter, None if no rate limiter.
+        """
+        if self.rate_limiter is None:
+            return None
+        rate_limit_key = self.rate_limit_key(method=method, url=url)
+        delay = self.rate_limiter.acquire(rate_limit_key)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return rate_limit_key
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        params: Optional[dict] = None,
+        json: Optional[dict] = None,
+        headers: Optional[Headers] = None,
+    ) -> Response:
+        """
+        Send one attempt for the request, paced by the rate limiter and max_in_flight.
+        """
+        rate_limit_key = await self._pace(method=method, url=url)
+        content, headers = self.encode_json(json=json, headers=headers)
+        in_flight = self.in_flight
+        if in_flight is not None:
+            await in_flight.acquire()
         try:
             resp = await self.client.request(
                 method=method,
                 url=url,
                 params=params,
-                json=json,
+                content=content,
                 headers=headers,
             )
-        except Exception as e:
-            raise Exception(e)
+        finally:
+            if in_flight is not None:
+                in_flight.release()
+
+        if rate_limit_key is not None:
+            self.rate_limiter.update(rate_limit_key, resp)
         return resp
 
+    async def stream_json(
+        self,
+        method: str,
+        url: str,
+        path: Sequence[str] = (),
+        params: Optional[dict] = None,
+        json: Optional[dict] = None,
+        auth_need: bool = True,
+    ) -> AsyncIterator[Any]:
+        """
+        Send the request and yield the elements of a json array in the response body while it is
+        being read, the whole body is never kept in memory. Streamed responses are not cached or retried.
+
+        :param method: Http method.
+        :param url: URL for request.
+        :param path: Keys to the array in the response, like ["items"]. Empty for the response which is an array.
+        :param params: URL parameters for request.
+        :param json: Json data for request.
+        :param auth_need: Is request authorization required.
+        :return: Elements generator.
+        """
+        headers = self.add_access_token_to_headers() if auth_need else None
+        if not url.startswith("http"):
+            url = self.DEFAULT_API_URL + url
+        rate_limit_key = await self._pace(method=method, url=url)
+        content, headers = self.encode_json(json=json, headers=headers)
+        # The permit is kept only until the response headers arrive, the body is read without it,
+        # so other requests can be sent while the stream is being iterated.
+        in_flight = self.in_flight
+        if in_flight is not None:
+            await in_flight.acquire()
+        try:
+            async with self.client.stream(
+                method=method,
+                url=url,
+                params=params,
+                content=content,
+                headers=headers,
+            ) as resp:
+                if in_flight is not None:
+                    in_flight.release()
+                    in_flight = None
+                if rate_limit_key is not None:
+                    self.rate_limiter.update(rate_limit_key, resp)
+                if not resp.is_success:
+                    await resp.aread()
+                    self.decode_response(response=resp)
+                parser = JsonArrayParser(path=path)
+                async for chunk in resp.aiter_bytes():
+                    for item in parser.feed(chunk):
+                        yield item
+                for item in parser.close():
+                    yield item
+        finally:
+            if in_flight is not None:
+                in_flight.release()
+
     def _get_oauth_client(
         self,
         redirect_uri: Optional[str] = None,
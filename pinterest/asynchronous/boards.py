@@ -1,7 +1,7 @@
 """
     Boards endpoints implementation.
 """
-from typing import Optional, Union
+from typing import AsyncIterator, Iterable, List, Optional, Union
 
 from pinterest.base_endpoint import AsyncEndpoint
 from pinterest.exceptions import PinterestException
@@ -11,6 +11,7 @@ from pinterest.models import (
     BoardSection,
     BoardSectionsResponse,
     PinsResponse,
+    Pin,
 )
 
 
@@ -38,7 +39,33 @@ class BoardsAsyncEndpoint(AsyncEndpoint):
 
         resp = await self._get(url=f"boards", params=params)
         data = self._parse_response(response=resp)
-        return data if return_json else BoardsResponse.new_from_json_dict(data=data)
+        return data if return_json else self._to_model(model=BoardsResponse, data=data)
+
+    def iter_list(
+        self,
+        page_size: int = 25,
+        privacy: Optional[str] = None,
+        return_json: bool = False,
+        prefetch: int = 0,
+    ) -> AsyncIterator[Union[Board, dict]]:
+        """
+        Iterate over all the boards, following the bookmark cursor page by page.
+
+        :param page_size: Maximum number of items to include in a single page of the response. [1..100]
+        :param privacy: Privacy setting for a board.
+        :param return_json: Type for yielded data. If you set True JSON data will be yielded.
+        :param prefetch: Number of pages to request ahead while the current page is consumed.
+            0 means fetch the next page only when the current page is exhausted.
+        :return: Boards async generator.
+        """
+        return self._iter_items(
+            self.list,
+            model=Board,
+            return_json=return_json,
+            prefetch=prefetch,
+            page_size=page_size,
+            privacy=privacy,
+        )
 
     async def get(self, board_id: str, return_json: bool = False) -> Union[Board, dict]:
         """
@@ -49,7 +76,25 @@ class BoardsAsyncEndpoint(AsyncEndpoint):
 
         resp = await self._get(url=f"boards/{board_id}")
         data = self._parse_response(response=resp)
-        return data if return_json else Board.new_from_json_dict(data=data)
+        return data if return_json else self._to_model(model=Board, data=data)
+
+    async def get_many(
+        self,
+        board_ids: Iterable[str],
+        concurrency: int = 10,
+        return_json: bool = False,
+    ) -> List[Union[Board, dict, Exception]]:
+        """
+        Get many boards concurrently.
+
+        :param board_ids: Unique identifiers of boards.
+        :param concurrency: Maximum number of requests running at the same time for this call.
+        :param return_json: Type for returned data. If you set True JSON data will be returned.
+        :return: Boards data in the same order of board_ids. A failed board is replaced by its exception.
+        """
+        return await self._get_many(
+            self.get, board_ids, concurrency=concurrency, return_json=return_json
+        )
 
     async def create(
         self,
@@ -74,7 +119,7 @@ class BoardsAsyncEndpoint(AsyncEndpoint):
             data["privacy"] = privacy
         resp = await self._post(url="boards", json=data)
         data = self._parse_response(response=resp)
-        return data if return_json else Board.new_from_json_dict(data=data)
+        return data if return_json else self._to_model(model=Board, data=data)
 
     async def update(
         self,
@@ -110,7 +155,7 @@ class BoardsAsyncEndpoint(AsyncEndpoint):
 
         resp = await self._patch(url=f"boards/{board_id}", json=data)
         data = self._parse_response(response=resp)
-        return data if return_json else Board.new_from_json_dict(data=data)
+        return data if return_json else self._to_model(model=Board, data=data)
 
     async def delete(self, board_id: str) -> bool:
         """
@@ -147,7 +192,33 @@ class BoardsAsyncEndpoint(AsyncEndpoint):
 
         resp = await self._get(url=f"boards/{board_id}/pins", params=params)
         data = self._parse_response(response=resp)
-        return data if return_json else PinsResponse.new_from_json_dict(data=data)
+        return data if return_json else self._to_model(model=PinsResponse, data=data)
+
+    def iter_pins(
+        self,
+        board_id: str,
+        page_size: int = 25,
+        return_json: bool = False,
+        prefetch: int = 0,
+    ) -> AsyncIterator[Union[Pin, dict]]:
+        """
+        Iterate over all the pins, following the bookmark cursor page by page.
+
+        :param board_id: Unique identifier of a board.
+        :param page_size: Maximum number of items to include in a single page of the response. [1..100]
+        :param return_json: Type for yielded data. If you set True JSON data will be yielded.
+        :param prefetch: Number of pages to request ahead while the current page is consumed.
+            0 means fetch the next page only when the current page is exhausted.
+        :return: Pins async generator.
+        """
+        return self._iter_items(
+            self.list_pins,
+            model=Pin,
+            return_json=return_json,
+            prefetch=prefetch,
+            board_id=board_id,
+            page_size=page_size,
+        )
 
     async def list_sections(
         self,
@@ -176,7 +247,35 @@ class BoardsAsyncEndpoint(AsyncEndpoint):
         )
         data = self._parse_response(response=resp)
         return (
-            data if return_json else BoardSectionsResponse.new_from_json_dict(data=data)
+            data
+            if return_json
+            else self._to_model(model=BoardSectionsResponse, data=data)
+        )
+
+    def iter_sections(
+        self,
+        board_id: str,
+        page_size: int = 25,
+        return_json: bool = False,
+        prefetch: int = 0,
+    ) -> AsyncIterator[Union[BoardSection, dict]]:
+        """
+        Iterate over all the board sections, following the bookmark cursor page by page.
+
+        :param board_id: Unique identifier of a board.
+        :param page_size: Maximum number of items to include in a single page of the response. [1~100].
+        :param return_json: Type for yielded data. If you set True JSON data will be yielded.
+        :param prefetch: Number of pages to request ahead while the current page is consumed.
+            0 means fetch the next page only when the current page is exhausted.
+        :return: Board sections async generator.
+        """
+        return self._iter_items(
+            self.list_sections,
+            model=BoardSection,
+            return_json=return_json,
+            prefetch=prefetch,
+            board_id=board_id,
+            page_size=page_size,
         )
 
     async def create_section(
@@ -194,7 +293,7 @@ class BoardsAsyncEndpoint(AsyncEndpoint):
 
         resp = await self._post(url=f"boards/{board_id}/sections", json={"name": name})
         data = self._parse_response(response=resp)
-        return data if return_json else BoardSection.new_from_json_dict(data=data)
+        return data if return_json else self._to_model(model=BoardSection, data=data)
 
     async def update_section(
         self, board_id, section_id, name: str, return_json: bool = False
@@ -213,7 +312,7 @@ class BoardsAsyncEndpoint(AsyncEndpoint):
             url=f"boards/{board_id}/sections/{section_id}", json={"name": name}
         )
         data = self._parse_response(response=resp)
-        return data if return_json else BoardSection.new_from_json_dict(data=data)
+        return data if return_json else self._to_model(model=BoardSection, data=data)
 
     async def delete_section(self, board_id, section_id: str) -> bool:
         """
@@ -257,4 +356,33 @@ class BoardsAsyncEndpoint(AsyncEndpoint):
             params=params,
         )
         data = self._parse_response(response=resp)
-        return data if return_json else PinsResponse.new_from_json_dict(data=data)
+        return data if return_json else self._to_model(model=PinsResponse, data=data)
+
+    def iter_section_pins(
+        self,
+        board_id,
+        section_id: str,
+        page_size: int = 25,
+        return_json: bool = False,
+        prefetch: int = 0,
+    ) -> AsyncIterator[Union[Pin, dict]]:
+        """
+        Iterate over all the pins, following the bookmark cursor page by page.
+
+        :param board_id: Unique identifier of a board.
+        :param section_id: Unique identifier of a board section.
+        :param page_size: Maximum number of items to include in a single page of the response. [1..100].
+        :param return_json: Type for yielded data. If you set True JSON data will be yielded.
+        :param prefetch: Number of pages to request ahead while the current page is consumed.
+            0 means fetch the next page only when the current page is exhausted.
+        :return: Pins async generator.
+        """
+        return self._iter_items(
+            self.list_section_pins,
+            model=Pin,
+            return_json=return_json,
+            prefetch=prefetch,
+            board_id=board_id,
+            section_id=section_id,
+            page_size=page_size,
+        )
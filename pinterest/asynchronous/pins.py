@@ -1,11 +1,24 @@
 """
     Pins endpoints implementation.
 """
-from typing import Optional, Union
+import asyncio
+import functools
+from typing import Callable, Iterable, List, Optional, Union
 
 from pinterest.base_endpoint import AsyncEndpoint
+from pinterest.exceptions import PinterestException
 from pinterest.models import Pin, Analytics
+from pinterest.poller import AsyncMediaPoller
+from pinterest.utils.analytics import merge_analytics
+from pinterest.utils.concurrency import async_run_bounded
+from pinterest.utils.media import VIDEO_SOURCE_KEYS, MediaUploadResult
 from pinterest.utils.params import enf_comma_separated
+from pinterest.watermark import (
+    DEFAULT_SETTLE_DAYS,
+    WatermarkStore,
+    analytics_statuses,
+    watermark_key,
+)
 
 
 class PinsAsyncEndpoint(AsyncEndpoint):
@@ -50,7 +63,86 @@ class PinsAsyncEndpoint(AsyncEndpoint):
         }
         resp = await self._post(url=f"pins", json=data)
         data = self._parse_response(response=resp)
-        return data if return_json else Pin.new_from_json_dict(data=data)
+        return data if return_json else self._to_model(model=Pin, data=data)
+
+    async def create_video_pins(
+        self,
+        videos: Iterable[dict],
+        concurrency: int = 4,
+        poll_interval: float = 1.0,
+        max_poll_interval: float = 30.0,
+        timeout: Optional[float] = None,
+        callback: Optional[Callable[[MediaUploadResult], None]] = None,
+        poller: Optional[AsyncMediaPoller] = None,
+    ) -> List[MediaUploadResult]:
+        """
+        Create video Pins from files. For each video, register a media upload, stream the file
+        to the upload url, poll the media until processed, then create the Pin with the media.
+        At most concurrency videos are in the pipeline at the same time.
+
+        :param videos: Specs for the videos, like {"file": "video.mp4", "board_id": "xxx", "title": "xxx",
+            "cover_image_key_frame_time": 1}. "file" is a path or a binary file object, "cover_image_url" and
+            "cover_image_key_frame_time" are for the media source, others are parameters for create.
+        :param concurrency: Maximum number of videos in the pipeline at the same time.
+        :param poll_interval: Seconds to wait before the first poll of a media, also the minimum interval.
+        :param max_poll_interval: Maximum seconds between polls.
+        :param timeout: Maximum seconds to wait for a media to be processed.
+        :param callback: Function called with the result of each video, like for progress.
+        :param poller: Poller to wait for the media together by scanning media.list, instead of
+            polling each media. It is started if not running, and stopped at the end.
+        :return: Results in the order of completion, with the created Pin or the error.
+        """
+        media_endpoint = self._client.media
+
+        async def process(video: dict) -> MediaUploadResult:
+            video = dict(video)
+            result = MediaUploadResult(file=video.pop("file"))
+            media_source = {"source_type": "video_id"}
+            for key in VIDEO_SOURCE_KEYS:
+                if key in video:
+                    media_source[key] = video.pop(key)
+            try:
+                media = await media_endpoint.register(media_type="video")
+                result.media_id = media_source["media_id"] = media.media_id
+                await media_endpoint.upload(media=media, file=result.file)
+                if poller is not None:
+                    upload = await asyncio.wait_for(
+                        asyncio.shield(poller.add(media.media_id)), timeout
+                    )
+                else:
+                    upload = await media_endpoint.wait(
+                        media_id=media.media_id,
+                        poll_interval=poll_interval,
+                        max_poll_interval=max_poll_interval,
+                        timeout=timeout,
+                    )
+                result.status = upload.status
+                if upload.status != "succeeded":
+                    raise PinterestException(
+                        code=-1,
+                        message=f"Media {media.media_id} is not processed, status: {upload.status}",
+                    )
+                result.pin = await self.create(media_source=media_source, **video)
+            except Exception as e:
+                result.error = e
+            return result
+
+        results = []
+        owned = poller is not None and not poller.running
+        if owned:
+            poller.start()
+        try:
+            async for result in async_run_bounded(
+                (functools.partial(process, video) for video in videos),
+                concurrency=concurrency,
+            ):
+                results.append(result)
+                if callback is not None:
+                    callback(result)
+        finally:
+            if owned:
+                await poller.stop()
+        return results
 
     async def get(
         self,
@@ -72,7 +164,31 @@ class PinsAsyncEndpoint(AsyncEndpoint):
             params=params,
         )
         data = self._parse_response(response=resp)
-        return data if return_json else Pin.new_from_json_dict(data=data)
+        return data if return_json else self._to_model(model=Pin, data=data)
+
+    async def get_many(
+        self,
+        pin_ids: Iterable[str],
+        ad_account_id: Optional[str] = None,
+        concurrency: int = 10,
+        return_json: bool = False,
+    ) -> List[Union[Pin, dict, Exception]]:
+        """
+        Get many Pins concurrently.
+
+        :param pin_ids: Unique identifiers of Pins.
+        :param ad_account_id: Unique identifier of an ad account.
+        :param concurrency: Maximum number of requests running at the same time for this call.
+        :param return_json: Type for returned data. If you set True JSON data will be returned.
+        :return: Pins data in the same order of pin_ids. A failed pin is replaced by its exception.
+        """
+        return await self._get_many(
+            self.get,
+            pin_ids,
+            concurrency=concurrency,
+            ad_account_id=ad_account_id,
+            return_json=return_json,
+        )
 
     async def delete(self, pin_id: str) -> bool:
         """
@@ -101,7 +217,7 @@ class PinsAsyncEndpoint(AsyncEndpoint):
         params = {"board_id": board_id} if board_id else None
         resp = await self._post(url=f"pins/{pin_id}/save", json=params)
         data = self._parse_response(response=resp)
-        return data if return_json else Pin.new_from_json_dict(data=data)
+        return data if return_json else self._to_model(model=Pin, data=data)
 
     async def get_analytics(
         self,
@@ -113,6 +229,8 @@ class PinsAsyncEndpoint(AsyncEndpoint):
         split_field: Optional[str] = None,
         ad_account_id: Optional[str] = None,
         return_json: bool = False,
+        window_days: Optional[int] = None,
+        concurrency: int = 4,
     ) -> Union[Analytics, dict]:
         """
         Get analytics for a Pin owned by the "operation user_account" -
@@ -126,6 +244,9 @@ class PinsAsyncEndpoint(AsyncEndpoint):
         :param split_field: How to split the data into groups. Not including this param means data won't be split.
         :param ad_account_id: Unique identifier of an ad account.
         :param return_json: Type for returned data. If you set True JSON data will be returned.
+        :param window_days: Maximum days for a request, like MAX_ANALYTICS_DAYS. Longer date range is split
+            into windows, which are requested concurrently and merged into one result. Default None to not split.
+        :param concurrency: Maximum number of windows requested at the same time.
         :return: Pin analytics data.
         """
 
@@ -143,9 +264,50 @@ class PinsAsyncEndpoint(AsyncEndpoint):
         if ad_account_id is not None:
             params["ad_account_id"] = ad_account_id
 
-        resp = await self._get(
+        data = await self._get_parts(
             url=f"pins/{pin_id}/analytics",
             params=params,
+            merge=merge_analytics,
+            window_days=window_days,
+            concurrency=concurrency,
         )
-        data = self._parse_response(response=resp)
-        return data if return_json else Analytics.new_from_json_dict(data=data)
+        return data if return_json else self._to_model(model=Analytics, data=data)
+
+    async def sync_analytics(
+        self,
+        store: WatermarkStore,
+        pin_id: str,
+        start_date: str,
+        end_date: str,
+        return_json: bool = False,
+        settle_days: int = DEFAULT_SETTLE_DAYS,
+        **kwargs,
+    ) -> Optional[Union[Analytics, dict]]:
+        """
+        Get analytics for a Pin incrementally. Only the days from the first day which is new
+        or not final in the store are requested, then the data status of the days is recorded in the store.
+
+        :param store: Watermark store for the synced days.
+        :param pin_id: Unique identifier of a Pin.
+        :param start_date: Metric report start date (UTC). Format: YYYY-MM-DD
+        :param end_date: Metric report end date (UTC). Format: YYYY-MM-DD
+        :param return_json: Type for returned data. If you set True JSON data will be returned.
+        :param settle_days: Days before a day missing from the daily metrics is taken as final.
+        :param kwargs: Other parameters for get_analytics, like metric_types.
+        :return: Analytics data for the requested days. None if all the days are final in the store.
+        """
+        entity = watermark_key(path=f"pins/{pin_id}/analytics", query=kwargs)
+        pending = store.pending_range(entity, start_date, end_date)
+        if pending is None:
+            return None
+        data = await self.get_analytics(
+            pin_id=pin_id,
+            start_date=pending[0],
+            end_date=pending[1],
+            return_json=True,
+            **kwargs,
+        )
+        store.record(
+            entity, analytics_statuses(data, *pending, settle_days=settle_days)
+        )
+        return data if return_json else self._to_model(model=Analytics, data=data)
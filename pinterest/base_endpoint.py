@@ -1,8 +1,28 @@
 """
     Endpoint class for Pinterest. like pins,boards and so on.
 """
+import asyncio
+import contextlib
+import functools
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Type,
+)
+
 from httpx import Response
 
+from pinterest.models.base import BaseModel
+from pinterest.utils.analytics import split_date_range, split_ids
+from pinterest.utils.concurrency import run_in_threads
+
 
 class BaseEndpoint:
     """Pinterest Endpoint base class"""
@@ -23,10 +43,158 @@ class BaseEndpoint:
         return self._client.app_secret
 
     def _parse_response(self, response: Response):
-        return self._client.parse_response(response=response)
+        return self._client.decode_response(response=response)
+
+    def _to_model(self, model: Type[BaseModel], data: Optional[dict]):
+        return model.new_from_json_dict(
+            data=data, mode=self._client.model_mode, keep_raw=self._client.keep_raw
+        )
 
 
 class Endpoint(BaseEndpoint):
+    def _iter_items(
+        self,
+        func: Callable,
+        model: Type[BaseModel],
+        return_json: bool = False,
+        **kwargs,
+    ) -> Iterator:
+        """
+        Walk the bookmark cursor of a list method and yield the items one by one.
+
+        :param func: List method which accepts bookmark and return_json.
+        :param model: Model class for each item.
+        :param return_json: Type for yielded data. If you set True JSON data will be yielded.
+        :param kwargs: Other parameters for the list method.
+        :return: Items generator.
+        """
+        bookmark: Optional[str] = None
+        while True:
+            data = func(bookmark=bookmark, return_json=True, **kwargs)
+            for item in data.get("items") or []:
+                yield item if return_json else self._to_model(model=model, data=item)
+            bookmark = data.get("bookmark")
+            if not bookmark:
+                break
+
+    def _get_many(
+        self, func: Callable, ids: Iterable[str], concurrency: int = 10, **kwargs
+    ) -> List[Any]:
+        """
+        Call a get method for each id in a thread pool.
+
+        :param func: Get method which accepts the id as first parameter.
+        :param ids: Identifiers for the objects.
+        :param concurrency: Maximum number of calls running at the same time.
+        :param kwargs: Other parameters for the get method.
+        :return: Results in the same order of ids. A failed call is replaced by its exception.
+        """
+        return run_in_threads(
+            (functools.partial(func, obj_id, **kwargs) for obj_id in ids),
+            max_workers=concurrency,
+        )
+
+    def _gather(
+        self, calls: Iterable[Callable[[], Any]], concurrency: int = 4
+    ) -> List[Any]:
+        """
+        Run calls in a thread pool, and raise the first error.
+
+        :param calls: Callables without parameters.
+        :param concurrency: Maximum number of calls running at the same time.
+        :return: Results in the same order of calls.
+        """
+        results = run_in_threads(calls, max_workers=concurrency)
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return results
+
+    def _get_parts(
+        self,
+        url: str,
+        merge: Callable[[List[Any]], Any],
+        window_days: Optional[int] = None,
+        concurrency: int = 4,
+        params: Optional[dict] = None,
+        json: Optional[dict] = None,
+        ids_key: Optional[str] = None,
+        ids_size: Optional[int] = None,
+    ) -> Any:
+        """
+        Split an analytics query into parts by the date range and the ids,
+        get the parts concurrently and merge the results.
+
+        :param url: URL for the query.
+        :param merge: Function to merge the json data of the parts.
+        :param window_days: Maximum days for a part. None to not split the date range.
+        :param concurrency: Maximum number of parts requested at the same time.
+        :param params: URL parameters with start_date and end_date.
+        :param json: Json data with start_date and end_date, for the query doesn't use params.
+        :param ids_key: Key for the comma-separated ids in the query, like "campaign_ids". None to not split the ids.
+        :param ids_size: Maximum ids for a part. None to not split the ids.
+        :return: Merged json data.
+        """
+        query = params if params is not None else json
+        windows = (
+            split_date_range(query["start_date"], query["end_date"], window_days)
+            if window_days
+            else [(query["start_date"], query["end_date"])]
+        )
+        shards = (
+            split_ids(query[ids_key], ids_size)
+            if ids_key and ids_size
+            else [query.get(ids_key)]
+        )
+
+        def get(start_date: str, end_date: str, ids: Optional[str]):
+            part = dict(query, start_date=start_date, end_date=end_date)
+            if ids_key:
+                part[ids_key] = ids
+            if params is not None:
+                resp = self._get(url=url, params=part)
+            else:
+                resp = self._get(url=url, json=part)
+            return self._parse_response(response=resp)
+
+        return merge(
+            self._gather(
+                (
+                    functools.partial(get, *window, ids)
+                    for window in windows
+                    for ids in shards
+                ),
+                concurrency=concurrency,
+            )
+        )
+
+    def _stream(
+        self,
+        url: str,
+        path: Sequence[str] = (),
+        model: Optional[Type[BaseModel]] = None,
+        return_json: bool = False,
+        method: str = "GET",
+        **kwargs,
+    ) -> Iterator:
+        """
+        Send a request and yield the elements of the json array in the response while it is being read.
+
+        :param url: URL for the request.
+        :param path: Keys to the array in the response, like ["items"].
+        :param model: Model class for each element, None to yield the json data.
+        :param return_json: Type for yielded data. If you set True JSON data will be yielded.
+        :param method: Http method.
+        :param kwargs: Other parameters for the request, like params and json.
+        :return: Elements generator.
+        """
+        for item in self._client.stream_json(
+            method=method, url=url, path=path, **kwargs
+        ):
+            yield item if return_json or model is None else self._to_model(
+                model=model, data=item
+            )
+
     def _get(self, url, **kwargs):
         return self._client.request(
             method="GET",
@@ -57,6 +225,224 @@ class Endpoint(BaseEndpoint):
 
 
 class AsyncEndpoint(BaseEndpoint):
+    async def _iter_pages(self, func: Callable, **kwargs) -> AsyncIterator[dict]:
+        """
+        Walk the bookmark cursor of a list method and yield the JSON pages.
+
+        :param func: List method which accepts bookmark and return_json.
+        :param kwargs: Other parameters for the list method.
+        :return: Pages async generator.
+        """
+        bookmark: Optional[str] = None
+        while True:
+            data = await func(bookmark=bookmark, return_json=True, **kwargs)
+            yield data
+            bookmark = data.get("bookmark")
+            if not bookmark:
+                break
+
+    async def _prefetch_pages(
+        self, func: Callable, prefetch: int, **kwargs
+    ) -> AsyncIterator[dict]:
+        """
+        Same as _iter_pages, but the pages are fetched by a background task.
+        The next page is requested as soon as the bookmark of the previous one is known,
+        at most prefetch pages are buffered waiting for the consumer.
+
+        :param func: List method which accepts bookmark and return_json.
+        :param prefetch: Size for the pages buffer.
+        :param kwargs: Other parameters for the list method.
+        :return: Pages async generator.
+        """
+        queue = asyncio.Queue(maxsize=prefetch)
+        done = object()
+
+        async def producer():
+            pages = self._iter_pages(func, **kwargs)
+            try:
+                async for page in pages:
+                    await queue.put(page)
+            except asyncio.CancelledError:
+                # CancelledError is an Exception before Python 3.8, don't put it to the full queue.
+                raise
+            except Exception as e:
+                await queue.put(e)
+            else:
+                await queue.put(done)
+            finally:
+                await pages.aclose()
+
+        task = asyncio.ensure_future(producer())
+        try:
+            while True:
+                page = await queue.get()
+                if page is done:
+                    break
+                if isinstance(page, Exception):
+                    raise page
+                yield page
+        finally:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    async def _iter_items(
+        self,
+        func: Callable,
+        model: Type[BaseModel],
+        return_json: bool = False,
+        prefetch: int = 0,
+        **kwargs,
+    ) -> AsyncIterator:
+        """
+        Walk the bookmark cursor of a list method and yield the items one by one.
+
+        :param func: List method which accepts bookmark and return_json.
+        :param model: Model class for each item.
+        :param return_json: Type for yielded data. If you set True JSON data will be yielded.
+        :param prefetch: Number of pages to request ahead while the current page is consumed.
+        :param kwargs: Other parameters for the list method.
+        :return: Items async generator.
+        """
+        if prefetch > 0:
+            pages = self._prefetch_pages(func, prefetch=prefetch, **kwargs)
+        else:
+            pages = self._iter_pages(func, **kwargs)
+        try:
+            async for data in pages:
+                for item in data.get("items") or []:
+                    yield item if return_json else self._to_model(
+                        model=model, data=item
+                    )
+        finally:
+            await pages.aclose()
+
+    async def _get_many(
+        self, func: Callable, ids: Iterable[str], concurrency: int = 10, **kwargs
+    ) -> List[Any]:
+        """
+        Call a get method for each id concurrently.
+
+        :param func: Get method which accepts the id as first parameter.
+        :param ids: Identifiers for the objects.
+        :param concurrency: Maximum number of calls running at the same time.
+        :param kwargs: Other parameters for the get method.
+        :return: Results in the same order of ids. A failed call is replaced by its exception.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def call(obj_id):
+            async with semaphore:
+                try:
+                    return await func(obj_id, **kwargs)
+                except Exception as e:
+                    return e
+
+        return list(await asyncio.gather(*(call(obj_id) for obj_id in ids)))
+
+    async def _gather(
+        self, calls: Iterable[Callable[[], Awaitable]], concurrency: int = 4
+    ) -> List[Any]:
+        """
+        Run calls concurrently, and raise the first error.
+
+        :param calls: Callables without parameters, which return awaitables.
+        :param concurrency: Maximum number of calls running at the same time.
+        :return: Results in the same order of calls.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def call(func):
+            async with semaphore:
+                return await func()
+
+        return list(await asyncio.gather(*(call(func) for func in calls)))
+
+    async def _get_parts(
+        self,
+        url: str,
+        merge: Callable[[List[Any]], Any],
+        window_days: Optional[int] = None,
+        concurrency: int = 4,
+        params: Optional[dict] = None,
+        json: Optional[dict] = None,
+        ids_key: Optional[str] = None,
+        ids_size: Optional[int] = None,
+    ) -> Any:
+        """
+        Split an analytics query into parts by the date range and the ids,
+        get the parts concurrently and merge the results.
+
+        :param url: URL for the query.
+        :param merge: Function to merge the json data of the parts.
+        :param window_days: Maximum days for a part. None to not split the date range.
+        :param concurrency: Maximum number of parts requested at the same time.
+        :param params: URL parameters with start_date and end_date.
+        :param json: Json data with start_date and end_date, for the query doesn't use params.
+        :param ids_key: Key for the comma-separated ids in the query, like "campaign_ids". None to not split the ids.
+        :param ids_size: Maximum ids for a part. None to not split the ids.
+        :return: Merged json data.
+        """
+        query = params if params is not None else json
+        windows = (
+            split_date_range(query["start_date"], query["end_date"], window_days)
+            if window_days
+            else [(query["start_date"], query["end_date"])]
+        )
+        shards = (
+            split_ids(query[ids_key], ids_size)
+            if ids_key and ids_size
+            else [query.get(ids_key)]
+        )
+
+        async def get(start_date: str, end_date: str, ids: Optional[str]):
+            part = dict(query, start_date=start_date, end_date=end_date)
+            if ids_key:
+                part[ids_key] = ids
+            if params is not None:
+                resp = await self._get(url=url, params=part)
+            else:
+                resp = await self._get(url=url, json=part)
+            return self._parse_response(response=resp)
+
+        return merge(
+            await self._gather(
+                (
+                    functools.partial(get, *window, ids)
+                    for window in windows
+                    for ids in shards
+                ),
+                concurrency=concurrency,
+            )
+        )
+
+    async def _stream(
+        self,
+        url: str,
+        path: Sequence[str] = (),
+        model: Optional[Type[BaseModel]] = None,
+        return_json: bool = False,
+        method: str = "GET",
+        **kwargs,
+    ) -> AsyncIterator:
+        """
+        Send a request and yield the elements of the json array in the response while it is being read.
+
+        :param url: URL for the request.
+        :param path: Keys to the array in the response, like ["items"].
+        :param model: Model class for each element, None to yield the json data.
+        :param return_json: Type for yielded data. If you set True JSON data will be yielded.
+        :param method: Http method.
+        :param kwargs: Other parameters for the request, like params and json.
+        :return: Elements async generator.
+        """
+        async for item in self._client.stream_json(
+            method=method, url=url, path=path, **kwargs
+        ):
+            yield item if return_json or model is None else self._to_model(
+                model=model, data=item
+            )
+
     async def _get(self, url, **kwargs):
         return await self._client.request(
             method="GET",
@@ -0,0 +1,363 @@
+"""
+    Response cache for read endpoints.
+"""
+
+import base64
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from httpx import Headers, Request, Response
+
+# Headers for the encoded body on the wire. The entry keeps the decoded content, so these don't apply to it.
+_TRANSFER_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+# Writes on a resource also change the listings of these resources.
+INVALIDATION_RELATIONS: Dict[str, Tuple[str, ...]] = {
+    "pins": ("pins", "boards"),
+    "boards": ("boards", "pins"),
+    "media": ("media",),
+    "catalogs": ("catalogs",),
+    "ad_accounts": ("ad_accounts",),
+}
+
+
+def cache_key(
+    method: str,
+    url: str,
+    params: Optional[dict] = None,
+    json_data: Optional[dict] = None,
+    token: str = "",
+) -> str:
+    """
+    Build the cache key for a request. The key starts with "{METHOD} {url}" to support prefix invalidation.
+
+    :param method: Http method.
+    :param url: Full url for the request.
+    :param params: URL parameters for the request.
+    :param json_data: Json data for the request.
+    :param token: Access token fingerprint.
+    :return: Cache key.
+    """
+    query = (
+        urlencode(sorted((k, v) for k, v in params.items() if v is not None), True)
+        if params
+        else ""
+    )
+    body = (
+        hashlib.sha256(
+            json.dumps(json_data, sort_keys=True).encode("utf-8")
+        ).hexdigest()[:16]
+        if json_data
+        else ""
+    )
+    return f"{method.upper()} {url}?{query}#{body}@{token}"
+
+
+def invalidation_prefixes(base_url: str, path: str) -> List[str]:
+    """
+    Get the cache key prefixes to invalidate for a write on the path.
+
+    :param base_url: Api base url.
+    :param path: Path for the write request, like "boards/xxx/sections"
+    :return: Cache key prefixes.
+    """
+    resource = path.split("/", 1)[0]
+    prefixes = []
+    for related in INVALIDATION_RELATIONS.get(resource, (resource,)):
+        prefixes.append(f"GET {base_url}{related}/")
+        prefixes.append(f"GET {base_url}{related}?")
+    return prefixes
+
+
+class CacheEntry:
+    """A snapshot for a response."""
+
+    __slots__ = ("status_code", "headers", "content")
+
+    def __init__(
+        self, status_code: int, headers: List[Tuple[str, str]], content: bytes
+    ):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @staticmethod
+    def _content_headers(headers: Iterable[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        return [(k, v) for k, v in headers if k.lower() not in _TRANSFER_HEADERS]
+
+    @classmethod
+    def from_response(cls, response: Response) -> "CacheEntry":
+        return cls(
+            status_code=response.status_code,
+            headers=cls._content_headers(response.headers.items()),
+            content=response.content,
+        )
+
+    def to_response(self, method: str, url: str) -> Response:
+        # Entries stored by older versions may still have the transfer headers.
+        return Response(
+            status_code=self.status_code,
+            headers=Headers(self._content_headers(self.headers)),
+            content=self.content,
+            request=Request(method=method, url=url),
+        )
+
+    def dumps(self) -> bytes:
+        return json.dumps(
+            {
+                "status_code": self.status_code,
+                "headers": self.headers,
+                "content": base64.b64encode(self.content).decode("ascii"),
+            }
+        ).encode("utf-8")
+
+    @classmethod
+    def loads(cls, data: bytes) -> "CacheEntry":
+        obj = json.loads(data)
+        return cls(
+            status_code=obj["status_code"],
+            headers=[tuple(h) for h in obj["headers"]],
+            content=base64.b64decode(obj["content"]),
+        )
+
+
+class BaseCache:
+    """Base class for cache backends."""
+
+    def __init__(
+        self, ttl: float = 60, endpoint_ttls: Optional[Dict[str, float]] = None
+    ):
+        """
+        :param ttl: Default seconds to keep a response.
+        :param endpoint_ttls: Seconds to keep the responses for special endpoints, matched by the longest path prefix.
+            like {"user_account": 300, "catalogs/feeds": 30, "pins": 0}. 0 means not cache.
+        """
+        self.ttl = ttl
+        self.endpoint_ttls = endpoint_ttls or {}
+
+    def ttl_for(self, path: str) -> float:
+        """
+        :param path: Path for the api, like "boards/xxx/pins"
+        :return: Seconds to keep the response.
+        """
+        matched = None
+        for prefix in self.endpoint_ttls:
+            if path == prefix or path.startswith(prefix.rstrip("/") + "/"):
+                if matched is None or len(prefix) > len(matched):
+                    matched = prefix
+        return self.ttl if matched is None else self.endpoint_ttls[matched]
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        raise NotImplementedError
+
+    def set(self, key: str, entry: CacheEntry, ttl: float) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def delete_prefix(self, prefix: str) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class MemoryCache(BaseCache):
+    """In-memory LRU cache, safe to share between threads."""
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 60,
+        endpoint_ttls: Optional[Dict[str, float]] = None,
+    ):
+        """
+        :param maxsize: Maximum number of responses, the least recently used is evicted.
+        :param ttl: Default seconds to keep a response.
+        :param endpoint_ttls: Seconds to keep the responses for special endpoints.
+        """
+        super().__init__(ttl=ttl, endpoint_ttls=endpoint_ttls)
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, Tuple[CacheEntry, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            entry, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry, ttl: float) -> None:
+        with self._lock:
+            self._data[key] = (entry, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [k for k in self._data if k.startswith(prefix)]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class SQLiteCache(BaseCache):
+    """Cache in a sqlite database, responses can be kept between processes."""
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        maxsize: int = 10000,
+        ttl: float = 60,
+        endpoint_ttls: Optional[Dict[str, float]] = None,
+    ):
+        """
+        :param path: Path for the database file.
+        :param maxsize: Maximum number of responses, the least recently used is evicted.
+        :param ttl: Default seconds to keep a response.
+        :param endpoint_ttls: Seconds to keep the responses for special endpoints.
+        """
+        super().__init__(ttl=ttl, endpoint_ttls=endpoint_ttls)
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value BLOB, expires_at REAL, accessed_at REAL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+        return CacheEntry.loads(row[0])
+
+    def set(self, key: str, entry: CacheEntry, ttl: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (key, entry.dumps(), now + ttl, now),
+            )
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses "
+                "ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.maxsize,),
+            )
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM responses WHERE substr(key, 1, ?) = ?",
+                (len(prefix), prefix),
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+
+class RedisCache(BaseCache):
+    """
+    Cache in redis. The client can be a redis.Redis, or any object implements
+    get(name), set(name, value, px=milliseconds), delete(*names) and scan_iter(match=pattern).
+
+    Eviction is left to redis, set maxmemory-policy to allkeys-lru for a LRU cache.
+    """
+
+    def __init__(
+        self,
+        client,
+        key_prefix: str = "pinterest:",
+        ttl: float = 60,
+        endpoint_ttls: Optional[Dict[str, float]] = None,
+    ):
+        """
+        :param client: Redis client.
+        :param key_prefix: Prefix for all the keys.
+        :param ttl: Default seconds to keep a response.
+        :param endpoint_ttls: Seconds to keep the responses for special endpoints.
+        """
+        super().__init__(ttl=ttl, endpoint_ttls=endpoint_ttls)
+        self.client = client
+        self.key_prefix = key_prefix
+
+    @staticmethod
+    def _escape(pattern: str) -> str:
+        for char in ("\\", "*", "?", "[", "]"):
+            pattern = pattern.replace(char, "\\" + char)
+        return pattern
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        data = self.client.get(self.key_prefix + key)
+        return None if data is None else CacheEntry.loads(data)
+
+    def set(self, key: str, entry: CacheEntry, ttl: float) -> None:
+        self.client.set(
+            self.key_prefix + key, entry.dumps(), px=max(1, int(ttl * 1000))
+        )
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.key_prefix + key)
+
+    def _delete_keys(self, keys: Iterable) -> None:
+        keys = list(keys)
+        if keys:
+            self.client.delete(*keys)
+
+    def delete_prefix(self, prefix: str) -> None:
+        self._delete_keys(
+            self.client.scan_iter(match=self._escape(self.key_prefix + prefix) + "*")
+        )
+
+    def clear(self) -> None:
+        self._delete_keys(
+            self.client.scan_iter(match=self._escape(self.key_prefix) + "*")
+        )
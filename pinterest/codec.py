@@ -0,0 +1,96 @@
+"""
+    Json codecs for decoding responses and encoding request bodies.
+"""
+
+import json
+from typing import Any, Optional, Union
+
+
+class JsonCodec:
+    """Codec by the standard library json."""
+
+    name = "json"
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    Codec by orjson. Data orjson not supports falls back to json.
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        try:
+            return self._orjson.loads(data)
+        except ValueError:
+            return super().loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            return self._orjson.dumps(obj)
+        except TypeError:
+            return super().dumps(obj)
+
+
+class MsgspecCodec(JsonCodec):
+    """
+    Codec by msgspec. Data msgspec not supports falls back to json.
+    """
+
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+
+        self._decoder = msgspec.json.Decoder()
+        self._encoder = msgspec.json.Encoder()
+        self._errors = (msgspec.DecodeError, ValueError)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except self._errors:
+            return super().loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            return self._encoder.encode(obj)
+        except (TypeError, OverflowError):
+            return super().dumps(obj)
+
+
+CODECS = {
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+    "json": JsonCodec,
+}
+
+
+def get_codec(codec: Optional[Union[str, JsonCodec]] = "auto") -> JsonCodec:
+    """
+    :param codec: A codec instance, or name for the codec: "orjson", "msgspec", "json".
+        "auto" uses the first installed one in this order.
+    :return: Codec instance.
+    """
+    if isinstance(codec, JsonCodec):
+        return codec
+    if codec is None or codec == "auto":
+        for codec_class in CODECS.values():
+            try:
+                return codec_class()
+            except ImportError:
+                continue
+    if codec not in CODECS:
+        raise ValueError(f"Unknown json codec {codec}, should be one of {list(CODECS)}")
+    return CODECS[codec]()
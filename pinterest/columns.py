@@ -0,0 +1,213 @@
+"""
+    Columnar tables for analytics.
+
+    Metrics are kept in typed arrays, one for each metric, instead of a dict for each day,
+    which is compact and fast to aggregate. Tables can be exported to numpy or pandas if installed.
+"""
+
+import math
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+Column = Union[array, List[Any]]
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class Columns:
+    """
+    Table with an index column and a column for each field. Numeric columns are array("d"),
+    with nan for missing values. Other columns are lists.
+    """
+
+    def __init__(self, index_name: str, index: List[Any], columns: Dict[str, Column]):
+        """
+        :param index_name: Name for the index column, like "date".
+        :param index: Values for the index, one for each row.
+        :param columns: Columns by name, each has one value for each row.
+        """
+        self.index_name = index_name
+        self.index = index
+        self.columns = columns
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[dict],
+        index: str,
+        metrics_key: Optional[str] = None,
+        fields: Sequence[str] = (),
+    ) -> "Columns":
+        """
+        Build the table from rows.
+
+        :param rows: Rows like {"date": "2022-08-01", "metrics": {"IMPRESSION": 1}}.
+        :param index: Key for the index in rows, like "date".
+        :param metrics_key: Key for the nested metrics dict in rows, like "metrics".
+            None if metrics are at the top of rows, like the rows of ad analytics.
+        :param fields: Other keys in rows to keep as columns, like "data_status".
+        :return: Columns
+        """
+        index_values = []
+        values: Dict[str, List[Any]] = {}
+        for i, row in enumerate(rows):
+            index_values.append(row.get(index))
+            metrics = (row.get(metrics_key) or {}) if metrics_key else row
+            items = [(k, v) for k, v in metrics.items() if k != index]
+            items.extend((k, row.get(k)) for k in fields)
+            for key, value in items:
+                column = values.get(key)
+                if column is None:
+                    column = values[key] = [None] * i
+                column.append(value)
+            for column in values.values():
+                if len(column) <= i:
+                    column.append(None)
+        columns = {}
+        for key, column in values.items():
+            if all(v is None or _is_number(v) for v in column):
+                columns[key] = array(
+                    "d", (math.nan if v is None else v for v in column)
+                )
+            else:
+                columns[key] = column
+        return cls(index_name=index, index=index_values, columns=columns)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def __getitem__(self, name: str) -> Column:
+        return self.columns[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.columns)
+
+    def __repr__(self):
+        return f"Columns(index_name={self.index_name!r}, rows={len(self)}, columns={list(self.columns)})"
+
+    @property
+    def names(self) -> List[str]:
+        return list(self.columns)
+
+    def sum(self, name: str) -> float:
+        """
+        :param name: Name for a numeric column.
+        :return: Sum of the values, missing values are skipped.
+        """
+        return math.fsum(v for v in self.columns[name] if not math.isnan(v))
+
+    def mean(self, name: str) -> float:
+        """
+        :param name: Name for a numeric column.
+        :return: Mean of the values, missing values are skipped. nan for no values.
+        """
+        values = [v for v in self.columns[name] if not math.isnan(v)]
+        return math.fsum(values) / len(values) if values else math.nan
+
+    def rolling_sum(self, name: str, window: int) -> array:
+        """
+        :param name: Name for a numeric column.
+        :param window: Number of rows in the window, like 7 for weekly sums of daily metrics.
+        :return: Sum of each window ending at the row, nan for the first rows without a full window.
+        """
+        column = self.columns[name]
+        result = array("d", [math.nan]) * len(column)
+        total = 0.0
+        for i, value in enumerate(column):
+            total += 0.0 if math.isnan(value) else value
+            if i >= window:
+                previous = column[i - window]
+                total -= 0.0 if math.isnan(previous) else previous
+            if i >= window - 1:
+                result[i] = total
+        return result
+
+    def ratio(self, numerator: str, denominator: str) -> array:
+        """
+        :param numerator: Name for a numeric column.
+        :param denominator: Name for a numeric column.
+        :return: Ratio for each row, like ratio("PIN_CLICK", "IMPRESSION") for click through rate.
+            nan for zero denominator.
+        """
+        return array(
+            "d",
+            (
+                n / d if d else math.nan
+                for n, d in zip(self.columns[numerator], self.columns[denominator])
+            ),
+        )
+
+    def to_dict(self) -> Dict[str, List[Any]]:
+        """
+        :return: Dict of lists, with the index.
+        """
+        data = {self.index_name: list(self.index)}
+        data.update({k: list(v) for k, v in self.columns.items()})
+        return data
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """
+        :return: Dict of numpy arrays, with the index. Need numpy installed.
+        """
+        import numpy as np
+
+        data = {self.index_name: np.array(self.index, dtype=object)}
+        for key, column in self.columns.items():
+            if isinstance(column, array):
+                data[key] = np.frombuffer(column, dtype=np.float64).copy()
+            else:
+                data[key] = np.array(column, dtype=object)
+        return data
+
+    def to_pandas(self):
+        """
+        :return: pandas.DataFrame indexed by the index. Need pandas installed.
+        """
+        import pandas as pd
+
+        data = self.to_numpy()
+        index = pd.Index(data.pop(self.index_name), name=self.index_name)
+        return pd.DataFrame(data, index=index)
+
+
+def analytics_columns(analytics: Any) -> Columns:
+    """
+    :param analytics: Analytics for user account or pin.
+    :return: Daily metrics as columns, indexed by date.
+    """
+    daily_metrics = (analytics.all.daily_metrics if analytics.all else None) or []
+    return Columns.from_rows(
+        (
+            {"date": m.date, "data_status": m.data_status, "metrics": m.metrics}
+            for m in daily_metrics
+        ),
+        index="date",
+        metrics_key="metrics",
+        fields=("data_status",),
+    )
+
+
+def top_pins_columns(analytics: Any) -> Columns:
+    """
+    :param analytics: TopPinsAnalytics.
+    :return: Metrics for pins as columns, indexed by pin id.
+    """
+    return Columns.from_rows(
+        ({"pin_id": p.pin_id, "metrics": p.metrics} for p in analytics.pins or []),
+        index="pin_id",
+        metrics_key="metrics",
+    )
+
+
+def rows_columns(rows: Iterable[dict], index: str = "DATE") -> Columns:
+    """
+    :param rows: Rows from the analytics of ad accounts, like get_campaign_analytics.
+    :param index: Key for the index in rows.
+    :return: Columns for the rows, the other keys like CAMPAIGN_ID are kept as columns.
+    """
+    return Columns.from_rows(rows, index=index)
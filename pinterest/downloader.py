@@ -0,0 +1,457 @@
+"""
+    Concurrent downloader for pin images.
+
+    Images are picked from Pin.media.images by the preferred size, and identical urls are downloaded once
+    for all the pins using them. Each image is written to a ".part" file first and renamed when complete,
+    so the existing files are skipped and the ".part" files are resumed by Range requests in a later run.
+    The ETag or Last-Modified of the image is kept beside the ".part" file and sent as If-Range, so an image
+    changed on the server is downloaded again instead of appended to the old bytes.
+"""
+
+import asyncio
+import functools
+import hashlib
+import os
+import posixpath
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from httpx import Response, TransportError
+
+from pinterest.exceptions import PinterestException
+from pinterest.retry import RetryPolicy
+from pinterest.utils.concurrency import async_run_bounded, run_bounded
+
+# Size keys for Pin.media.images, from the largest.
+DEFAULT_IMAGE_SIZES = ("originals", "1200x", "600x", "400x300", "150x150")
+DEFAULT_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+PART_SUFFIX = ".part"
+# Suffix for the file keeping the validator of the ".part" file, for If-Range.
+VALIDATOR_SUFFIX = ".part.validator"
+
+
+def pin_images(pin: Union[Any, dict]) -> Dict[str, Any]:
+    """
+    :param pin: Pin model, or json data for the pin.
+    :return: Images for the pin by size key, empty for the pins without images, like video pins.
+    """
+    if isinstance(pin, dict):
+        return (pin.get("media") or {}).get("images") or {}
+    media = getattr(pin, "media", None)
+    return getattr(media, "images", None) or {}
+
+
+def _image_field(image: Union[Any, dict], name: str) -> Any:
+    if isinstance(image, dict):
+        return image.get(name)
+    return getattr(image, name, None)
+
+
+def pick_image(
+    images: Dict[str, Any], sizes: Iterable[str] = DEFAULT_IMAGE_SIZES
+) -> Optional[str]:
+    """
+    Pick the url of the image in the preferred size.
+
+    :param images: Images by size key, like Pin.media.images.
+    :param sizes: Size keys by preference. If no one is available, the widest image is picked.
+    :return: Url for the image, None if the pin has no image.
+    """
+    for size in sizes:
+        url = _image_field(images.get(size), "url")
+        if url:
+            return url
+    candidates = [
+        (_image_field(image, "width") or 0, _image_field(image, "url"))
+        for image in images.values()
+    ]
+    candidates = [c for c in candidates if c[1]]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda c: c[0])[1]
+
+
+def image_filename(url: str) -> str:
+    """
+    Name for the downloaded image, the same url always has the same name.
+
+    :param url: Url for the image.
+    :return: File name by the hash of url, with the extension of url.
+    """
+    ext = posixpath.splitext(urlsplit(url).path)[1].lower() or ".jpg"
+    return hashlib.sha1(url.encode("utf-8")).hexdigest() + ext
+
+
+def parse_content_range_total(value: Optional[str]) -> Optional[int]:
+    """
+    :param value: Content-Range header, like "bytes 0-99/1000" or "bytes */1000".
+    :return: Total bytes of the resource, None if unknown.
+    """
+    if not value or "/" not in value:
+        return None
+    total = value.rsplit("/", 1)[1].strip()
+    return int(total) if total.isdigit() else None
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+async def _in_executor(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run the file system call in the default executor, so the event loop is not blocked by the disk.
+    """
+    return await asyncio.get_running_loop().run_in_executor(
+        None, functools.partial(func, *args, **kwargs)
+    )
+
+
+class ImageDownload:
+    """Result for an image url, shared by all the pins using it."""
+
+    def __init__(self, url: str, path: str):
+        """
+        :param url: Url for the image.
+        :param path: Path for the downloaded file.
+        """
+        self.url = url
+        self.path = path
+        self.pin_ids: List[str] = []
+        # "downloaded", "resumed" or "skipped" for the files existing before.
+        self.status: Optional[str] = None
+        # Bytes received in this run.
+        self.received = 0
+        self.error: Optional[Exception] = None
+
+    def __repr__(self):
+        return (
+            f"ImageDownload(url={self.url!r}, path={self.path!r}, "
+            f"pin_ids={self.pin_ids!r}, status={self.status!r}, error={self.error!r})"
+        )
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status is not None
+
+
+class _BaseDownloader:
+    def __init__(
+        self,
+        api: Any,
+        directory: Union[str, "os.PathLike[str]"],
+        sizes: Iterable[str] = DEFAULT_IMAGE_SIZES,
+        max_connections: int = 8,
+        chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE,
+        retry_policy: Optional[RetryPolicy] = None,
+    ):
+        """
+        :param api: Api to download with, images are requested by its http client without the access token.
+        :param directory: Directory for the images.
+        :param sizes: Size keys of Pin.media.images by preference.
+        :param max_connections: Maximum downloads at the same time, each one holds a connection.
+        :param chunk_size: Bytes of a chunk written to the file.
+        :param retry_policy: Policy to retry the failed downloads, each retry resumes from the received bytes.
+            Default is the policy of the api, or 3 attempts if the api has none.
+        """
+        self.api = api
+        self.directory = os.fspath(directory)
+        self.sizes = tuple(sizes)
+        self.max_connections = max_connections
+        self.chunk_size = chunk_size
+        self.retry_policy = retry_policy or api.retry_policy or RetryPolicy()
+
+    def plan(self, pins: Iterable[Union[Any, dict]]) -> List[ImageDownload]:
+        """
+        Pick the image for each pin, and merge the pins with the same url.
+
+        :param pins: Pin models, or json data for pins.
+        :return: Downloads for the unique urls, in the order of first pin.
+        """
+        downloads: Dict[str, ImageDownload] = {}
+        for pin in pins:
+            url = pick_image(pin_images(pin), self.sizes)
+            if url is None:
+                continue
+            item = downloads.get(url)
+            if item is None:
+                path = os.path.join(self.directory, image_filename(url))
+                item = downloads[url] = ImageDownload(url=url, path=path)
+            pin_id = pin.get("id") if isinstance(pin, dict) else getattr(pin, "id")
+            item.pin_ids.append(pin_id)
+        return list(downloads.values())
+
+    @staticmethod
+    def _offset(item: ImageDownload) -> Tuple[int, Dict[str, str]]:
+        """
+        :return: Bytes in the ".part" file to resume from, and headers to request the rest.
+        """
+        try:
+            offset = os.path.getsize(item.path + PART_SUFFIX)
+        except OSError:
+            offset = 0
+        # Ranges are for the raw bytes, so the content must not be encoded.
+        headers = {"Accept-Encoding": "identity"}
+        if offset:
+            try:
+                with open(item.path + VALIDATOR_SUFFIX, "r", encoding="utf-8") as f:
+                    validator = f.read().strip()
+            except OSError:
+                validator = ""
+            if validator:
+                headers["Range"] = f"bytes={offset}-"
+                # The server sends the whole image with 200 if it has changed.
+                headers["If-Range"] = validator
+            else:
+                # Not known whether the image has changed, download it again.
+                offset = 0
+        return offset, headers
+
+    @staticmethod
+    def _save_validator(item: ImageDownload, response: Response) -> None:
+        """
+        Keep the strong validator of the image for If-Range, weak ETags can't be used for ranges.
+        """
+        etag = response.headers.get("ETag")
+        validator = (
+            etag
+            if etag and not etag.startswith("W/")
+            else response.headers.get("Last-Modified")
+        )
+        if validator:
+            with open(item.path + VALIDATOR_SUFFIX, "w", encoding="utf-8") as f:
+                f.write(validator)
+        else:
+            _remove(item.path + VALIDATOR_SUFFIX)
+
+    @staticmethod
+    def _stale_part(item: ImageDownload, response: Response, offset: int) -> bool:
+        """
+        Remove the ".part" file if it is not a prefix of the image anymore, the range is not satisfiable.
+
+        :return: Whether the ".part" file is removed and the image must be downloaded again.
+        """
+        if response.status_code != 416 or not offset:
+            return False
+        total = parse_content_range_total(response.headers.get("Content-Range"))
+        if total == offset:
+            return False
+        os.remove(item.path + PART_SUFFIX)
+        _remove(item.path + VALIDATOR_SUFFIX)
+        return True
+
+    @staticmethod
+    def _open_part(item: ImageDownload, response: Response, offset: int):
+        """
+        :return: File to write the response, None if nothing to write.
+        """
+        part = item.path + PART_SUFFIX
+        if response.status_code == 206 and offset:
+            item.status = item.status or "resumed"
+            return open(part, "ab")
+        if response.status_code == 200:
+            # A new download, or the image has changed since the ".part" file.
+            item.status = item.status or "downloaded"
+            _BaseDownloader._save_validator(item, response)
+            return open(part, "wb")
+        if response.status_code == 416 and offset:
+            # The ".part" file is complete, only the rename was interrupted.
+            item.status = item.status or "resumed"
+            return None
+        raise PinterestException(
+            code=response.status_code, message=f"Failed to download {item.url}"
+        )
+
+    @staticmethod
+    def _complete(item: ImageDownload) -> None:
+        os.replace(item.path + PART_SUFFIX, item.path)
+        _remove(item.path + VALIDATOR_SUFFIX)
+
+
+class ImageDownloader(_BaseDownloader):
+    """
+    Downloader for pin images, by threads.
+
+    >>> downloader = ImageDownloader(api, "images/")
+    >>> for item in downloader.download(pins):
+    ...     print(item.pin_ids, item.path if item.ok else item.error)
+    """
+
+    def download(
+        self,
+        pins: Iterable[Union[Any, dict]],
+        callback: Optional[Callable[[ImageDownload], None]] = None,
+    ) -> List[ImageDownload]:
+        """
+        Download the images for pins. Failed downloads are kept in the results with the error.
+
+        :param pins: Pin models, or json data for pins.
+        :param callback: Function called with each download once it is finished.
+        :return: Downloads for the unique urls, in the order of completion.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        results = []
+        calls = (lambda item=item: self.fetch(item) for item in self.plan(pins))
+        for item in run_bounded(calls, max_workers=self.max_connections):
+            if callback is not None:
+                callback(item)
+            results.append(item)
+        return results
+
+    def fetch(self, item: ImageDownload) -> ImageDownload:
+        """
+        Download an image, skipped if the file exists, or resumed from the ".part" file.
+
+        :param item: Download for the image.
+        :return: The download, with status or error.
+        """
+        if os.path.exists(item.path):
+            item.status = "skipped"
+            return item
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                result = self._fetch_once(item)
+            except TransportError as e:
+                result = e
+            except Exception as e:
+                # Errors like the status or the file system are not retried.
+                item.error = e
+                return item
+            if result is None:
+                return item
+            if not self.retry_policy.should_retry(
+                attempt=attempt, method="GET", result=result
+            ):
+                item.error = (
+                    result
+                    if isinstance(result, Exception)
+                    else PinterestException(
+                        code=result.status_code,
+                        message=f"Failed to download {item.url}",
+                    )
+                )
+                return item
+            event = self.retry_policy.retry_event(
+                attempt=attempt, method="GET", url=item.url, result=result
+            )
+            time.sleep(event.delay)
+
+    def _fetch_once(self, item: ImageDownload) -> Optional[Response]:
+        """
+        :return: None if complete, or the response to retry.
+        """
+        offset, headers = self._offset(item)
+        with self.api.client.stream("GET", item.url, headers=headers) as resp:
+            if resp.status_code in self.retry_policy.retry_statuses:
+                return resp
+            if self._stale_part(item, resp, offset):
+                restart = True
+            else:
+                restart = False
+                f = self._open_part(item, resp, offset)
+                if f is not None:
+                    with f:
+                        for chunk in resp.iter_raw(self.chunk_size):
+                            f.write(chunk)
+                            item.received += len(chunk)
+        if restart:
+            return self._fetch_once(item)
+        self._complete(item)
+        return None
+
+
+class AsyncImageDownloader(_BaseDownloader):
+    """
+    Downloader for pin images, for asyncio. The api must be an AsyncApi.
+    """
+
+    async def download(
+        self,
+        pins: Iterable[Union[Any, dict]],
+        callback: Optional[Callable[[ImageDownload], None]] = None,
+    ) -> List[ImageDownload]:
+        """
+        Download the images for pins. Failed downloads are kept in the results with the error.
+
+        :param pins: Pin models, or json data for pins.
+        :param callback: Function called with each download once it is finished.
+        :return: Downloads for the unique urls, in the order of completion.
+        """
+        await _in_executor(os.makedirs, self.directory, exist_ok=True)
+        results = []
+        calls = (lambda item=item: self.fetch(item) for item in self.plan(pins))
+        async for item in async_run_bounded(calls, concurrency=self.max_connections):
+            if callback is not None:
+                callback(item)
+            results.append(item)
+        return results
+
+    async def fetch(self, item: ImageDownload) -> ImageDownload:
+        """
+        Download an image, skipped if the file exists, or resumed from the ".part" file.
+
+        :param item: Download for the image.
+        :return: The download, with status or error.
+        """
+        if await _in_executor(os.path.exists, item.path):
+            item.status = "skipped"
+            return item
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                result = await self._fetch_once(item)
+            except TransportError as e:
+                result = e
+            except Exception as e:
+                # Errors like the status or the file system are not retried.
+                item.error = e
+                return item
+            if result is None:
+                return item
+            if not self.retry_policy.should_retry(
+                attempt=attempt, method="GET", result=result
+            ):
+                item.error = (
+                    result
+                    if isinstance(result, Exception)
+                    else PinterestException(
+                        code=result.status_code,
+                        message=f"Failed to download {item.url}",
+                    )
+                )
+                return item
+            event = self.retry_policy.retry_event(
+                attempt=attempt, method="GET", url=item.url, result=result
+            )
+            await asyncio.sleep(event.delay)
+
+    async def _fetch_once(self, item: ImageDownload) -> Optional[Response]:
+        """
+        :return: None if complete, or the response to retry.
+        """
+        offset, headers = await _in_executor(self._offset, item)
+        async with self.api.client.stream("GET", item.url, headers=headers) as resp:
+            if resp.status_code in self.retry_policy.retry_statuses:
+                return resp
+            if await _in_executor(self._stale_part, item, resp, offset):
+                restart = True
+            else:
+                restart = False
+                f = await _in_executor(self._open_part, item, resp, offset)
+                if f is not None:
+                    try:
+                        async for chunk in resp.aiter_raw(self.chunk_size):
+                            await _in_executor(f.write, chunk)
+                            item.received += len(chunk)
+                    finally:
+                        await _in_executor(f.close)
+        if restart:
+            return await self._fetch_once(item)
+        await _in_executor(self._complete, item)
+        return None
@@ -9,6 +9,7 @@ from dataclasses import dataclass, field
 from typing import Optional, List
 
 from .base import BaseModel
+from ..columns import Columns, analytics_columns, top_pins_columns
 
 
 @dataclass
@@ -28,6 +29,12 @@ class AnalyticsAll(BaseModel):
 class Analytics(BaseModel):
     all: Optional[AnalyticsAll] = field(default=None)
 
+    def to_columns(self) -> Columns:
+        """
+        :return: Daily metrics as columns, indexed by date.
+        """
+        return analytics_columns(self)
+
 
 @dataclass
 class TopPinsAnalyticsPin(BaseModel):
@@ -47,3 +54,9 @@ class TopPinsAnalytics(BaseModel):
     sort_by: Optional[str] = field(default=None)
     pins: Optional[List[TopPinsAnalyticsPin]] = field(default=None)
     date_availability: Optional[TopPinsAnalyticsDateAvailability] = field(default=None)
+
+    def to_columns(self) -> Columns:
+        """
+        :return: Metrics for pins as columns, indexed by pin id.
+        """
+        return top_pins_columns(self)
@@ -1,31 +1,219 @@
-from dataclasses import dataclass
+from dataclasses import MISSING, dataclass, fields, is_dataclass
 from typing import (
+    Any,
+    Callable,
     Dict,
+    List,
+    Tuple,
     Type,
     TypeVar,
     Optional,
+    Union,
+    get_type_hints,
 )
 
 from dataclasses_json import DataClassJsonMixin
 
 A = TypeVar("A", bound=DataClassJsonMixin)
 
+_PRIMITIVES = (str, int, float, bool)
+# dataclass: models are dataclasses.
+# compact: models are compact classes with slots, see pinterest.models.compact.
+# lazy: nested models are decoded on first access, see pinterest.models.lazy.
+MODEL_MODES = ("dataclass", "compact", "lazy")
+# Decoders for model classes and modes, built on first use.
+_DECODERS: Dict[Tuple[type, str], Callable[[dict], Any]] = {}
+
+
+def _coerce(type_: type) -> Callable[[Any], Any]:
+    def convert(value):
+        return value if isinstance(value, type_) else type_(value)
+
+    return convert
+
+
+def _build_converter(type_: Any, mode: str) -> Callable[[Any], Any]:
+    """
+    Build the function to convert a json value to the annotated type, same as dataclasses_json does.
+
+    :param type_: Annotated type for the value.
+    :param mode: Model mode for the nested models.
+    :return: Converter function.
+    """
+    origin = getattr(type_, "__origin__", None)
+    args = tuple(
+        a for a in getattr(type_, "__args__", ()) if not isinstance(a, TypeVar)
+    )
+    if type_ is Any:
+        return lambda value: value
+    if type_ in _PRIMITIVES:
+        return _coerce(type_)
+    if is_dataclass(type_) and issubclass(type_, BaseModel):
+        return lambda value: (
+            value if isinstance(value, type_) else get_decoder(type_, mode)(value)
+        )
+    if origin is Union:
+        options = [a for a in args if a is not type(None)]
+        if len(options) != 1 or len(args) != 2:
+            raise TypeError(f"Unsupported type {type_}")
+        inner = _build_converter(options[0], mode)
+        return lambda value: None if value is None else inner(value)
+    if type_ is list or origin is list:
+        if not args:
+            return list
+        item = _build_converter(args[0], mode)
+        return lambda value: [item(v) for v in value]
+    if type_ is dict or origin is dict:
+        if not args:
+            return dict
+        key, item = _build_converter(args[0], mode), _build_converter(args[1], mode)
+        return lambda value: {key(k): item(v) for k, v in value.items()}
+    raise TypeError(f"Unsupported type {type_}")
+
+
+def _has_model(type_: Any) -> bool:
+    if is_dataclass(type_):
+        return True
+    return any(_has_model(a) for a in getattr(type_, "__args__", ()))
+
+
+def _build_decoder(cls: Type[A], mode: str) -> Callable[[dict], Any]:
+    """
+    Build the decoder for a model class. Type hints are resolved only once here, instead of
+    on each call of from_dict.
+    Models with dataclasses_json configs or unsupported annotations are decoded by from_dict.
+
+    :param cls: Model class.
+    :param mode: Model mode.
+    :return: Function to convert a json dict to the model.
+    """
+    if getattr(cls, "dataclass_json_config", None):
+        return cls.from_dict
+    hints = get_type_hints(cls)
+    plan: List[Tuple[str, Optional[type], Callable[[Any], Any]]] = []
+    lazy_fields = []
+    # Lazy objects skip __init__, so the defaults and required fields are checked by the decoder.
+    required: List[str] = []
+    factories: List[Tuple[str, Callable[[], Any]]] = []
+    for f in fields(cls):
+        if not f.init or "dataclasses_json" in f.metadata:
+            return cls.from_dict
+        if f.default_factory is not MISSING:
+            factories.append((f.name, f.default_factory))
+        elif f.default is MISSING:
+            required.append(f.name)
+        type_ = hints[f.name]
+        try:
+            convert = _build_converter(type_, mode)
+        except TypeError:
+            return cls.from_dict
+        if mode == "lazy" and _has_model(type_):
+            lazy_fields.append(
+                (f.name, convert, None if f.default is MISSING else f.default)
+            )
+            continue
+        # Values with the exact primitive type need not convert.
+        exact = getattr(type_, "__args__", (type_,))[0]
+        plan.append((f.name, exact if exact in _PRIMITIVES else None, convert))
+
+    if mode == "lazy":
+        from .lazy import LazyField, lazy_class
+
+        target = lazy_class(cls, tuple(LazyField(*f) for f in lazy_fields))
+        lazy_names = tuple(f[0] for f in lazy_fields)
+
+        def decode_lazy(data: dict) -> Any:
+            if required and any(name not in data for name in required):
+                # raise the same error as the eager decoding.
+                return get_decoder(cls)(data)
+            obj = target.__new__(target)
+            values = obj.__dict__
+            for name, exact, convert in plan:
+                value = data.get(name, MISSING)
+                if value is MISSING:
+                    continue
+                if value is None or type(value) is exact:
+                    values[name] = value
+                else:
+                    values[name] = convert(value)
+            values["_lazy"] = {n: data[n] for n in lazy_names if n in data}
+            for name, factory in factories:
+                if name not in data:
+                    values[name] = factory()
+            return obj
+
+        return decode_lazy
+
+    if mode == "compact":
+        from .compact import compact_class
+
+        target = compact_class(cls)
+    else:
+        target = cls
+
+    def decode(data: dict) -> Any:
+        kwargs = {}
+        for name, exact, convert in plan:
+            if name not in data:
+                continue
+            value = data[name]
+            if value is None or type(value) is exact:
+                kwargs[name] = value
+            else:
+                kwargs[name] = convert(value)
+        return target(**kwargs)
+
+    return decode
+
+
+def get_decoder(cls: Type[A], mode: str = "dataclass") -> Callable[[dict], Any]:
+    """
+    :param cls: Model class.
+    :param mode: Model mode, one of MODEL_MODES.
+    :return: The cached decoder for the model class.
+    """
+    decoder = _DECODERS.get((cls, mode))
+    if decoder is None:
+        if mode not in MODEL_MODES:
+            raise ValueError(
+                f"Unknown model mode {mode}, should be one of {MODEL_MODES}"
+            )
+        decoder = _DECODERS[(cls, mode)] = _build_decoder(cls, mode)
+    return decoder
+
 
 @dataclass
 class BaseModel(DataClassJsonMixin):
     @classmethod
     def new_from_json_dict(
-        cls: Type[A], data: Optional[Dict], *, infer_missing=False
+        cls: Type[A],
+        data: Optional[Dict],
+        *,
+        infer_missing=False,
+        mode: str = "dataclass",
+        keep_raw: bool = False,
     ) -> Optional[A]:
         """
         Convert json dict to data class
         :param data: A json dict which will convert model class.
         :param infer_missing: if set True, will let missing field (not have default vale) to None
+        :param mode: Model mode, "compact" returns the compact model.
+        :param keep_raw: Keep the json dict on the returned object, see raw_json.
         :return: The data class
         """
         if not data:
             return None
-        c = cls.from_dict(data, infer_missing=infer_missing)
-        # save origin data
-        cls._json = data
+        if infer_missing:
+            c = cls.from_dict(data, infer_missing=infer_missing)
+        else:
+            c = get_decoder(cls, mode)(data)
+        if keep_raw:
+            c._json = data
         return c
+
+    @property
+    def raw_json(self) -> Optional[Dict]:
+        """
+        The origin json dict for the object, only kept when decoded with keep_raw=True.
+        """
+        return self.__dict__.get("_json")
@@ -0,0 +1,79 @@
+"""
+    Compact models, which keep fields in slots instead of a per-instance dict.
+
+    Each model class has a compact twin, built on first use. The twin is a subclass of the model
+    with a slot for each field, so it keeps the methods of the model and isinstance(obj, Pin) is True.
+    As the model has no slots, the instances still have a __dict__, the fields just don't use it.
+    On Python 3.7 to 3.10 this saves about a third of the memory, as the dict is never filled.
+    Python 3.11 preallocates the attribute values of each object, so the slots are added to them,
+    and the compact models can use more memory than the dataclass models, except the ones with many fields.
+    Use Api(model_mode="compact") to get compact models from the apis.
+"""
+from dataclasses import fields
+from typing import Any, Dict, Optional, Type
+
+
+class CompactModel:
+    """Mixin for compact models."""
+
+    __slots__ = ()
+    # The dataclass model this class is compact for.
+    model: type = None
+
+    def __getstate__(self):
+        return tuple(getattr(self, f.name) for f in fields(self.model)) + (
+            self.raw_json,
+        )
+
+    def __setstate__(self, state):
+        for f, value in zip(fields(self.model), state):
+            setattr(self, f.name, value)
+        self._json = state[-1]
+
+    def __reduce__(self):
+        return _restore, (self.model, self.__getstate__())
+
+    @property
+    def raw_json(self) -> Optional[Dict[str, Any]]:
+        """
+        The origin json dict for the object, only kept when decoded with keep_raw=True.
+        """
+        return getattr(self, "_json", None)
+
+    def to_model(self):
+        """
+        :return: The dataclass model with same data.
+        """
+        return self.model.from_dict(self.to_dict())
+
+
+def _restore(model: type, state: tuple) -> CompactModel:
+    cls = compact_class(model)
+    obj = cls.__new__(cls)
+    obj.__setstate__(state)
+    return obj
+
+
+_COMPACT_CLASSES: Dict[type, Type[CompactModel]] = {}
+
+
+def compact_class(model: type) -> Type[CompactModel]:
+    """
+    :param model: Dataclass model, like Pin.
+    :return: The compact class for the model, which is a subclass of the model.
+    """
+    cls = _COMPACT_CLASSES.get(model)
+    if cls is None:
+        cls = type(
+            model.__name__,
+            (CompactModel, model),
+            {
+                "__slots__": tuple(f.name for f in fields(model)) + ("_json",),
+                "__module__": __name__,
+                "__qualname__": model.__qualname__,
+                "__doc__": f"Compact model for {model.__name__}.",
+                "model": model,
+            },
+        )
+        cls = _COMPACT_CLASSES.setdefault(model, cls)
+    return cls
@@ -0,0 +1,83 @@
+"""
+    Lazy models, which decode the nested models only when they are accessed.
+
+    Each model class has a lazy subclass, built on first use. Primitive fields are set when the
+    object is created, fields with nested models keep the json value until the first access.
+    Use Api(model_mode="lazy") to get lazy models from the apis.
+"""
+from dataclasses import fields
+from typing import Any, Callable, Dict, Tuple
+
+_MISSING = object()
+
+
+class LazyField:
+    """Descriptor to decode the field on first access, the result is kept on the object."""
+
+    def __init__(self, name: str, convert: Callable[[Any], Any], default: Any = None):
+        self.name = name
+        self.convert = convert
+        self.default = default
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self.default
+        values = obj.__dict__
+        pending = values.get("_lazy", {})
+        value = pending.get(self.name, _MISSING)
+        if value is _MISSING:
+            # Missing in json, or decoded by another thread.
+            return values.get(self.name, self.default)
+        if value is not None:
+            value = self.convert(value)
+        # Instance attribute is found before this descriptor from now on.
+        values[self.name] = value
+        pending.pop(self.name, None)
+        return value
+
+
+class LazyModel:
+    """Mixin for lazy models."""
+
+    # The dataclass model this class is lazy for.
+    model: type = None
+
+    def __eq__(self, other):
+        if not isinstance(other, self.model):
+            return NotImplemented
+        return all(
+            getattr(self, f.name) == getattr(other, f.name)
+            for f in fields(self.model)
+            if f.compare
+        )
+
+    __hash__ = None
+
+    def __reduce__(self):
+        # Pickle as the dataclass model.
+        return self.model.from_dict, (self.to_dict(),)
+
+
+_LAZY_CLASSES: Dict[type, type] = {}
+
+
+def lazy_class(model: type, lazy_fields: Tuple[LazyField, ...]) -> type:
+    """
+    :param model: Dataclass model, like Pin.
+    :param lazy_fields: Descriptors for the fields to decode lazily.
+    :return: The lazy class for the model, which is a subclass of the model.
+    """
+    cls = _LAZY_CLASSES.get(model)
+    if cls is None:
+        attrs = {f.name: f for f in lazy_fields}
+        attrs.update(
+            {
+                "__module__": __name__,
+                "__qualname__": model.__qualname__,
+                "__doc__": f"Lazy model for {model.__name__}.",
+                "model": model,
+            }
+        )
+        cls = type(model.__name__, (LazyModel, model), attrs)
+        cls = _LAZY_CLASSES.setdefault(model, cls)
+    return cls
@@ -0,0 +1,430 @@
+"""
+    Batched status poller for media uploads.
+
+    Polling each media upload by media.get needs a request per pending media for each round. The poller
+    tracks the pending media, and resolves them together by scanning the pages of media.list, which
+    has the status of up to 100 media in a request. Only the media not found in the scanned pages are
+    requested one by one.
+"""
+
+import asyncio
+import contextlib
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import wait as futures_wait
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from pinterest.exceptions import PinterestException
+from pinterest.ratelimit import TokenBucketRateLimiter
+from pinterest.utils.batch import PollInterval
+from pinterest.utils.media import is_media_pending
+
+_RATE_LIMIT_KEY = "media_poller"
+
+
+class _BasePoller:
+    def __init__(
+        self,
+        media_endpoint: Any,
+        page_size: int = 100,
+        max_pages: int = 3,
+        max_gets: int = 10,
+        poll_interval: float = 1.0,
+        max_poll_interval: float = 30.0,
+        max_requests_per_second: float = 2.0,
+    ):
+        """
+        :param media_endpoint: Media endpoint to poll with, like api.media.
+        :param page_size: Media uploads for a page of media.list. [1..100]
+        :param max_pages: Maximum pages of media.list to scan in a round.
+        :param max_gets: Maximum media to get one by one in a round, for the media not found in the pages.
+        :param poll_interval: Seconds between rounds at first, also the minimum interval.
+        :param max_poll_interval: Maximum seconds between rounds, the interval grows while no media is resolved.
+        :param max_requests_per_second: Maximum requests per second sent by the poller.
+        """
+        self.media = media_endpoint
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.max_gets = max_gets
+        self.interval = PollInterval(initial=poll_interval, maximum=max_poll_interval)
+        self.limiter = TokenBucketRateLimiter(rate=max_requests_per_second, capacity=1)
+        self._pending: Dict[str, Any] = {}
+        # Guard for the pending media, rounds are guarded by their own lock.
+        self._guard = contextlib.nullcontext()
+
+    def __len__(self):
+        return len(self._pending)
+
+    @property
+    def pending(self) -> Set[str]:
+        """
+        :return: Ids for the pending media.
+        """
+        with self._guard:
+            return set(self._pending)
+
+    def _scan(self, items: List[Any], seen: Set[str]) -> int:
+        resolved = 0
+        for media in items or []:
+            seen.add(media.media_id)
+            if self._resolve(media):
+                resolved += 1
+        return resolved
+
+    def _track(
+        self, media_id: str, callback: Optional[Callable[[Any], None]], new_future
+    ):
+        with self._guard:
+            future = self._pending.get(media_id)
+            if future is None:
+                future = self._pending[media_id] = new_future()
+        if callback is not None:
+            future.add_done_callback(
+                lambda f: callback(f.result())
+                if not f.cancelled() and f.exception() is None
+                else None
+            )
+        # Poll soon for the new media.
+        self.interval.reset()
+        return future
+
+    def _missing(self, seen: Set[str]) -> List[str]:
+        with self._guard:
+            return [m for m in self._pending if m not in seen][: self.max_gets]
+
+    def _resolve(self, media: Any) -> bool:
+        if is_media_pending(media.status):
+            return False
+        with self._guard:
+            future = self._pending.pop(media.media_id, None)
+        if future is None:
+            return False
+        if not future.done():
+            future.set_result(media)
+        return True
+
+    def _fail(self, media_id: str, error: Exception) -> None:
+        with self._guard:
+            future = self._pending.pop(media_id, None)
+        if future is not None and not future.done():
+            future.set_exception(error)
+
+
+class MediaPoller(_BasePoller):
+    """
+    Poller for media uploads, safe to use from threads. Rounds run in the thread calling wait(),
+    or in a background thread after start().
+
+    >>> poller = MediaPoller(api.media)
+    >>> future = poller.add(media_id)
+    >>> poller.wait()
+    >>> future.result().status
+    'succeeded'
+    """
+
+    def __init__(self, media_endpoint: Any, **kwargs):
+        """
+        :param media_endpoint: Media endpoint to poll with, like api.media.
+        :param kwargs: Options for polling, see _BasePoller.
+        """
+        super().__init__(media_endpoint, **kwargs)
+        self._guard = threading.Lock()
+        self._lock = threading.Lock()
+        self._changed = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(
+        self, media_id: str, callback: Optional[Callable[[Any], None]] = None
+    ) -> Future:
+        """
+        Track a media upload.
+
+        :param media_id: Media identifier.
+        :param callback: Function called with the MediaUpload once it is processed.
+        :return: Future for the MediaUpload, with status "succeeded" or "failed".
+        """
+        future = self._track(media_id, callback, Future)
+        self._changed.set()
+        return future
+
+    def _throttle(self) -> None:
+        delay = self.limiter.acquire(_RATE_LIMIT_KEY)
+        if delay > 0:
+            time.sleep(delay)
+
+    def poll(self) -> int:
+        """
+        Run a round: scan the pages of media.list, then get the media not found one by one.
+
+        :return: Number of media resolved in this round.
+        """
+        with self._lock:
+            if not self._pending:
+                return 0
+            seen: Set[str] = set()
+            resolved, bookmark = 0, None
+            for _ in range(self.max_pages):
+                self._throttle()
+                page = self.media.list(
+                    page_size=self.page_size, bookmark=bookmark, use_cache=False
+                )
+                resolved += self._scan(page.items, seen)
+                bookmark = page.bookmark
+                if not self._pending or not bookmark or self.pending <= seen:
+                    break
+            missing = self._missing(seen)
+            for media_id in missing:
+                self._throttle()
+                try:
+                    media = self.media.get(media_id=media_id, use_cache=False)
+                except PinterestException as e:
+                    self._fail(media_id, e)
+                    continue
+                resolved += self._resolve(media)
+            return resolved
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Run rounds until all the media are resolved. The interval grows while no media is resolved.
+
+        :param timeout: Maximum seconds to wait, None to wait until all resolved.
+        :return: Whether all the media are resolved.
+        """
+        if self._thread is not None:
+            return self._wait_background(timeout)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._pending:
+            resolved = self.poll()
+            if not self._pending:
+                break
+            delay = self.interval.next(progress=resolved > 0)
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                delay = min(delay, remaining)
+            time.sleep(delay)
+        return not self._pending
+
+    def _wait_background(self, timeout: Optional[float]) -> bool:
+        with self._guard:
+            futures = list(self._pending.values())
+        futures_wait(futures, timeout=timeout)
+        return not self._pending
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> "MediaPoller":
+        """
+        Run rounds in a background thread, futures are resolved while the caller does other work.
+
+        :return: The poller.
+        """
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="MediaPoller", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while True:
+            # Cleared before the round, so the media added during the round wake up the wait.
+            # Stop is checked after clearing, so the wake up by stop() is not missed.
+            self._changed.clear()
+            if self._stopped.is_set():
+                return
+            if not self._pending:
+                self._changed.wait()
+                continue
+            try:
+                progress = self.poll() > 0
+            except Exception:
+                # Errors of a round, like the network, are retried in the next round.
+                progress = False
+            self._changed.wait(self.interval.next(progress=progress))
+
+    def stop(self) -> None:
+        """
+        Stop the background thread. The pending media are kept.
+        """
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stopped.set()
+            self._changed.set()
+            thread.join()
+
+    def __enter__(self) -> "MediaPoller":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+class AsyncMediaPoller(_BasePoller):
+    """
+    Poller for media uploads, for asyncio. Rounds run in the task calling wait(), or in a background task after start().
+    """
+
+    def __init__(self, media_endpoint: Any, **kwargs):
+        """
+        :param media_endpoint: Async media endpoint to poll with, like async_api.media.
+        :param kwargs: Options for polling, see _BasePoller.
+        """
+        super().__init__(media_endpoint, **kwargs)
+        self._lock: Optional[asyncio.Lock] = None
+        self._changed: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def _round_lock(self) -> asyncio.Lock:
+        """
+        Lock for the rounds. Created on first use to bind the running event loop.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    @property
+    def _changed_event(self) -> asyncio.Event:
+        """
+        Event set when media are added. Created on first use to bind the running event loop.
+        """
+        if self._changed is None:
+            self._changed = asyncio.Event()
+        return self._changed
+
+    def add(
+        self, media_id: str, callback: Optional[Callable[[Any], None]] = None
+    ) -> asyncio.Future:
+        """
+        Track a media upload.
+
+        :param media_id: Media identifier.
+        :param callback: Function called with the MediaUpload once it is processed.
+        :return: Future for the MediaUpload, with status "succeeded" or "failed".
+        """
+        future = self._track(
+            media_id, callback, asyncio.get_running_loop().create_future
+        )
+        self._changed_event.set()
+        return future
+
+    async def _throttle(self) -> None:
+        delay = self.limiter.acquire(_RATE_LIMIT_KEY)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def poll(self) -> int:
+        """
+        Run a round: scan the pages of media.list, then get the media not found one by one.
+
+        :return: Number of media resolved in this round.
+        """
+        async with self._round_lock:
+            if not self._pending:
+                return 0
+            seen: Set[str] = set()
+            resolved, bookmark = 0, None
+            for _ in range(self.max_pages):
+                await self._throttle()
+                page = await self.media.list(
+                    page_size=self.page_size, bookmark=bookmark, use_cache=False
+                )
+                resolved += self._scan(page.items, seen)
+                bookmark = page.bookmark
+                if not self._pending or not bookmark or self.pending <= seen:
+                    break
+            missing = self._missing(seen)
+            for media_id in missing:
+                await self._throttle()
+                try:
+                    media = await self.media.get(media_id=media_id, use_cache=False)
+                except PinterestException as e:
+                    self._fail(media_id, e)
+                    continue
+                resolved += self._resolve(media)
+            return resolved
+
+    async def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Run rounds until all the media are resolved. The interval grows while no media is resolved.
+
+        :param timeout: Maximum seconds to wait, None to wait until all resolved.
+        :return: Whether all the media are resolved.
+        """
+        if self._task is not None:
+            futures = list(self._pending.values())
+            if futures:
+                await asyncio.wait(futures, timeout=timeout)
+            return not self._pending
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._pending:
+            resolved = await self.poll()
+            if not self._pending:
+                break
+            delay = self.interval.next(progress=resolved > 0)
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                delay = min(delay, remaining)
+            await asyncio.sleep(delay)
+        return not self._pending
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self) -> "AsyncMediaPoller":
+        """
+        Run rounds in a background task, futures are resolved while the caller does other work.
+
+        :return: The poller.
+        """
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+        return self
+
+    async def _run(self) -> None:
+        changed = self._changed_event
+        while True:
+            # Cleared before the round, so the media added during the round wake up the wait.
+            changed.clear()
+            if not self._pending:
+                await changed.wait()
+                continue
+            try:
+                progress = await self.poll() > 0
+            except Exception:
+                # Errors of a round, like the network, are retried in the next round.
+                progress = False
+            try:
+                await asyncio.wait_for(
+                    changed.wait(), self.interval.next(progress=progress)
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    async def stop(self) -> None:
+        """
+        Stop the background task. The pending media are kept.
+        """
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def __aenter__(self) -> "AsyncMediaPoller":
+        return self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
@@ -0,0 +1,175 @@
+"""
+    Client side rate limiters.
+
+    Refer: https://developers.pinterest.com/docs/reference/ratelimits/
+"""
+
+import threading
+import time
+from typing import Dict, Hashable, Optional
+
+from httpx import Headers, Response
+
+
+def parse_rate_limit_header(value: Optional[str]) -> Optional[float]:
+    """
+    Get the number from a rate limit header, like "1000" or "1000, 1000;w=60".
+
+    :param value: Header value.
+    :return: The number or None if header is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return float(value.split(",")[0].split(";")[0].strip())
+    except ValueError:
+        return None
+
+
+def endpoint_category(method: str, path: str) -> str:
+    """
+    Get the rate limit category for the request, like "org_read", "ads_analytics", "catalogs_write".
+
+    :param method: Http method.
+    :param path: Path for the api, like "boards/xxx/pins"
+    :return: Category name.
+    """
+    resource = path.split("/", 1)[0]
+    if resource == "ad_accounts":
+        prefix = "ads"
+    elif resource == "catalogs":
+        prefix = "catalogs"
+    else:
+        prefix = "org"
+
+    if "analytics" in path.split("/"):
+        return f"{prefix}_analytics"
+    if method.upper() in ("GET", "HEAD", "OPTIONS"):
+        return f"{prefix}_read"
+    return f"{prefix}_write"
+
+
+class RateLimiter:
+    """Base class for rate limiters. Subclass this to implement your own limiter."""
+
+    def acquire(self, key: Hashable) -> float:
+        """
+        Take a permit for one request.
+
+        :param key: Rate limit key for the request, (access token, category).
+        :return: Seconds the caller should wait before sending the request.
+        """
+        raise NotImplementedError
+
+    def update(self, key: Hashable, response: Response) -> None:
+        """
+        Adapt the limiter by the response of a request.
+
+        :param key: Rate limit key for the request, (access token, category).
+        :param response: Response for the request.
+        """
+
+
+class _Bucket:
+    __slots__ = ("rate", "capacity", "tokens", "updated", "blocked_until")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+
+class TokenBucketRateLimiter(RateLimiter):
+    """
+    Token bucket per (access token, category).
+
+    Each call takes a token even if the bucket is empty, the caller is told how long to wait
+    for it. So concurrent threads and tasks are queued in a fair order without holding a lock while waiting.
+
+    The bucket is adapted by the X-RateLimit-* headers of responses: the tokens never exceed the
+    remaining budget of the server, the refill rate is slowed down to spread the remaining budget
+    until the reset, and a 429 response blocks the bucket for Retry-After seconds.
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        capacity: Optional[float] = None,
+        category_rates: Optional[Dict[str, float]] = None,
+    ):
+        """
+        :param rate: Requests per second for each bucket.
+        :param capacity: Max burst for each bucket. Default same as rate.
+        :param category_rates: Requests per second for special categories, like {"org_analytics": 1}.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.category_rates = category_rates or {}
+        self._buckets: Dict[Hashable, _Bucket] = {}
+        self._lock = threading.Lock()
+
+    def _configured_rate(self, key: Hashable) -> float:
+        category = key[-1] if isinstance(key, tuple) else key
+        return self.category_rates.get(category, self.rate)
+
+    def _get_bucket(self, key: Hashable, now: float) -> _Bucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            rate = self._configured_rate(key)
+            capacity = self.capacity if self.capacity is not None else max(rate, 1.0)
+            bucket = self._buckets[key] = _Bucket(rate=rate, capacity=capacity)
+        else:
+            # no refill while blocked, the tokens are refilled from the end of the block.
+            start = max(bucket.updated, min(bucket.blocked_until, now))
+            elapsed = max(0.0, now - start)
+            bucket.tokens = min(bucket.capacity, bucket.tokens + elapsed * bucket.rate)
+        bucket.updated = now
+        return bucket
+
+    @staticmethod
+    def _block(bucket: _Bucket, now: float, seconds: float) -> None:
+        if bucket.blocked_until <= now:
+            # the first caller goes at the end of the block, the next ones one by one at the rate.
+            bucket.tokens = min(bucket.tokens, 0.0) + 1.0
+        bucket.blocked_until = max(bucket.blocked_until, now + seconds)
+
+    def acquire(self, key: Hashable) -> float:
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._get_bucket(key, now)
+            bucket.tokens -= 1
+            # callers queued during a block are spread after it, instead of firing all at its end.
+            return max(0.0, bucket.blocked_until - now) + max(
+                0.0, -bucket.tokens / bucket.rate
+            )
+
+    def update(self, key: Hashable, response: Response) -> None:
+        headers: Headers = response.headers
+        remaining = parse_rate_limit_header(headers.get("X-RateLimit-Remaining"))
+        reset = parse_rate_limit_header(headers.get("X-RateLimit-Reset"))
+        retry_after = parse_rate_limit_header(headers.get("Retry-After"))
+
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._get_bucket(key, now)
+            blocked = bucket.blocked_until > now
+            if remaining is not None:
+                if not blocked:
+                    bucket.tokens = min(bucket.tokens, remaining)
+                if reset:
+                    # spread the remaining budget until the window reset.
+                    bucket.rate = min(
+                        self._configured_rate(key), max(remaining, 1.0) / reset
+                    )
+                    if remaining <= 0:
+                        self._block(bucket, now, reset)
+                else:
+                    bucket.rate = self._configured_rate(key)
+            if response.status_code == 429:
+                block = retry_after if retry_after is not None else reset
+                if block:
+                    self._block(bucket, now, block)
+                elif not blocked:
+                    bucket.tokens = min(bucket.tokens, 0.0)
@@ -0,0 +1,153 @@
+"""
+    Retry policy for requests.
+"""
+
+import random
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Callable, Collection, NamedTuple, Optional, Union
+
+from httpx import Response, TransportError
+
+
+class RetryEvent(NamedTuple):
+    """Information for a retry, passed to the on_retry callback."""
+
+    attempt: int  # The failed attempt, starting from 1.
+    method: str
+    url: str
+    delay: float  # Seconds to wait before the next attempt.
+    response: Optional[Response] = None
+    error: Optional[Exception] = None
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse the Retry-After header, which can be seconds or a http date.
+
+    :param value: Header value.
+    :return: Seconds to wait, or None if header is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    """
+    Retry failed requests with exponential backoff.
+
+    Only idempotent requests are retried by default, a POST or PATCH is retried only when the
+    request is marked idempotent.
+    """
+
+    DEFAULT_RETRY_STATUSES = (429, 500, 502, 503, 504)
+    DEFAULT_IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        jitter: bool = True,
+        retry_statuses: Collection[int] = DEFAULT_RETRY_STATUSES,
+        idempotent_methods: Collection[str] = DEFAULT_IDEMPOTENT_METHODS,
+        respect_retry_after: bool = True,
+        on_retry: Optional[Callable[[RetryEvent], None]] = None,
+    ):
+        """
+        :param max_attempts: Maximum attempts for a request, including the first one.
+        :param backoff_factor: Delay for the first retry, doubled for each next retry.
+        :param max_backoff: Maximum delay between two attempts.
+        :param jitter: Use full jitter, random delay between 0 and the backoff.
+        :param retry_statuses: Response status codes to retry.
+        :param idempotent_methods: Http methods which are safe to retry.
+        :param respect_retry_after: Wait for the Retry-After header if response has it.
+        :param on_retry: Callback for each retry, useful for instrumentation.
+        """
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses = set(retry_statuses)
+        self.idempotent_methods = {m.upper() for m in idempotent_methods}
+        self.respect_retry_after = respect_retry_after
+        self.on_retry = on_retry
+
+    def is_idempotent(self, method: str, idempotent: Optional[bool] = None) -> bool:
+        if idempotent is not None:
+            return idempotent
+        return method.upper() in self.idempotent_methods
+
+    def should_retry(
+        self,
+        attempt: int,
+        method: str,
+        result: Union[Response, Exception],
+        idempotent: Optional[bool] = None,
+    ) -> bool:
+        """
+        :param attempt: The finished attempt, starting from 1.
+        :param method: Http method.
+        :param result: Response or transport error of the attempt.
+        :param idempotent: Whether the request is safe to retry, default decided by method.
+        :return: Whether to retry the request.
+        """
+        if attempt >= self.max_attempts:
+            return False
+        if isinstance(result, Response):
+            if result.status_code not in self.retry_statuses:
+                return False
+            # Too many requests is never processed by server.
+            return result.status_code == 429 or self.is_idempotent(method, idempotent)
+        if not isinstance(result, TransportError):
+            return False
+        return self.is_idempotent(method, idempotent)
+
+    def get_delay(self, attempt: int, response: Optional[Response] = None) -> float:
+        """
+        :param attempt: The failed attempt, starting from 1.
+        :param response: Response for the failed attempt.
+        :return: Seconds to wait before next attempt.
+        """
+        if self.respect_retry_after and response is not None:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.max_backoff)
+        backoff = min(self.max_backoff, self.backoff_factor * (2 ** (attempt - 1)))
+        if self.jitter:
+            backoff = random.uniform(0, backoff)
+        return backoff
+
+    def retry_event(
+        self,
+        attempt: int,
+        method: str,
+        url: str,
+        result: Union[Response, Exception],
+    ) -> RetryEvent:
+        """
+        Build the event for a retry and notify the on_retry callback.
+        """
+        response = result if isinstance(result, Response) else None
+        event = RetryEvent(
+            attempt=attempt,
+            method=method,
+            url=url,
+            delay=self.get_delay(attempt=attempt, response=response),
+            response=response,
+            error=None if response is not None else result,
+        )
+        if self.on_retry is not None:
+            self.on_retry(event)
+        return event
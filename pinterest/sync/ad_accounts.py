@@ -2,7 +2,8 @@
     Ad accounts endpoints implementation.
 """
 
-from typing import Dict, List, Optional, Union
+import functools
+from typing import Dict, Iterator, List, Optional, Union
 
 from pinterest.base_endpoint import Endpoint
 from pinterest.models import (
@@ -10,8 +11,19 @@ from pinterest.models import (
     CampaignsResponse,
     AdGroupsResponse,
     AdsResponse,
+    Ad,
+    AdAccount,
+    AdGroup,
+    Campaign,
 )
+from pinterest.utils.analytics import merge_rows
 from pinterest.utils.params import enf_comma_separated
+from pinterest.watermark import (
+    DEFAULT_SETTLE_DAYS,
+    WatermarkStore,
+    settled_statuses,
+    watermark_key,
+)
 
 
 class AdAccountsEndpoint(Endpoint):
@@ -39,7 +51,31 @@ class AdAccountsEndpoint(Endpoint):
 
         resp = self._get(url="ad_accounts", params=params)
         data = self._parse_response(response=resp)
-        return data if return_json else AdAccountsResponse.new_from_json_dict(data=data)
+        return (
+            data if return_json else self._to_model(model=AdAccountsResponse, data=data)
+        )
+
+    def iter_list(
+        self,
+        page_size: int = 25,
+        include_shared_accounts: Optional[bool] = None,
+        return_json: bool = False,
+    ) -> Iterator[Union[AdAccount, dict]]:
+        """
+        Iterate over all the ad accounts, following the bookmark cursor page by page.
+
+        :param page_size: Maximum number of items to include in a single page of the response. [1..100]
+        :param include_shared_accounts: Include shared ad accounts.
+        :param return_json: Type for yielded data. If you set True JSON data will be yielded.
+        :return: Ad accounts generator.
+        """
+        return self._iter_items(
+            self.list,
+            model=AdAccount,
+            return_json=return_json,
+            page_size=page_size,
+            include_shared_accounts=include_shared_accounts,
+        )
 
     def get_analytics(
         self,
@@ -130,7 +166,40 @@ class AdAccountsEndpoint(Endpoint):
 
         resp = self._get(url=f"ad_accounts/{ad_account_id}/campaigns", params=params)
         data = self._parse_response(response=resp)
-        return data if return_json else CampaignsResponse.new_from_json_dict(data=data)
+        return (
+            data if return_json else self._to_model(model=CampaignsResponse, data=data)
+        )
+
+    def iter_campaigns(
+        self,
+        ad_account_id: str,
+        campaign_ids: Optional[Union[str, list, set]] = None,
+        entity_statuses: Optional[Union[str, list, set]] = None,
+        order: Optional[str] = None,
+        page_size: int = 25,
+        return_json: bool = False,
+    ) -> Iterator[Union[Campaign, dict]]:
+        """
+        Iterate over all the campaigns, following the bookmark cursor page by page.
+
+        :param ad_account_id: Unique identifier of an ad account.
+        :param campaign_ids: List of Campaign Ids to use to filter the results.
+        :param entity_statuses: Entity status.
+        :param order: The order in which to sort the items returned: “ASCENDING” or “DESCENDING” by ID.
+        :param page_size: Maximum number of items to include in a single page of the response. [1..100]
+        :param return_json: Type for yielded data. If you set True JSON data will be yielded.
+        :return: Campaigns generator.
+        """
+        return self._iter_items(
+            self.list_campaigns,
+            model=Campaign,
+            return_json=return_json,
+            ad_account_id=ad_account_id,
+            campaign_ids=campaign_ids,
+            entity_statuses=entity_statuses,
+            order=order,
+            page_size=page_size,
+        )
 
     def get_campaign_analytics(
         self,
@@ -144,6 +213,9 @@ class AdAccountsEndpoint(Endpoint):
         engagement_window_days: Optional[int] = None,
         view_window_days: Optional[int] = None,
         conversion_report_time: Optional[str] = None,
+        window_days: Optional[int] = None,
+        ids_per_request: Optional[int] = None,
+        concurrency: int = 4,
     ) -> List[Dict]:
         """
         Get analytics for the specified campaigns in the specified ad_account_id, filtered by the specified options.
@@ -161,6 +233,11 @@ class AdAccountsEndpoint(Endpoint):
         :param engagement_window_days: Number of days to use as the conversion attribution window for an engagement action.
         :param view_window_days: Number of days to use as the conversion attribution window for a view action.
         :param conversion_report_time: The date by which the conversion metrics returned from this endpoint will be reported.
+        :param window_days: Maximum days for a request, like MAX_AD_ANALYTICS_DAYS. Longer date range is split
+            into windows, which are requested concurrently and merged into one result. Default None to not split.
+        :param ids_per_request: Maximum ids for a request, like MAX_ANALYTICS_IDS. More campaign_ids are split into groups,
+            which are requested concurrently and merged into one result. Default None to not split.
+        :param concurrency: Maximum number of requests at the same time.
         :return: Ad Account Campaigns Analytics.
         """
         data = {
@@ -181,12 +258,70 @@ class AdAccountsEndpoint(Endpoint):
         if conversion_report_time:
             data["conversion_report_time"] = conversion_report_time
 
-        resp = self._get(
+        return self._get_parts(
+            url=f"ad_accounts/{ad_account_id}/campaigns/analytics",
+            json=data,
+            merge=functools.partial(merge_rows, granularity=granularity),
+            window_days=window_days,
+            ids_key="campaign_ids",
+            ids_size=ids_per_request,
+            concurrency=concurrency,
+        )
+
+    def stream_campaign_analytics(
+        self,
+        ad_account_id: str,
+        campaign_ids: Union[str, list, set],
+        start_date: str,
+        end_date: str,
+        columns: Union[str, list, set],
+        granularity: str,
+        click_window_days: Optional[int] = None,
+        engagement_window_days: Optional[int] = None,
+        view_window_days: Optional[int] = None,
+        conversion_report_time: Optional[str] = None,
+    ) -> Iterator[Dict]:
+        """
+        Stream analytics for the specified campaigns in the specified ad_account_id, filtered by the specified options.
+        The rows are yielded while the response is being read, useful for large reports like HOUR granularity.
+
+        :param ad_account_id: Unique identifier of an ad account.
+        :param campaign_ids: List of Campaign Ids to use to filter the results.
+        :param start_date: Metric report start date (UTC). Format: YYYY-MM-DD
+        :param end_date: Metric report end date (UTC). Format: YYYY-MM-DD
+        :param columns: Columns to retrieve. NOTE: Any metrics defined as MICRO_DOLLARS returns a value
+            based on the advertiser profile's currency field.
+            For USD,($1/1,000,000, or $0.000001 - one one-ten-thousandth of a cent). it's microdollars.
+            Otherwise, it's in microunits of the advertiser's currency.
+        :param granularity: Granularity. Enum: "TOTAL","DAY","HOUR","WEEK","MONTH"
+        :param click_window_days: Number of days to use as the conversion attribution window for a pin click action.
+        :param engagement_window_days: Number of days to use as the conversion attribution window for an engagement action.
+        :param view_window_days: Number of days to use as the conversion attribution window for a view action.
+        :param conversion_report_time: The date by which the conversion metrics returned from this endpoint will be reported.
+        :return: Ad Account Campaigns Analytics rows generator.
+        """
+        data = {
+            "campaign_ids": enf_comma_separated(
+                field="campaign_ids", value=campaign_ids
+            ),
+            "start_date": start_date,
+            "end_date": end_date,
+            "columns": enf_comma_separated(field="columns", value=columns),
+            "granularity": granularity,
+        }
+        if click_window_days:
+            data["click_window_days"] = click_window_days
+        if engagement_window_days:
+            data["engagement_window_days"] = engagement_window_days
+        if view_window_days:
+            data["view_window_days"] = view_window_days
+        if conversion_report_time:
+            data["conversion_report_time"] = conversion_report_time
+
+        return self._stream(
             url=f"ad_accounts/{ad_account_id}/campaigns/analytics",
             json=data,
         )
-        data = self._parse_response(response=resp)
-        return data
 
     def list_ad_groups(
         self,
@@ -240,7 +375,47 @@ class AdAccountsEndpoint(Endpoint):
             params=params,
         )
         data = self._parse_response(response=resp)
-        return data if return_json else AdGroupsResponse.new_from_json_dict(data=data)
+        return (
+            data if return_json else self._to_model(model=AdGroupsResponse, data=data)
+        )
+
+    def iter_ad_groups(
+        self,
+        ad_account_id: str,
+        campaign_ids: Optional[Union[str, list, set]] = None,
+        ad_group_ids: Optional[Union[str, list, set]] = None,
+        entity_statuses: Optional[Union[str, list, set]] = None,
+        order: Optional[str] = None,
+        translate_interests_to_names: Optional[str] = None,
+        page_size: int = 25,
+        return_json: bool = False,
+    ) -> Iterator[Union[AdGroup, dict]]:
+        """
+        Iterate over all the ad groups, following the bookmark cursor page by page.
+
+        :param ad_account_id: Unique identifier of an ad account.
+        :param campaign_ids: List of Campaign Ids to use to filter the results.
+        :param ad_group_ids: List of Ad group Ids to use to filter the results.
+        :param entity_statuses: Entity status
+        :param order: The order in which to sort the items returned: “ASCENDING” or “DESCENDING” by ID.
+            Note that higher-value IDs are associated with more-recently added items.
+        :param translate_interests_to_names: Return interests as text names (if value is true) rather than topic IDs.
+        :param page_size: Maximum number of items to include in a single page of the response. [1..100]
+        :param return_json: Type for yielded data. If you set True JSON data will be yielded.
+        :return: Ad groups generator.
+        """
+        return self._iter_items(
+            self.list_ad_groups,
+            model=AdGroup,
+            return_json=return_json,
+            ad_account_id=ad_account_id,
+            campaign_ids=campaign_ids,
+            ad_group_ids=ad_group_ids,
+            entity_statuses=entity_statuses,
+            order=order,
+            translate_interests_to_names=translate_interests_to_names,
+            page_size=page_size,
+        )
 
     def get_ad_group_analytics(
         self,
@@ -254,6 +429,9 @@ class AdAccountsEndpoint(Endpoint):
         engagement_window_days: Optional[int] = None,
         view_window_days: Optional[int] = None,
         conversion_report_time: Optional[str] = None,
+        window_days: Optional[int] = None,
+        ids_per_request: Optional[int] = None,
+        concurrency: int = 4,
     ) -> List[Dict]:
         """
         Get analytics for the specified ad groups in the specified ad_account_id, filtered by the specified options.
@@ -268,6 +446,11 @@ class AdAccountsEndpoint(Endpoint):
         :param engagement_window_days: Number of days to use as the conversion attribution window for an engagement action.
         :param view_window_days: Number of days to use as the conversion attribution window for a view action.
         :param conversion_report_time: The date by which the conversion metrics returned from this endpoint will be reported.
+        :param window_days: Maximum days for a request, like MAX_AD_ANALYTICS_DAYS. Longer date range is split
+            into windows, which are requested concurrently and merged into one result. Default None to not split.
+        :param ids_per_request: Maximum ids for a request, like MAX_ANALYTICS_IDS. More ad_group_ids are split into groups,
+            which are requested concurrently and merged into one result. Default None to not split.
+        :param concurrency: Maximum number of requests at the same time.
         :return: Ad group analytics.
         """
         data = {
@@ -288,12 +471,15 @@ class AdAccountsEndpoint(Endpoint):
         if conversion_report_time:
             data["conversion_report_time"] = conversion_report_time
 
-        resp = self._get(
+        return self._get_parts(
             url=f"ad_accounts/{ad_account_id}/ad_groups/analytics",
             json=data,
+            merge=functools.partial(merge_rows, granularity=granularity),
+            window_days=window_days,
+            ids_key="ad_group_ids",
+            ids_size=ids_per_request,
+            concurrency=concurrency,
         )
-        data = self._parse_response(response=resp)
-        return data
 
     def list_ads(
         self,
@@ -346,7 +532,44 @@ class AdAccountsEndpoint(Endpoint):
             params=params,
         )
         data = self._parse_response(response=resp)
-        return data if return_json else AdsResponse.new_from_json_dict(data=data)
+        return data if return_json else self._to_model(model=AdsResponse, data=data)
+
+    def iter_ads(
+        self,
+        ad_account_id: str,
+        campaign_ids: Optional[Union[str, list, set]] = None,
+        ad_group_ids: Optional[Union[str, list, set]] = None,
+        ad_ids: Optional[Union[str, list, set]] = None,
+        entity_statuses: Optional[Union[str, list, set]] = None,
+        order: Optional[str] = None,
+        page_size: int = 25,
+        return_json: bool = False,
+    ) -> Iterator[Union[Ad, dict]]:
+        """
+        Iterate over all the ads, following the bookmark cursor page by page.
+
+        :param ad_account_id: Unique identifier of an ad account.
+        :param campaign_ids: List of Campaign Ids to use to filter the results. [1..100]
+        :param ad_group_ids: List of Ad group Ids to use to filter the results. [1..100]
+        :param ad_ids: List of Ad Ids to use to filter the results. [1..100]
+        :param entity_statuses: Entity status.
+        :param order: The order in which to sort the items returned: “ASCENDING” or “DESCENDING” by ID.
+        :param page_size: Maximum number of items to include in a single page of the response. [1..100]
+        :param return_json: Type for yielded data. If you set True JSON data will be yielded.
+        :return: Ads generator.
+        """
+        return self._iter_items(
+            self.list_ads,
+            model=Ad,
+            return_json=return_json,
+            ad_account_id=ad_account_id,
+            campaign_ids=campaign_ids,
+            ad_group_ids=ad_group_ids,
+            ad_ids=ad_ids,
+            entity_statuses=entity_statuses,
+            order=order,
+            page_size=page_size,
+        )
 
     def get_ad_analytics(
         self,
@@ -360,12 +583,15 @@ class AdAccountsEndpoint(Endpoint):
         engagement_window_days: Optional[int] = None,
         view_window_days: Optional[int] = None,
         conversion_report_time: Optional[str] = None,
+        window_days: Optional[int] = None,
+        ids_per_request: Optional[int] = None,
+        concurrency: int = 4,
     ) -> List[Dict]:
         """
         Get analytics for the specified ads in the specified ad_account_id, filtered by the specified options.
 
         :param ad_account_id: Unique identifier of an ad account.
-        :param ad_ids: List of Ad Ids to use to filter the results. [1..100]
+        :param ad_ids: List of Ad Ids to use to filter the results.
         :param start_date: Metric report start date (UTC). Format: YYYY-MM-DD.
         :param end_date: Metric report end date (UTC). Format: YYYY-MM-DD.
         :param columns: Columns to retrieve.
@@ -375,6 +601,11 @@ class AdAccountsEndpoint(Endpoint):
         :param engagement_window_days: Number of days to use as the conversion attribution window for an engagement action.
         :param view_window_days: Number of days to use as the conversion attribution window for a view action.
         :param conversion_report_time: The date by which the conversion metrics returned from this endpoint will be reported.
+        :param window_days: Maximum days for a request, like MAX_AD_ANALYTICS_DAYS. Longer date range is split
+            into windows, which are requested concurrently and merged into one result. Default None to not split.
+        :param ids_per_request: Maximum ids for a request, like MAX_ANALYTICS_IDS. More ad_ids are split into groups,
+            which are requested concurrently and merged into one result. Default None to not split.
+        :param concurrency: Maximum number of requests at the same time.
         :return: Ad analytics
         """
         data = {
@@ -393,12 +624,75 @@ class AdAccountsEndpoint(Endpoint):
         if conversion_report_time:
             data["conversion_report_time"] = conversion_report_time
 
-        resp = self._get(
+        return self._get_parts(
             url=f"ad_accounts/{ad_account_id}/ads/analytics",
             json=data,
+            merge=functools.partial(merge_rows, granularity=granularity),
+            window_days=window_days,
+            ids_key="ad_ids",
+            ids_size=ids_per_request,
+            concurrency=concurrency,
         )
-        data = self._parse_response(response=resp)
-        return data
+
+    def sync_ad_analytics(
+        self,
+        store: WatermarkStore,
+        ad_account_id: str,
+        ad_ids: Union[str, list, set],
+        start_date: str,
+        end_date: str,
+        columns: Union[str, list, set],
+        settle_days: Optional[int] = None,
+        **kwargs,
+    ) -> List[Dict]:
+        """
+        Get daily analytics for the specified ads incrementally. Only the days from the first day which is new
+        or not final in the store are requested, then the days are recorded in the store.
+        Ad analytics have no data status, the days older than settle_days are taken as final.
+
+        :param store: Watermark store for the synced days.
+        :param ad_account_id: Unique identifier of an ad account.
+        :param ad_ids: List of Ad Ids to use to filter the results.
+        :param start_date: Metric report start date (UTC). Format: YYYY-MM-DD.
+        :param end_date: Metric report end date (UTC). Format: YYYY-MM-DD.
+        :param columns: Columns to retrieve.
+        :param settle_days: Days before the metrics of a day are final. Default is the longest
+            attribution window in kwargs, or 30 days.
+        :param kwargs: Other parameters for get_ad_analytics, like click_window_days.
+        :return: Rows for the requested days, granularity is DAY. Empty if all the days are final in the store.
+        """
+        if settle_days is None:
+            windows = [
+                kwargs.get(key) or 0
+                for key in (
+                    "click_window_days",
+                    "engagement_window_days",
+                    "view_window_days",
+                )
+            ]
+            settle_days = max(windows) or DEFAULT_SETTLE_DAYS
+        entity = watermark_key(
+            path=f"ad_accounts/{ad_account_id}/ads/analytics",
+            query=dict(
+                kwargs,
+                ad_ids=enf_comma_separated(field="ad_ids", value=ad_ids),
+                columns=enf_comma_separated(field="columns", value=columns),
+            ),
+        )
+        pending = store.pending_range(entity, start_date, end_date)
+        if pending is None:
+            return []
+        rows = self.get_ad_analytics(
+            ad_account_id=ad_account_id,
+            ad_ids=ad_ids,
+            start_date=pending[0],
+            end_date=pending[1],
+            columns=columns,
+            granularity="DAY",
+            **kwargs,
+        )
+        store.record(entity, settled_statuses(*pending, settle_days=settle_days))
+        return rows
 
     def get_product_group_analytics(
         self,
@@ -412,12 +706,15 @@ class AdAccountsEndpoint(Endpoint):
         engagement_window_days: Optional[int] = None,
         view_window_days: Optional[int] = None,
         conversion_report_time: Optional[str] = None,
+        window_days: Optional[int] = None,
+        ids_per_request: Optional[int] = None,
+        concurrency: int = 4,
     ) -> List[Dict]:
         """
         Get analytics for the specified product groups in the specified ad_account_id, filtered by the specified options.
 
         :param ad_account_id: Unique identifier of an ad account.
-        :param product_group_ids: List of Product group Ids to use to filter the results. [1..100]
+        :param product_group_ids: List of Product group Ids to use to filter the results.
         :param start_date: Metric report start date (UTC). Format: YYYY-MM-DD.
         :param end_date: Metric report end date (UTC). Format: YYYY-MM-DD.
         :param columns: Columns to retrieve.
@@ -427,6 +724,11 @@ class AdAccountsEndpoint(Endpoint):
         :param engagement_window_days: Number of days to use as the conversion attribution window for an engagement action.
         :param view_window_days: Number of days to use as the conversion attribution window for a view action.
         :param conversion_report_time: The date by which the conversion metrics returned from this endpoint will be reported.
+        :param window_days: Maximum days for a request, like MAX_AD_ANALYTICS_DAYS. Longer date range is split
+            into windows, which are requested concurrently and merged into one result. Default None to not split.
+        :param ids_per_request: Maximum ids for a request, like MAX_ANALYTICS_IDS. More product_group_ids are split into groups,
+            which are requested concurrently and merged into one result. Default None to not split.
+        :param concurrency: Maximum number of requests at the same time.
         :return: Product group analytics
         """
         data = {
@@ -447,9 +749,12 @@ class AdAccountsEndpoint(Endpoint):
         if conversion_report_time:
             data["conversion_report_time"] = conversion_report_time
 
-        resp = self._get(
+        return self._get_parts(
             url=f"ad_accounts/{ad_account_id}/product_groups/analytics",
             json=data,
+            merge=functools.partial(merge_rows, granularity=granularity),
+            window_days=window_days,
+            ids_key="product_group_ids",
+            ids_size=ids_per_request,
+            concurrency=concurrency,
         )
-        data = self._parse_response(response=resp)
-        return data
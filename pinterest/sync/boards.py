@@ -1,7 +1,7 @@
 """
     Boards endpoints implementation.
 """
-from typing import Optional, Union
+from typing import Iterable, Iterator, List, Optional, Union
 
 from pinterest.base_endpoint import Endpoint
 from pinterest.exceptions import PinterestException
@@ -11,6 +11,7 @@ from pinterest.models import (
     BoardSection,
     BoardSectionsResponse,
     PinsResponse,
+    Pin,
 )
 
 
@@ -40,7 +41,29 @@ class BoardsEndpoint(Endpoint):
 
         resp = self._get(url=f"boards", params=params)
         data = self._parse_response(response=resp)
-        return data if return_json else BoardsResponse.new_from_json_dict(data=data)
+        return data if return_json else self._to_model(model=BoardsResponse, data=data)
+
+    def iter_list(
+        self,
+        page_size: int = 25,
+        privacy: Optional[str] = None,
+        return_json: bool = False,
+    ) -> Iterator[Union[Board, dict]]:
+        """
+        Iterate over all the boards, following the bookmark cursor page by page.
+
+        :param page_size: Maximum number of items to include in a single page of the response. [1..100]
+        :param privacy: Privacy setting for a board.
+        :param return_json: Type for yielded data. If you set True JSON data will be yielded.
+        :return: Boards generator.
+        """
+        return self._iter_items(
+            self.list,
+            model=Board,
+            return_json=return_json,
+            page_size=page_size,
+            privacy=privacy,
+        )
 
     def get(self, board_id: str, return_json: bool = False) -> Union[Board, dict]:
         """
@@ -53,7 +76,25 @@ class BoardsEndpoint(Endpoint):
 
         resp = self._get(url=f"boards/{board_id}")
         data = self._parse_response(response=resp)
-        return data if return_json else Board.new_from_json_dict(data=data)
+        return data if return_json else self._to_model(model=Board, data=data)
+
+    def get_many(
+        self,
+        board_ids: Iterable[str],
+        concurrency: int = 10,
+        return_json: bool = False,
+    ) -> List[Union[Board, dict, Exception]]:
+        """
+        Get many boards concurrently in a thread pool.
+
+        :param board_ids: Unique identifiers of boards.
+        :param concurrency: Maximum number of requests running at the same time for this call.
+        :param return_json: Type for returned data. If you set True JSON data will be returned.
+        :return: Boards data in the same order of board_ids. A failed board is replaced by its exception.
+        """
+        return self._get_many(
+            self.get, board_ids, concurrency=concurrency, return_json=return_json
+        )
 
     def create(
         self,
@@ -78,7 +119,7 @@ class BoardsEndpoint(Endpoint):
             data["privacy"] = privacy
         resp = self._post(url="boards", json=data)
         data = self._parse_response(response=resp)
-        return data if return_json else Board.new_from_json_dict(data=data)
+        return data if return_json else self._to_model(model=Board, data=data)
 
     def update(
         self,
@@ -114,7 +155,7 @@ class BoardsEndpoint(Endpoint):
 
         resp = self._patch(url=f"boards/{board_id}", json=data)
         data = self._parse_response(response=resp)
-        return data if return_json else Board.new_from_json_dict(data=data)
+        return data if return_json else self._to_model(model=Board, data=data)
 
     def delete(self, board_id: str) -> bool:
         """
@@ -151,7 +192,29 @@ class BoardsEndpoint(Endpoint):
 
         resp = self._get(url=f"boards/{board_id}/pins", params=params)
         data = self._parse_response(response=resp)
-        return data if return_json else PinsResponse.new_from_json_dict(data=data)
+        return data if return_json else self._to_model(model=PinsResponse, data=data)
+
+    def iter_pins(
+        self,
+        board_id: str,
+        page_size: int = 25,
+        return_json: bool = False,
+    ) -> Iterator[Union[Pin, dict]]:
+        """
+        Iterate over all the pins, following the bookmark cursor page by page.
+
+        :param board_id: Unique identifier of a board.
+        :param page_size: Maximum number of items to include in a single page of the response. [1..100]
+        :param return_json: Type for yielded data. If you set True JSON data will be yielded.
+        :return: Pins generator.
+        """
+        return self._iter_items(
+            self.list_pins,
+            model=Pin,
+            return_json=return_json,
+            board_id=board_id,
+            page_size=page_size,
+        )
 
     def list_sections(
         self,
@@ -180,7 +243,31 @@ class BoardsEndpoint(Endpoint):
         )
         data = self._parse_response(response=resp)
         return (
-            data if return_json else BoardSectionsResponse.new_from_json_dict(data=data)
+            data
+            if return_json
+            else self._to_model(model=BoardSectionsResponse, data=data)
+        )
+
+    def iter_sections(
+        self,
+        board_id: str,
+        page_size: int = 25,
+        return_json: bool = False,
+    ) -> Iterator[Union[BoardSection, dict]]:
+        """
+        Iterate over all the board sections, following the bookmark cursor page by page.
+
+        :param board_id: Unique identifier of a board.
+        :param page_size: Maximum number of items to include in a single page of the response. [1~100].
+        :param return_json: Type for yielded data. If you set True JSON data will be yielded.
+        :return: Board sections generator.
+        """
+        return self._iter_items(
+            self.list_sections,
+            model=BoardSection,
+            return_json=return_json,
+            board_id=board_id,
+            page_size=page_size,
         )
 
     def create_section(
@@ -198,7 +285,7 @@ class BoardsEndpoint(Endpoint):
 
         resp = self._post(url=f"boards/{board_id}/sections", json={"name": name})
         data = self._parse_response(response=resp)
-        return data if return_json else BoardSection.new_from_json_dict(data=data)
+        return data if return_json else self._to_model(model=BoardSection, data=data)
 
     def update_section(
         self, board_id, section_id, name: str, return_json: bool = False
@@ -217,7 +304,7 @@ class BoardsEndpoint(Endpoint):
             url=f"boards/{board_id}/sections/{section_id}", json={"name": name}
         )
         data = self._parse_response(response=resp)
-        return data if return_json else BoardSection.new_from_json_dict(data=data)
+        return data if return_json else self._to_model(model=BoardSection, data=data)
 
     def delete_section(self, board_id, section_id: str) -> bool:
         """
@@ -261,4 +348,29 @@ class BoardsEndpoint(Endpoint):
             params=params,
         )
         data = self._parse_response(response=resp)
-        return data if return_json else PinsResponse.new_from_json_dict(data=data)
+        return data if return_json else self._to_model(model=PinsResponse, data=data)
+
+    def iter_section_pins(
+        self,
+        board_id,
+        section_id: str,
+        page_size: int = 25,
+        return_json: bool = False,
+    ) -> Iterator[Union[Pin, dict]]:
+        """
+        Iterate over all the pins, following the bookmark cursor page by page.
+
+        :param board_id: Unique identifier of a board.
+        :param section_id: Unique identifier of a board section.
+        :param page_size: Maximum number of items to include in a single page of the response. [1..100].
+        :param return_json: Type for yielded data. If you set True JSON data will be yielded.
+        :return: Pins generator.
+        """
+        return self._iter_items(
+            self.list_section_pins,
+            model=Pin,
+            return_json=return_json,
+            board_id=board_id,
+            section_id=section_id,
+            page_size=page_size,
+        )
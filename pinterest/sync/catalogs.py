@@ -2,7 +2,9 @@
     Catalogs endpoint implementation.
 """
 
-from typing import List, Optional, Union
+import functools
+import time
+from typing import Callable, Iterable, Iterator, List, Optional, Union
 
 from pinterest.base_endpoint import Endpoint
 from pinterest.exceptions import PinterestException
@@ -10,11 +12,21 @@ from pinterest.models import (
     CatalogFeed,
     CatalogFeedsResponse,
     CatalogFeedProcessResultsResponse,
+    CatalogItem,
     CatalogItemsResponse,
     CatalogItemProcessingRecordResponse,
     CatalogProductGroup,
     CatalogProductGroupsResponse,
+    CatalogFeedProcessResult,
 )
+from pinterest.utils.batch import (
+    MAX_ITEMS_PER_BATCH,
+    ItemsUploadReport,
+    PollInterval,
+    chunked,
+    is_pending,
+)
+from pinterest.utils.concurrency import run_bounded
 
 
 class CatalogsEndpoint(Endpoint):
@@ -38,7 +50,28 @@ class CatalogsEndpoint(Endpoint):
         resp = self._get(url="catalogs/feeds", params=params)
         data = self._parse_response(response=resp)
         return (
-            data if return_json else CatalogFeedsResponse.new_from_json_dict(data=data)
+            data
+            if return_json
+            else self._to_model(model=CatalogFeedsResponse, data=data)
+        )
+
+    def iter_catalogs_feeds(
+        self,
+        page_size: int = 25,
+        return_json: bool = False,
+    ) -> Iterator[Union[CatalogFeed, dict]]:
+        """
+        Iterate over all the catalog feeds, following the bookmark cursor page by page.
+
+        :param page_size: Maximum number of items to include in a single page of the response. [1..100]
+        :param return_json: Type for yielded data. If you set True JSON data will be yielded.
+        :return: Catalog feeds generator.
+        """
+        return self._iter_items(
+            self.list_catalogs_feeds,
+            model=CatalogFeed,
+            return_json=return_json,
+            page_size=page_size,
         )
 
     def create_catalogs_feed(
@@ -89,7 +122,7 @@ class CatalogsEndpoint(Endpoint):
             data["default_currency"] = default_currency
         resp = self._post(url="catalogs/feeds", json=data)
         data = self._parse_response(response=resp)
-        return data if return_json else CatalogFeed.new_from_json_dict(data=data)
+        return data if return_json else self._to_model(model=CatalogFeed, data=data)
 
     def get_catalogs_feed(
         self, feed_id: str, return_json: bool = False
@@ -103,7 +136,7 @@ class CatalogsEndpoint(Endpoint):
         """
         resp = self._get(url=f"catalogs/feeds/{feed_id}")
         data = self._parse_response(response=resp)
-        return data if return_json else CatalogFeed.new_from_json_dict(data=data)
+        return data if return_json else self._to_model(model=CatalogFeed, data=data)
 
     def update_catalogs_feed(
         self,
@@ -158,7 +191,7 @@ class CatalogsEndpoint(Endpoint):
             )
         resp = self._patch(url=f"catalogs/feeds/{feed_id}", json=data)
         data = self._parse_response(response=resp)
-        return data if return_json else CatalogFeed.new_from_json_dict(data=data)
+        return data if return_json else self._to_model(model=CatalogFeed, data=data)
 
     def delete_catalogs_feed(self, feed_id: str) -> bool:
         """
@@ -198,7 +231,29 @@ class CatalogsEndpoint(Endpoint):
         return (
             data
             if return_json
-            else CatalogFeedProcessResultsResponse.new_from_json_dict(data=data)
+            else self._to_model(model=CatalogFeedProcessResultsResponse, data=data)
+        )
+
+    def iter_catalogs_feed_processing_results(
+        self,
+        feed_id: str,
+        page_size: int = 25,
+        return_json: bool = False,
+    ) -> Iterator[Union[CatalogFeedProcessResult, dict]]:
+        """
+        Iterate over all the feed processing results, following the bookmark cursor page by page.
+
+        :param feed_id: Unique identifier of a feed.
+        :param page_size: Maximum number of items to include in a single page of the response. [1..100]
+        :param return_json: Type for yielded data. If you set True JSON data will be yielded.
+        :return: Feed processing results generator.
+        """
+        return self._iter_items(
+            self.list_catalogs_feed_processing_results,
+            model=CatalogFeedProcessResult,
+            return_json=return_json,
+            feed_id=feed_id,
+            page_size=page_size,
         )
 
     def get_catalogs_items(
@@ -226,26 +281,61 @@ class CatalogsEndpoint(Endpoint):
             },
         )
         data = self._parse_response(response=resp)
-        return data if return_json else CatalogItemsResponse.new_from_json_dict(data)
+        return (
+            data
+            if return_json
+            else self._to_model(model=CatalogItemsResponse, data=data)
+        )
+
+    def stream_catalogs_items(
+        self,
+        country: str,
+        item_ids: List[str],
+        language: str,
+        return_json: bool = False,
+    ) -> Iterator[Union[CatalogItem, dict]]:
+        """
+        Stream the items of the catalog created by the "operating user_account".
+        The items are yielded while the response is being read, useful for many item ids.
+
+        :param country: Country for the Catalogs Items.
+        :param item_ids: Catalogs Item ids.
+        :param language: Language for the Catalogs Items.
+        :param return_json: Type for yielded data. If you set True JSON data will be yielded.
+        :return: Catalogs items generator.
+        """
+        return self._stream(
+            url="catalogs/items",
+            path=["items"],
+            model=CatalogItem,
+            return_json=return_json,
+            params={
+                "country": country,
+                "item_ids": item_ids,
+                "language": language,
+            },
+        )
 
     def get_catalogs_items_batch(
         self,
         batch_id: str,
         return_json: bool = False,
+        use_cache: bool = True,
     ) -> Union[CatalogItemProcessingRecordResponse, dict]:
         """
         Get a single catalogs items batch created by the "operating user_account".
 
         :param batch_id: ID of a catalogs items batch to fetch.
         :param return_json: Type for returned data. If you set True JSON data will be returned.
+        :param use_cache: Use the cached response if the api has a cache. Polls for the status pass False.
         :return: Item processing records data.
         """
-        resp = self._get(url=f"catalogs/items/batch/{batch_id}")
+        resp = self._get(url=f"catalogs/items/batch/{batch_id}", use_cache=use_cache)
         data = self._parse_response(response=resp)
         return (
             data
             if return_json
-            else CatalogItemProcessingRecordResponse.new_from_json_dict(data)
+            else self._to_model(model=CatalogItemProcessingRecordResponse, data=data)
         )
 
     def perform_items_batch(
@@ -277,9 +367,107 @@ class CatalogsEndpoint(Endpoint):
         return (
             data
             if return_json
-            else CatalogItemProcessingRecordResponse.new_from_json_dict(data)
+            else self._to_model(model=CatalogItemProcessingRecordResponse, data=data)
         )
 
+    def wait_items_batch(
+        self,
+        batch_id: str,
+        poll_interval: float = 1.0,
+        max_poll_interval: float = 30.0,
+        timeout: Optional[float] = None,
+    ) -> CatalogItemProcessingRecordResponse:
+        """
+        Poll a catalogs items batch until it is processed. The interval grows while no items
+        are processed between polls, and shrinks back when items are processed.
+
+        :param batch_id: ID of a catalogs items batch to wait.
+        :param poll_interval: Seconds to wait before the first poll, also the minimum interval.
+        :param max_poll_interval: Maximum seconds between polls.
+        :param timeout: Maximum seconds to wait, None to wait until the batch is processed.
+        :return: Item processing records data. Status is still PROCESSING if timed out.
+        """
+        interval = PollInterval(initial=poll_interval, maximum=max_poll_interval)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        delay, processed = poll_interval, 0
+        while True:
+            if deadline is not None:
+                delay = max(0.0, min(delay, deadline - time.monotonic()))
+            time.sleep(delay)
+            batch = self.get_catalogs_items_batch(batch_id=batch_id, use_cache=False)
+            if not is_pending(batch.status) or (
+                deadline is not None and time.monotonic() >= deadline
+            ):
+                return batch
+            count = sum(1 for r in batch.items or [] if not is_pending(r.status))
+            delay = interval.next(progress=count > processed)
+            processed = count
+
+    def upload_items(
+        self,
+        items: Iterable[dict],
+        operation: str = "UPSERT",
+        country: Optional[str] = None,
+        language: Optional[str] = None,
+        batch_size: int = MAX_ITEMS_PER_BATCH,
+        concurrency: int = 4,
+        poll_interval: float = 1.0,
+        max_poll_interval: float = 30.0,
+        timeout: Optional[float] = None,
+        callback: Optional[
+            Callable[[CatalogItemProcessingRecordResponse], None]
+        ] = None,
+    ) -> ItemsUploadReport:
+        """
+        Upload catalog items in batches, and wait for the batches to be processed.
+
+        Items are split into batches of batch_size. At most concurrency batches are submitted and polled
+        at the same time, and items are read from the iterable only when a batch is done, so the memory
+        is bounded for millions of items.
+
+        :param items: Catalogs items, can be a generator. Like {"item_id": "xxx", "attributes": {}}
+        :param operation: The operation performed by the batch, Enum: "UPDATE" "CREATE" "UPSERT" "DELETE"
+        :param country: Country ID from ISO 3166-1 alpha-2.
+        :param language: Language code, which is among the offical ISO 639-1 language list.
+        :param batch_size: Maximum items for a batch. [1..1000]
+        :param concurrency: Maximum number of batches in progress at the same time.
+        :param poll_interval: Seconds to wait before the first poll of a batch, also the minimum interval.
+        :param max_poll_interval: Maximum seconds between polls.
+        :param timeout: Maximum seconds to wait for a batch, None to wait until the batch is processed.
+        :param callback: Function called with each processed batch, like for progress.
+        :return: Report with the item processing records with validation errors.
+        """
+        report = ItemsUploadReport()
+
+        def upload(chunk: List[dict]):
+            item_ids = [item.get("item_id") for item in chunk]
+            try:
+                batch = self.perform_items_batch(
+                    operation=operation, items=chunk, country=country, language=language
+                )
+                if is_pending(batch.status):
+                    batch = self.wait_items_batch(
+                        batch_id=batch.batch_id,
+                        poll_interval=poll_interval,
+                        max_poll_interval=max_poll_interval,
+                        timeout=timeout,
+                    )
+            except Exception as e:
+                return item_ids, e
+            return item_ids, batch
+
+        for item_ids, batch in run_bounded(
+            (functools.partial(upload, chunk) for chunk in chunked(items, batch_size)),
+            max_workers=concurrency,
+        ):
+            if isinstance(batch, Exception):
+                report.add_failure(item_ids, batch)
+                continue
+            report.add_batch(batch, item_count=len(item_ids))
+            if callback is not None:
+                callback(batch)
+        return report
+
     def get_product_group(
         self, product_group_id: str, return_json: bool = False
     ) -> Union[CatalogProductGroup, dict]:
@@ -293,7 +481,33 @@ class CatalogsEndpoint(Endpoint):
 
         resp = self._get(url=f"catalogs/product_groups/{product_group_id}")
         data = self._parse_response(response=resp)
-        return data if return_json else CatalogProductGroup.new_from_json_dict(data)
+        return (
+            data
+            if return_json
+            else self._to_model(model=CatalogProductGroup, data=data)
+        )
+
+    def get_many_product_groups(
+        self,
+        product_group_ids: Iterable[str],
+        concurrency: int = 10,
+        return_json: bool = False,
+    ) -> List[Union[CatalogProductGroup, dict, Exception]]:
+        """
+        Get many product groups concurrently in a thread pool.
+
+        :param product_group_ids: Unique identifiers of product groups.
+        :param concurrency: Maximum number of requests running at the same time for this call.
+        :param return_json: Type for returned data. If you set True JSON data will be returned.
+        :return: Product groups data in the same order of product_group_ids.
+            A failed product group is replaced by its exception.
+        """
+        return self._get_many(
+            self.get_product_group,
+            product_group_ids,
+            concurrency=concurrency,
+            return_json=return_json,
+        )
 
     def create_product_group(
         self,
@@ -319,7 +533,11 @@ class CatalogsEndpoint(Endpoint):
             json=data,
         )
         data = self._parse_response(response=resp)
-        return data if return_json else CatalogProductGroup.new_from_json_dict(data)
+        return (
+            data
+            if return_json
+            else self._to_model(model=CatalogProductGroup, data=data)
+        )
 
     def update_product_group(
         self,
@@ -352,7 +570,11 @@ class CatalogsEndpoint(Endpoint):
             data["description"] = description
         resp = self._patch(url=f"catalogs/product_groups/{product_group_id}", json=data)
         data = self._parse_response(resp)
-        return data if return_json else CatalogProductGroup.new_from_json_dict(data)
+        return (
+            data
+            if return_json
+            else self._to_model(model=CatalogProductGroup, data=data)
+        )
 
     def delete_product_group(
         self,
@@ -395,5 +617,27 @@ class CatalogsEndpoint(Endpoint):
         return (
             data
             if return_json
-            else CatalogProductGroupsResponse.new_from_json_dict(data)
+            else self._to_model(model=CatalogProductGroupsResponse, data=data)
+        )
+
+    def iter_product_groups(
+        self,
+        feed_id: str,
+        page_size: int = 25,
+        return_json: bool = False,
+    ) -> Iterator[Union[CatalogProductGroup, dict]]:
+        """
+        Iterate over all the product groups, following the bookmark cursor page by page.
+
+        :param feed_id: Unique identifier of a feed.
+        :param page_size: Maximum number of items to include in a single page of the response. [1...100]
+        :param return_json: Type for yielded data. If you set True JSON data will be yielded.
+        :return: Product groups generator.
+        """
+        return self._iter_items(
+            self.get_product_group_list,
+            model=CatalogProductGroup,
+            return_json=return_json,
+            feed_id=feed_id,
+            page_size=page_size,
         )
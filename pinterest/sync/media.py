@@ -2,7 +2,10 @@
     Media endpoints implementation.
 """
 
-from typing import Optional, Union
+import time
+from typing import Callable, Iterator, Optional, Union
+
+from httpx import TransportError
 
 from pinterest.base_endpoint import Endpoint
 from pinterest.models import (
@@ -10,6 +13,17 @@ from pinterest.models import (
     MediaUploadsResponse,
     RegisterMediaUploadResponse,
 )
+from pinterest.retry import RetryPolicy
+from pinterest.utils.batch import PollInterval
+from pinterest.utils.media import (
+    DEFAULT_CHUNK_SIZE,
+    MediaFile,
+    UploadBody,
+    check_upload_response,
+    is_media_pending,
+    media_filename,
+    open_media,
+)
 
 
 class MediaEndpoint(Endpoint):
@@ -18,12 +32,14 @@ class MediaEndpoint(Endpoint):
         page_size: int = 25,
         bookmark: Optional[str] = None,
         return_json: bool = False,
+        use_cache: bool = True,
     ) -> Union[MediaUploadsResponse, dict]:
         """
 
         :param page_size: Maximum number of items to include in a single page of the response. [1..100]
         :param bookmark: Cursor used to fetch the next page of items.
         :param return_json: Type for returned data. If you set True JSON data will be returned.
+        :param use_cache: Use the cached response if the api has a cache. Polls for the status pass False.
         :return: Media Uploads data.
         """
         params = {"page_size": page_size}
@@ -33,10 +49,32 @@ class MediaEndpoint(Endpoint):
         resp = self._get(
             url="media",
             params=params,
+            use_cache=use_cache,
         )
         data = self._parse_response(response=resp)
         return (
-            data if return_json else MediaUploadsResponse.new_from_json_dict(data=data)
+            data
+            if return_json
+            else self._to_model(model=MediaUploadsResponse, data=data)
+        )
+
+    def iter_list(
+        self,
+        page_size: int = 25,
+        return_json: bool = False,
+    ) -> Iterator[Union[MediaUpload, dict]]:
+        """
+        Iterate over all the media uploads, following the bookmark cursor page by page.
+
+        :param page_size: Maximum number of items to include in a single page of the response. [1..100]
+        :param return_json: Type for yielded data. If you set True JSON data will be yielded.
+        :return: Media uploads generator.
+        """
+        return self._iter_items(
+            self.list,
+            model=MediaUpload,
+            return_json=return_json,
+            page_size=page_size,
         )
 
     def register(
@@ -57,21 +95,107 @@ class MediaEndpoint(Endpoint):
         return (
             data
             if return_json
-            else RegisterMediaUploadResponse.new_from_json_dict(data=data)
+            else self._to_model(model=RegisterMediaUploadResponse, data=data)
         )
 
-    def get(self, media_id: str, return_json: bool = False) -> Union[MediaUpload, dict]:
+    def get(
+        self, media_id: str, return_json: bool = False, use_cache: bool = True
+    ) -> Union[MediaUpload, dict]:
         """
         Get details for a registered media upload, including its current status.
 
         :param media_id: Media identifier.
         :param return_json: Type for returned data. If you set True JSON data will be returned.
+        :param use_cache: Use the cached response if the api has a cache. Polls for the status pass False.
         :return: Media Upload data.
         """
-        resp = self._post(url=f"media/{media_id}")
+        resp = self._get(url=f"media/{media_id}", use_cache=use_cache)
         data = self._parse_response(response=resp)
-        return (
-            data
-            if return_json
-            else RegisterMediaUploadResponse.new_from_json_dict(data=data)
-        )
+        return data if return_json else self._to_model(model=MediaUpload, data=data)
+
+    def upload(
+        self,
+        media: RegisterMediaUploadResponse,
+        file: MediaFile,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        progress: Optional[Callable[[int, int], None]] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+    ) -> None:
+        """
+        Upload the media file to the upload url of a registered media.
+
+        The file is streamed in fixed chunks, through a memory map for the files on disk, so the memory is
+        bounded by chunk_size whatever the file size. The upload url doesn't support to resume a partial upload,
+        so a retry sends the file again from the beginning.
+
+        :param media: Response for register, with upload_url and upload_parameters.
+        :param file: Path for the file, a binary file object, or the bytes of the file.
+        :param chunk_size: Bytes of the file for a chunk.
+        :param progress: Function called with the bytes sent and the total bytes of the file after each chunk.
+            The bytes sent restart from 0 for a retry.
+        :param retry_policy: Policy to retry the failed upload. Default is the policy of the api,
+            or 3 attempts if the api has none. Non-seekable file objects are not retried.
+        """
+        retry_policy = retry_policy or self._client.retry_policy or RetryPolicy()
+        attempt = 0
+        with open_media(file) as f:
+            while True:
+                attempt += 1
+                body = UploadBody(
+                    fields=media.upload_parameters or {},
+                    file=f,
+                    filename=media_filename(file),
+                    chunk_size=chunk_size,
+                    progress=progress,
+                )
+                try:
+                    resp = self._client.client.post(
+                        media.upload_url, content=body, headers=body.headers
+                    )
+                except TransportError as e:
+                    resp = e
+                if not retry_policy.should_retry(
+                    attempt=attempt,
+                    method="POST",
+                    result=resp,
+                    idempotent=body.rewindable,
+                ):
+                    break
+                event = retry_policy.retry_event(
+                    attempt=attempt, method="POST", url=media.upload_url, result=resp
+                )
+                time.sleep(event.delay)
+        if isinstance(resp, Exception):
+            raise resp
+        check_upload_response(resp)
+
+    def wait(
+        self,
+        media_id: str,
+        poll_interval: float = 1.0,
+        max_poll_interval: float = 30.0,
+        timeout: Optional[float] = None,
+    ) -> MediaUpload:
+        """
+        Poll a registered media until it is processed. The interval grows while the status not changes.
+
+        :param media_id: Media identifier.
+        :param poll_interval: Seconds to wait before the first poll, also the minimum interval.
+        :param max_poll_interval: Maximum seconds between polls.
+        :param timeout: Maximum seconds to wait, None to wait until the media is processed.
+        :return: Media Upload data, status is "succeeded" or "failed". Still pending if timed out.
+        """
+        interval = PollInterval(initial=poll_interval, maximum=max_poll_interval)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        delay, status = poll_interval, None
+        while True:
+            if deadline is not None:
+                delay = max(0.0, min(delay, deadline - time.monotonic()))
+            time.sleep(delay)
+            media = self.get(media_id=media_id, use_cache=False)
+            if not is_media_pending(media.status) or (
+                deadline is not None and time.monotonic() >= deadline
+            ):
+                return media
+            delay = interval.next(progress=media.status != status)
+            status = media.status
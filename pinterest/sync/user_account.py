@@ -1,11 +1,18 @@
 """
     User Account endpoints implementation.
 """
-from typing import Optional, Union
+from typing import Iterator, Optional, Union
 
 from pinterest.base_endpoint import Endpoint
-from pinterest.models import UserAccount, Analytics, TopPinsAnalytics
+from pinterest.models import UserAccount, Analytics, DailyMetric, TopPinsAnalytics
+from pinterest.utils.analytics import merge_analytics
 from pinterest.utils.params import enf_comma_separated
+from pinterest.watermark import (
+    DEFAULT_SETTLE_DAYS,
+    WatermarkStore,
+    analytics_statuses,
+    watermark_key,
+)
 
 
 class UserAccountEndpoint(Endpoint):
@@ -26,7 +33,7 @@ class UserAccountEndpoint(Endpoint):
             params=params,
         )
         data = self._parse_response(response=resp)
-        return data if return_json else UserAccount.new_from_json_dict(data=data)
+        return data if return_json else self._to_model(model=UserAccount, data=data)
 
     def get_analytics(
         self,
@@ -39,6 +46,8 @@ class UserAccountEndpoint(Endpoint):
         split_field: str = "NO_SPLIT",
         ad_account_id: Optional[str] = None,
         return_json: bool = False,
+        window_days: Optional[int] = None,
+        concurrency: int = 4,
     ) -> Union[Analytics, dict]:
         """
         Get analytics for the "operation user_account"
@@ -52,6 +61,9 @@ class UserAccountEndpoint(Endpoint):
         :param split_field: How to split the data into groups. Not including this param means data won't be split.
         :param ad_account_id: Unique identifier of an ad account.
         :param return_json: Type for returned data. If you set True JSON data will be returned.
+        :param window_days: Maximum days for a request, like MAX_ANALYTICS_DAYS. Longer date range is split
+            into windows, which are requested concurrently and merged into one result. Default None to not split.
+        :param concurrency: Maximum number of windows requested at the same time.
         :return: User Account Analytics data.
         """
 
@@ -69,12 +81,97 @@ class UserAccountEndpoint(Endpoint):
             )
         if ad_account_id:
             params["ad_account_id"] = ad_account_id
-        resp = self._get(
-            url=f"user_account/analytics",
+        data = self._get_parts(
+            url="user_account/analytics",
+            params=params,
+            merge=merge_analytics,
+            window_days=window_days,
+            concurrency=concurrency,
+        )
+        return data if return_json else self._to_model(model=Analytics, data=data)
+
+    def sync_analytics(
+        self,
+        store: WatermarkStore,
+        start_date: str,
+        end_date: str,
+        return_json: bool = False,
+        settle_days: int = DEFAULT_SETTLE_DAYS,
+        **kwargs,
+    ) -> Optional[Union[Analytics, dict]]:
+        """
+        Get analytics for the "operation user_account" incrementally. Only the days from the first day which is new
+        or not final in the store are requested, then the data status of the days is recorded in the store.
+
+        :param store: Watermark store for the synced days.
+        :param start_date: Metric report start date (UTC). Format: YYYY-MM-DD
+        :param end_date: Metric report end date (UTC). Format: YYYY-MM-DD
+        :param return_json: Type for returned data. If you set True JSON data will be returned.
+        :param settle_days: Days before a day missing from the daily metrics is taken as final.
+        :param kwargs: Other parameters for get_analytics, like metric_types.
+        :return: Analytics data for the requested days. None if all the days are final in the store.
+        """
+        entity = watermark_key(path="user_account/analytics", query=kwargs)
+        pending = store.pending_range(entity, start_date, end_date)
+        if pending is None:
+            return None
+        data = self.get_analytics(
+            start_date=pending[0], end_date=pending[1], return_json=True, **kwargs
+        )
+        store.record(
+            entity, analytics_statuses(data, *pending, settle_days=settle_days)
+        )
+        return data if return_json else self._to_model(model=Analytics, data=data)
+
+    def stream_daily_metrics(
+        self,
+        start_date: str,
+        end_date: str,
+        from_claimed_content: str = "BOTH",
+        pin_format: str = "ALL",
+        app_types: str = "ALL",
+        metric_types: Optional[Union[str, list, tuple]] = None,
+        split_field: str = "NO_SPLIT",
+        ad_account_id: Optional[str] = None,
+        return_json: bool = False,
+    ) -> Iterator[Union[DailyMetric, dict]]:
+        """
+        Stream the daily metrics of analytics for the "operation user_account".
+        The metrics are yielded while the response is being read.
+
+        :param start_date: Metric report start date (UTC). Format: YYYY-MM-DD
+        :param end_date: Metric report end date (UTC). Format: YYYY-MM-DD
+        :param from_claimed_content: Filter on Pins that match your claimed domain.
+        :param pin_format: Pin formats to get data for, default is all.
+        :param app_types: Apps or devices to get data for, default is all.
+        :param metric_types: Metric types to get data for, default is all.
+        :param split_field: How to split the data into groups. Not including this param means data won't be split.
+        :param ad_account_id: Unique identifier of an ad account.
+        :param return_json: Type for yielded data. If you set True JSON data will be yielded.
+        :return: Daily metrics generator.
+        """
+
+        params = {
+            "start_date": start_date,
+            "end_date": end_date,
+            "from_claimed_content": from_claimed_content,
+            "pin_format": pin_format,
+            "app_types": app_types,
+            "split_field": split_field,
+        }
+        if metric_types:
+            params["metric_types"] = enf_comma_separated(
+                field="metric_types", value=metric_types
+            )
+        if ad_account_id:
+            params["ad_account_id"] = ad_account_id
+        return self._stream(
+            url="user_account/analytics",
+            path=["all", "daily_metrics"],
+            model=DailyMetric,
+            return_json=return_json,
             params=params,
         )
-        data = self._parse_response(response=resp)
-        return data if return_json else Analytics.new_from_json_dict(data=data)
 
     def _get_top_analytics(
         self,
@@ -114,7 +211,9 @@ class UserAccountEndpoint(Endpoint):
             params=params,
         )
         data = self._parse_response(response=resp)
-        return data if return_json else TopPinsAnalytics.new_from_json_dict(data=data)
+        return (
+            data if return_json else self._to_model(model=TopPinsAnalytics, data=data)
+        )
 
     def get_top_pins_analytics(
         self,
@@ -0,0 +1,188 @@
+"""
+    Functions to split analytics queries and merge the results.
+"""
+
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+# Pinterest caps the days of a query, end_date can not be more than these days after start_date.
+MAX_ANALYTICS_DAYS = 90
+MAX_AD_ANALYTICS_DAYS = 186
+# Pinterest caps the ids of an ad analytics query, like campaign_ids.
+MAX_ANALYTICS_IDS = 100
+
+# Tokens in the names of metrics which are ratios, not counts. Like SAVE_RATE, CTR, CPC_IN_MICRO_DOLLAR.
+_RATIO_TOKENS = {
+    "RATE",
+    "AVG",
+    "CTR",
+    "ECTR",
+    "CPC",
+    "ECPC",
+    "CPM",
+    "ECPM",
+    "CPA",
+    "CPE",
+    "ECPE",
+    "CPV",
+    "ECPV",
+    "CPCV",
+    "ECPCV",
+    "ROAS",
+}
+_WEIGHT_KEYS = (
+    "IMPRESSION",
+    "TOTAL_IMPRESSION",
+    "PAID_IMPRESSION",
+    "IMPRESSION_1",
+    "IMPRESSION_2",
+)
+
+
+def split_date_range(
+    start_date: str, end_date: str, days: int
+) -> List[Tuple[str, str]]:
+    """
+    Split the date range into windows.
+
+    :param start_date: Start date, format: YYYY-MM-DD
+    :param end_date: End date, included. Format: YYYY-MM-DD
+    :param days: Maximum days for a window, the start date and end date are included.
+    :return: Windows with start date and end date.
+    """
+    try:
+        start, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+    except (TypeError, ValueError):
+        # Leave the invalid dates to the api.
+        return [(start_date, end_date)]
+    windows = []
+    while start <= end:
+        window_end = min(end, start + timedelta(days=days - 1))
+        windows.append((start.isoformat(), window_end.isoformat()))
+        start = window_end + timedelta(days=1)
+    return windows or [(start_date, end_date)]
+
+
+def split_ids(ids: str, size: int) -> List[str]:
+    """
+    Split the ids into groups.
+
+    :param ids: Comma-separated ids.
+    :param size: Maximum ids for a group.
+    :return: Comma-separated ids for each group.
+    """
+    values = ids.split(",")
+    return [",".join(values[i : i + size]) for i in range(0, len(values), size)]
+
+
+def is_ratio(name: str) -> bool:
+    """
+    :param name: Name for the metric.
+    :return: Whether the metric is a ratio, which can not be summed.
+    """
+    return any(token in _RATIO_TOKENS for token in name.split("_"))
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def merge_metrics(metrics: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge the metrics for parts of a period, like the summary metrics of windows.
+    Counts are summed. Rates like SAVE_RATE are recomputed from the counts if the counts and
+    IMPRESSION are present, other ratios are averaged weighted by impressions.
+
+    :param metrics: Metrics for the parts.
+    :return: Metrics for the period.
+    """
+    if len(metrics) == 1:
+        return dict(metrics[0])
+    weight_key = next(
+        (k for k in _WEIGHT_KEYS if any(k in m for m in metrics)),
+        None,
+    )
+    names = []
+    for m in metrics:
+        names.extend(k for k in m if k not in names)
+    merged: Dict[str, Any] = {}
+    for name in names:
+        values = [m[name] for m in metrics if _is_number(m.get(name))]
+        if not values:
+            merged[name] = next(m[name] for m in metrics if name in m)
+        elif not is_ratio(name):
+            merged[name] = sum(values)
+    for name in names:
+        if name in merged:
+            continue
+        base = name[: -len("_RATE")] if name.endswith("_RATE") else None
+        impressions = merged.get("IMPRESSION")
+        if base in merged and _is_number(merged[base]) and impressions is not None:
+            merged[name] = merged[base] / impressions if impressions else 0.0
+            continue
+        pairs = [
+            (m[name], (m.get(weight_key) or 0) if weight_key else 1)
+            for m in metrics
+            if _is_number(m.get(name))
+        ]
+        total_weight = sum(w for _, w in pairs)
+        if total_weight:
+            merged[name] = sum(v * w for v, w in pairs) / total_weight
+        else:
+            merged[name] = sum(v for v, _ in pairs) / len(pairs)
+    return merged
+
+
+def merge_analytics(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge the analytics of user account or pin for the windows of a date range.
+
+    :param results: Json data of analytics for each window, like {"all": {"daily_metrics": [], "summary_metrics": {}}}
+    :return: Json data of analytics for the date range.
+    """
+    if len(results) == 1:
+        return results[0]
+    merged: Dict[str, Any] = {}
+    for group in {k: None for result in results for k in result}:
+        parts = [r[group] for r in results if isinstance(r.get(group), dict)]
+        daily_metrics = []
+        for part in parts:
+            daily_metrics.extend(part.get("daily_metrics") or [])
+        daily_metrics.sort(key=lambda m: m.get("date") or "")
+        summaries = [p["summary_metrics"] for p in parts if p.get("summary_metrics")]
+        merged[group] = {
+            "daily_metrics": daily_metrics,
+            "summary_metrics": merge_metrics(summaries) if summaries else None,
+        }
+    return merged
+
+
+def merge_rows(
+    results: List[List[Dict[str, Any]]], granularity: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Merge the rows of ad account analytics for the windows of a date range, or the groups of ids.
+
+    :param results: Rows for each call.
+    :param granularity: Granularity for the query. The rows with TOTAL are merged by the id columns
+        like CAMPAIGN_ID, whatever the type of the ids, and other string columns. For others rows are concatenated.
+    :return: Rows
+    """
+    if len(results) == 1:
+        return results[0]
+    rows = [row for result in results for row in result or []]
+    if granularity != "TOTAL":
+        return rows
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for row in rows:
+        key = tuple(
+            (k, v) for k, v in row.items() if k.endswith("_ID") or isinstance(v, str)
+        )
+        groups.setdefault(key, []).append(row)
+    merged = []
+    for key, group in groups.items():
+        row = merge_metrics(group)
+        # Numeric ids are not metrics to sum.
+        row.update(key)
+        merged.append(row)
+    return merged
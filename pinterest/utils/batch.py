@@ -0,0 +1,130 @@
+"""
+    Functions to upload items in batches and poll the status of the batches.
+"""
+
+from itertools import islice
+from typing import Any, Iterable, Iterator, List, Optional
+
+# Pinterest caps the items in a catalogs items batch.
+MAX_ITEMS_PER_BATCH = 1000
+# Status of the batches or items which are still being processed.
+PENDING_STATUSES = ("PROCESSING", "PENDING", "RUNNING")
+
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """
+    Split the items into lists, the items are consumed lazily.
+
+    :param items: Items, can be a generator.
+    :param size: Maximum items for a list.
+    :return: Lists generator.
+    """
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def is_pending(status: Optional[str]) -> bool:
+    """
+    :param status: Status for a batch or an item.
+    :return: Whether it is still being processed.
+    """
+    return status is None or status in PENDING_STATUSES
+
+
+class PollInterval:
+    """
+    Adaptive interval for polling. The interval grows while nothing changes, and shrinks back when
+    there is progress between polls.
+    """
+
+    def __init__(self, initial: float = 1.0, maximum: float = 30.0, factor: float = 2):
+        """
+        :param initial: Seconds to wait at first, also the minimum interval.
+        :param maximum: Maximum seconds to wait.
+        :param factor: Factor to grow or shrink the interval.
+        """
+        self.initial = initial
+        self.maximum = max(initial, maximum)
+        self.factor = factor
+        self.current = initial
+        self._reset = False
+
+    def reset(self) -> None:
+        """
+        Poll soon, like for a new item to poll. The next interval is the initial one.
+        """
+        self.current = self.initial
+        self._reset = True
+
+    def next(self, progress: bool = False) -> float:
+        """
+        :param progress: Whether there is progress since the last poll.
+        :return: Seconds to wait before the next poll.
+        """
+        if self._reset:
+            self._reset = False
+        elif progress:
+            self.current = max(self.initial, self.current / self.factor)
+        else:
+            self.current = min(self.maximum, self.current * self.factor)
+        return self.current
+
+
+class ItemsUploadReport:
+    """
+    Report for uploading catalog items in batches. Only the records with validation errors are kept,
+    so the report stays small for millions of items.
+    """
+
+    def __init__(self):
+        self.item_count = 0
+        self.success_count = 0
+        self.batch_ids: List[str] = []
+        # Batches still processing when the polling timed out.
+        self.pending_batch_ids: List[str] = []
+        # CatalogItemProcessingRecord with errors or failed status.
+        self.errors: List[Any] = []
+        self.warning_count = 0
+        # Item ids of the batches failed to submit, and the exceptions.
+        self.failed_item_ids: List[str] = []
+        self.exceptions: List[Exception] = []
+
+    def __repr__(self):
+        return (
+            f"ItemsUploadReport(item_count={self.item_count}, success_count={self.success_count}, "
+            f"batches={len(self.batch_ids)}, errors={len(self.errors)}, failed_items={len(self.failed_item_ids)})"
+        )
+
+    @property
+    def ok(self) -> bool:
+        return not (self.errors or self.failed_item_ids or self.pending_batch_ids)
+
+    def add_batch(self, batch: Any, item_count: int) -> None:
+        """
+        :param batch: CatalogItemProcessingRecordResponse for a batch.
+        :param item_count: Number of items in the batch.
+        """
+        self.item_count += item_count
+        self.batch_ids.append(batch.batch_id)
+        if is_pending(batch.status):
+            self.pending_batch_ids.append(batch.batch_id)
+        for record in batch.items or []:
+            if record.status == "SUCCESS":
+                self.success_count += 1
+            if record.errors or record.status == "FAILURE":
+                self.errors.append(record)
+            if record.warnings:
+                self.warning_count += 1
+
+    def add_failure(self, item_ids: List[str], exception: Exception) -> None:
+        """
+        :param item_ids: Item ids for the batch failed to submit.
+        :param exception: Exception for the batch.
+        """
+        self.item_count += len(item_ids)
+        self.failed_item_ids.extend(item_ids)
+        self.exceptions.append(exception)
@@ -0,0 +1,197 @@
+"""
+    Functions to run api calls concurrently.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+)
+
+
+def _call(func: Callable[[], Any]) -> Any:
+    try:
+        return func()
+    except Exception as e:
+        return e
+
+
+def run_in_threads(
+    calls: Iterable[Callable[[], Any]], max_workers: Optional[int] = None
+) -> List[Any]:
+    """
+    Run calls in a thread pool.
+
+    :param calls: Callables without parameters, like functools.partial(api.pins.get, pin_id="xxx").
+    :param max_workers: Maximum number of threads.
+    :return: Results in the same order of calls. A failed call is replaced by its exception.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_call, calls))
+
+
+def run_bounded(
+    calls: Iterable[Callable[[], Any]], max_workers: int = 4
+) -> Iterator[Any]:
+    """
+    Run calls in a thread pool with back-pressure. A call is taken from calls only when a thread is free,
+    so calls can be a generator of millions without queueing them all.
+
+    :param calls: Callables without parameters.
+    :param max_workers: Maximum number of calls running at the same time.
+    :return: Results generator, in the order of completion. A failed call is replaced by its exception.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = set()
+        for func in calls:
+            if len(pending) >= max_workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            pending.add(executor.submit(_call, func))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+async def _async_call(func: Callable[[], Awaitable[Any]]) -> Any:
+    try:
+        return await func()
+    except Exception as e:
+        return e
+
+
+async def async_run_bounded(
+    calls: Iterable[Callable[[], Awaitable[Any]]], concurrency: int = 4
+) -> AsyncIterator[Any]:
+    """
+    Run calls concurrently with back-pressure. A call is taken from calls only when a slot is free.
+
+    :param calls: Callables without parameters, which return awaitables.
+    :param concurrency: Maximum number of calls running at the same time.
+    :return: Results async generator, in the order of completion. A failed call is replaced by its exception.
+    """
+    pending = set()
+    try:
+        for func in calls:
+            if len(pending) >= concurrency:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield task.result()
+            pending.add(asyncio.ensure_future(_async_call(func)))
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Merge the concurrent calls with same key from threads into one call.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """
+        Call func, or wait for the result of the running call with same key.
+
+        :param key: Key for the call.
+        :param func: Callable without parameters.
+        :return: Result of the call. Exception of the call is raised for all the callers.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = func()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+
+class AsyncSingleFlight:
+    """
+    Merge the concurrent calls with same key from asyncio tasks into one call.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await func, or wait for the result of the running call with same key.
+
+        :param key: Key for the call.
+        :param func: Coroutine function without parameters.
+        :return: Result of the call. Exception of the call is raised for all the callers.
+        """
+        flight = self._flights.get(key)
+        if flight is not None:
+            try:
+                return await asyncio.shield(flight)
+            except asyncio.CancelledError:
+                # the leader is cancelled, not this caller. Do the call by self.
+                if not flight.cancelled():
+                    raise
+            return await self.do(key, func)
+
+        flight = self._flights[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except BaseException as e:
+            flight.set_exception(e)
+            # mark the exception retrieved if no one is waiting.
+            flight.exception()
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            del self._flights[key]
@@ -0,0 +1,228 @@
+"""
+    Incremental parser for the json arrays in response bodies.
+"""
+
+import codecs
+import json
+import re
+from typing import Any, List, Optional, Sequence
+
+from pinterest.exceptions import PinterestException
+
+_WHITESPACE = " \t\n\r"
+# The chars which change the nesting of a value, or start a string.
+_STRUCTURE = re.compile(r'["\[\]{}]')
+# The chars which end or escape in a string.
+_STRING = re.compile(r'["\\]')
+# The chars after a number, true, false or null.
+_SCALAR_END = re.compile(r"[\s,\]}]")
+
+
+class JsonArrayParser:
+    """
+    Parse a json document chunk by chunk, and return the elements of an array in it once they are complete.
+    Only the current element is kept in memory, not the whole document.
+
+    >>> parser = JsonArrayParser(path=["items"])
+    >>> parser.feed(b'{"items": [{"id": "1"}, {"i')
+    [{'id': '1'}]
+    >>> parser.feed(b'd": "2"}]}')
+    [{'id': '2'}]
+    """
+
+    def __init__(self, path: Sequence[str] = ()):
+        """
+        :param path: Keys to the array in the document, like ["all", "daily_metrics"].
+            Empty for the document which is an array.
+        """
+        self.path = list(path)
+        self._level = 0
+        self._state = "value"
+        self._buffer = ""
+        # State to resume the scan of an incomplete value in the next chunk:
+        # (start of the value, position to resume, depth, in string)
+        self._scan = None
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """
+        :param chunk: Next bytes of the document.
+        :return: Elements completed by this chunk.
+        """
+        self._buffer += self._text.decode(chunk)
+        return self._parse(final=False)
+
+    def close(self) -> List[Any]:
+        """
+        Finish the document.
+
+        :return: The last elements.
+        """
+        self._buffer += self._text.decode(b"", final=True)
+        items = self._parse(final=True)
+        if self._state != "done":
+            raise PinterestException(code=-1, message="Incomplete json document")
+        return items
+
+    def _error(self, pos: int):
+        return PinterestException(
+            code=-1, message=f"Unexpected json near: {self._buffer[pos:pos + 20]!r}"
+        )
+
+    def _skip(self, pos: int) -> int:
+        buffer = self._buffer
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+        return pos
+
+    def _value_end(self, pos: int, final: bool) -> Optional[int]:
+        """
+        Find the end of the json value at pos by the balance of its brackets and braces, without decoding it.
+        Return None for the incomplete value, the scan is resumed from there with the next chunk,
+        so each char of a large value is scanned only once.
+        """
+        buffer = self._buffer
+        if buffer[pos] not in '[{"':
+            # Number, true, false or null, which may continue in the next chunk, like "3" of "3.5".
+            match = _SCALAR_END.search(buffer, pos)
+            if match is not None:
+                return match.start()
+            if final:
+                return len(buffer)
+            return None
+        if self._scan is not None and self._scan[0] == pos:
+            _, index, depth, in_string = self._scan
+        else:
+            index, depth, in_string = pos, 0, False
+        while True:
+            if in_string:
+                match = _STRING.search(buffer, index)
+                if match is None:
+                    index = len(buffer)
+                    break
+                if match.group() == "\\":
+                    if match.end() >= len(buffer):
+                        # The escaped char is in the next chunk.
+                        index = match.start()
+                        break
+                    index = match.end() + 1
+                    continue
+                index = match.end()
+                in_string = False
+                if depth == 0:
+                    break
+                continue
+            match = _STRUCTURE.search(buffer, index)
+            if match is None:
+                index = len(buffer)
+                break
+            index = match.end()
+            char = match.group()
+            if char == '"':
+                in_string = True
+            elif char in "[{":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    break
+        if depth == 0 and not in_string:
+            if self._scan is not None and self._scan[0] == pos:
+                self._scan = None
+            return index
+        if final:
+            raise self._error(pos)
+        self._scan = (pos, index, depth, in_string)
+        return None
+
+    def _decode(self, pos: int, final: bool):
+        """
+        Decode the json value at pos, return None for the incomplete value.
+        """
+        end = self._value_end(pos, final)
+        if end is None:
+            return None
+        try:
+            value, decoded_end = self._decoder.raw_decode(self._buffer, pos)
+        except ValueError:
+            raise self._error(pos)
+        if decoded_end != end:
+            raise self._error(pos)
+        return value, end
+
+    def _parse(self, final: bool) -> List[Any]:
+        items = []
+        pos = 0
+        buffer = self._buffer
+        while self._state != "done":
+            pos = self._skip(pos)
+            if pos >= len(buffer):
+                break
+            char = buffer[pos]
+            if self._state == "value":
+                # Start of the document or the value for a key in path.
+                if char == "n":
+                    decoded = self._decode(pos, final)
+                    if decoded is None:
+                        break
+                    if decoded[0] is not None:
+                        raise self._error(pos)
+                    self._state = "done"
+                    break
+                if self._level < len(self.path):
+                    if char != "{":
+                        raise self._error(pos)
+                    self._state = "key"
+                else:
+                    if char != "[":
+                        raise self._error(pos)
+                    self._state = "items"
+                pos += 1
+            elif self._state == "key":
+                if char == ",":
+                    pos += 1
+                    continue
+                if char == "}":
+                    # The path is not found.
+                    self._state = "done"
+                    break
+                decoded = self._decode(pos, final)
+                if decoded is None:
+                    break
+                key, end = decoded
+                end = self._skip(end)
+                if end >= len(buffer):
+                    break
+                if buffer[end] != ":":
+                    raise self._error(end)
+                if key == self.path[self._level]:
+                    self._level += 1
+                    self._state = "value"
+                    pos = end + 1
+                else:
+                    # Skip the value for other keys.
+                    value_pos = self._skip(end + 1)
+                    if value_pos >= len(buffer):
+                        break
+                    end = self._value_end(value_pos, final)
+                    if end is None:
+                        break
+                    pos = end
+            elif self._state == "items":
+                if char == ",":
+                    pos += 1
+                    continue
+                if char == "]":
+                    self._state = "done"
+                    break
+                decoded = self._decode(pos, final)
+                if decoded is None:
+                    break
+                item, pos = decoded
+                items.append(item)
+        self._buffer = "" if self._state == "done" else buffer[pos:]
+        if self._scan is not None:
+            start, index, depth, in_string = self._scan
+            self._scan = (start - pos, index - pos, depth, in_string)
+        return items
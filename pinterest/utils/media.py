@@ -0,0 +1,232 @@
+"""
+    Functions to upload media files and create pins with them.
+"""
+
+import asyncio
+import contextlib
+import io
+import mmap
+import os
+import uuid
+from typing import IO, Any, AsyncIterator, Callable, Dict, Iterator, Optional, Union
+
+from httpx import Response
+
+from pinterest.exceptions import PinterestException
+
+# Status of the media uploads which are still being processed.
+MEDIA_PENDING_STATUSES = ("registered", "processing")
+# Keys for the media source of video pins in the video specs, others are parameters for pins.create.
+VIDEO_SOURCE_KEYS = ("cover_image_url", "cover_image_key_frame_time")
+
+# Bytes of the file in a chunk of upload body.
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+MediaFile = Union[str, "os.PathLike[str]", IO[bytes], bytes]
+
+
+def is_media_pending(status: Optional[str]) -> bool:
+    """
+    :param status: Status for a media upload.
+    :return: Whether the media is still being uploaded or processed.
+    """
+    return status is None or status in MEDIA_PENDING_STATUSES
+
+
+@contextlib.contextmanager
+def open_media(file: MediaFile) -> Iterator[IO[bytes]]:
+    """
+    Open the media file for reading. A file object is used as is and not closed.
+
+    :param file: Path for the file, or a binary file object.
+    :return: Binary file object.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "rb") as f:
+            yield f
+    else:
+        yield file
+
+
+def media_filename(file: MediaFile) -> str:
+    """
+    :param file: Path for the file, or a binary file object.
+    :return: Base name for the file.
+    """
+    name = file if isinstance(file, (str, os.PathLike)) else getattr(file, "name", "")
+    return os.path.basename(os.fspath(name)) if name else "media"
+
+
+def check_upload_response(response: Response) -> None:
+    """
+    Raise for the failed upload. The upload url is not a Pinterest api, responses are not json.
+
+    :param response: Response for the upload.
+    """
+    if not response.is_success:
+        raise PinterestException(
+            code=response.status_code,
+            message=f"Failed to upload media: {response.text[:200]}",
+        )
+
+
+class UploadBody:
+    """
+    Multipart body to upload a media file, streamed in fixed chunks. Files on disk are read through
+    a memory map, other file objects by read(), so the memory is bounded by the chunk size whatever
+    the file size. Each iteration starts from the beginning of the file, so the body can be sent again for a retry.
+    """
+
+    def __init__(
+        self,
+        fields: Dict[str, str],
+        file: Union[IO[bytes], bytes],
+        filename: str = "media",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ):
+        """
+        :param fields: Form fields before the file, like the upload_parameters of a registered media.
+        :param file: Binary file object, or the bytes of the file.
+        :param filename: Name for the file in the form.
+        :param chunk_size: Bytes of the file for a chunk.
+        :param progress: Function called with the bytes sent and the total bytes of the file after each chunk.
+        """
+        self.file = file
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.boundary = uuid.uuid4().hex
+        parts = []
+        for name, value in fields.items():
+            parts.append(
+                f"--{self.boundary}\r\n"
+                f'Content-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'
+            )
+        parts.append(
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+            f"Content-Type: application/octet-stream\r\n\r\n"
+        )
+        self.head = "".join(parts).encode("utf-8")
+        self.tail = f"\r\n--{self.boundary}--\r\n".encode("utf-8")
+        self.start = 0 if isinstance(file, bytes) else self._tell(file)
+        self.size = self._size()
+
+    @staticmethod
+    def _tell(file: IO[bytes]) -> Optional[int]:
+        try:
+            return file.tell()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            return None
+
+    def _size(self) -> Optional[int]:
+        if isinstance(self.file, bytes):
+            return len(self.file)
+        if self.start is None:
+            return None
+        try:
+            end = self.file.seek(0, os.SEEK_END)
+            self.file.seek(self.start)
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            return None
+        return end - self.start
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    @property
+    def rewindable(self) -> bool:
+        """Whether the body can be sent again, the file object is seekable."""
+        return self.size is not None
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        headers = {"Content-Type": self.content_type}
+        if self.size is not None:
+            headers["Content-Length"] = str(len(self.head) + self.size + len(self.tail))
+        return headers
+
+    def _file_chunks(self) -> Iterator[bytes]:
+        if isinstance(self.file, bytes):
+            view = memoryview(self.file)
+            for offset in range(0, len(view), self.chunk_size):
+                yield bytes(view[offset : offset + self.chunk_size])
+            return
+        mapped = None
+        if self.size:
+            try:
+                mapped = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+                mapped = None
+        if mapped is not None:
+            with mapped:
+                end = self.start + self.size
+                for offset in range(self.start, end, self.chunk_size):
+                    yield mapped[offset : min(offset + self.chunk_size, end)]
+            return
+        if self.start is not None:
+            self.file.seek(self.start)
+        chunk = self.file.read(self.chunk_size)
+        while chunk:
+            yield chunk
+            chunk = self.file.read(self.chunk_size)
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield self.head
+        sent = 0
+        total = self.size or 0
+        for chunk in self._file_chunks():
+            yield chunk
+            sent += len(chunk)
+            if self.progress is not None:
+                self.progress(sent, max(total, sent))
+        yield self.tail
+
+    async def aiter_chunks(self) -> AsyncIterator[bytes]:
+        """
+        Chunks of the body for the async client, which only sends async iterables.
+        The file is read in the default executor, so the event loop is not blocked by the disk.
+        """
+        loop = asyncio.get_running_loop()
+        yield self.head
+        sent = 0
+        total = self.size or 0
+        chunks = self._file_chunks()
+        try:
+            while True:
+                chunk = await loop.run_in_executor(None, next, chunks, None)
+                if chunk is None:
+                    break
+                yield chunk
+                sent += len(chunk)
+                if self.progress is not None:
+                    self.progress(sent, max(total, sent))
+        finally:
+            chunks.close()
+        yield self.tail
+
+
+class MediaUploadResult:
+    """Result for a media file in the upload pipeline."""
+
+    def __init__(self, file: MediaFile):
+        """
+        :param file: Path for the file, or a binary file object.
+        """
+        self.file = file
+        self.media_id: Optional[str] = None
+        self.status: Optional[str] = None
+        # Pin created with the media.
+        self.pin: Any = None
+        self.error: Optional[Exception] = None
+
+    def __repr__(self):
+        return (
+            f"MediaUploadResult(file={self.file!r}, media_id={self.media_id!r}, "
+            f"status={self.status!r}, error={self.error!r})"
+        )
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.pin is not None
@@ -0,0 +1,215 @@
+"""
+    Watermark store for incremental analytics sync.
+
+    The store records the data status of each day synced for an analytics query. A later sync only
+    requests the days from the first day which is new or not final yet, instead of the whole date range.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+# Data status of the days which will not change anymore. Others like "ESTIMATE", "PROCESSING" will.
+FINAL_STATUSES = ("READY",)
+FINAL_STATUS_PREFIXES = ("BEFORE_",)
+# Days before the metrics of a day without data status are final.
+# Ad analytics attribute conversions within 30 days by default.
+DEFAULT_SETTLE_DAYS = 30
+# Parameters which don't change the data of a query.
+_OPTION_KEYS = ("window_days", "ids_per_request", "concurrency")
+
+
+def is_final(status: Optional[str]) -> bool:
+    """
+    :param status: Data status for a day, like "READY", "ESTIMATE", "BEFORE_DATA_RETENTION_PERIOD".
+    :return: Whether the metrics for the day are final.
+    """
+    if not status:
+        return False
+    return status in FINAL_STATUSES or status.startswith(FINAL_STATUS_PREFIXES)
+
+
+def watermark_key(path: str, query: Optional[dict] = None) -> str:
+    """
+    Build the key for an analytics query. Queries with different parameters have different watermarks.
+
+    :param path: Path for the api, like "pins/xxx/analytics".
+    :param query: Parameters for the query, without the date range.
+    :return: Key for the query.
+    """
+    query = {
+        k: v
+        for k, v in (query or {}).items()
+        if v is not None and k not in _OPTION_KEYS
+    }
+    if not query:
+        return path
+    digest = hashlib.sha256(
+        json.dumps(query, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()[:16]
+    return f"{path}#{digest}"
+
+
+def analytics_statuses(
+    data: Dict[str, Any],
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    settle_days: int = DEFAULT_SETTLE_DAYS,
+    today: Optional[date] = None,
+) -> Dict[str, str]:
+    """
+    :param data: Json data of analytics for user account or pin.
+    :param start_date: Start date of the query, format: YYYY-MM-DD. With end_date, the days in the date range
+        which are missing from the daily metrics, like the days without any activity, are taken as final
+        once they are older than settle_days.
+    :param end_date: End date of the query, included. Format: YYYY-MM-DD
+    :param settle_days: Days before a missing day is final.
+    :param today: Today for the date range, default is the date in UTC.
+    :return: Data status for each day. A day is final only if it is final in all the groups.
+    """
+    statuses: Dict[str, str] = {}
+    for group in (data or {}).values():
+        if not isinstance(group, dict):
+            continue
+        for metric in group.get("daily_metrics") or []:
+            day, status = metric.get("date"), metric.get("data_status")
+            if day is None:
+                continue
+            if day not in statuses or is_final(statuses[day]):
+                statuses[day] = status
+    if start_date and end_date:
+        statuses = dict(
+            settled_statuses(start_date, end_date, settle_days, today), **statuses
+        )
+    return statuses
+
+
+def settled_statuses(
+    start_date: str, end_date: str, settle_days: int, today: Optional[date] = None
+) -> Dict[str, str]:
+    """
+    Ad analytics rows have no data status, and days without delivery have no rows. So each day in the
+    date range older than settle_days is taken as final, as conversions are attributed within the attribution windows.
+
+    :param start_date: Start date, format: YYYY-MM-DD
+    :param end_date: End date, included. Format: YYYY-MM-DD
+    :param settle_days: Days before the metrics of a day are final.
+    :param today: Today for the date range, default is the date in UTC.
+    :return: Data status for each day.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    settled = today - timedelta(days=settle_days)
+    day, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+    statuses = {}
+    while day <= end:
+        statuses[day.isoformat()] = "READY" if day <= settled else "ESTIMATE"
+        day += timedelta(days=1)
+    return statuses
+
+
+class WatermarkStore:
+    """Watermarks in a sqlite database, kept between the runs of a job. Safe to share between threads."""
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        :param path: Path for the database file.
+        """
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS watermarks ("
+            "entity TEXT, day TEXT, data_status TEXT, synced_at REAL, "
+            "PRIMARY KEY (entity, day))"
+        )
+        self._conn.commit()
+
+    def get(self, entity: str, start_date: str, end_date: str) -> Dict[str, str]:
+        """
+        :param entity: Key for the query.
+        :param start_date: Start date, format: YYYY-MM-DD
+        :param end_date: End date, included. Format: YYYY-MM-DD
+        :return: Data status for the synced days in the date range.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT day, data_status FROM watermarks "
+                "WHERE entity = ? AND day >= ? AND day <= ?",
+                (entity, start_date, end_date),
+            ).fetchall()
+        return dict(rows)
+
+    def pending_range(
+        self, entity: str, start_date: str, end_date: str
+    ) -> Optional[Tuple[str, str]]:
+        """
+        :param entity: Key for the query.
+        :param start_date: Start date, format: YYYY-MM-DD
+        :param end_date: End date, included. Format: YYYY-MM-DD
+        :return: Date range from the first day which is new or not final, to the end date.
+            None if all the days are final.
+        """
+        try:
+            day, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+        except (TypeError, ValueError):
+            # Leave the invalid dates to the api.
+            return start_date, end_date
+        statuses = self.get(entity, start_date, end_date)
+        while day <= end:
+            if not is_final(statuses.get(day.isoformat())):
+                return day.isoformat(), end_date
+            day += timedelta(days=1)
+        return None
+
+    def record(self, entity: str, statuses: Dict[str, str]) -> None:
+        """
+        :param entity: Key for the query.
+        :param statuses: Data status for the synced days.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO watermarks VALUES (?, ?, ?, ?)",
+                [(entity, day, status, now) for day, status in statuses.items()],
+            )
+            self._conn.commit()
+
+    def last_synced(self, entity: str, final: bool = True) -> Optional[str]:
+        """
+        :param entity: Key for the query.
+        :param final: Only the days which are final.
+        :return: The last synced day, None if not synced.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT day, data_status FROM watermarks WHERE entity = ? ORDER BY day DESC",
+                (entity,),
+            ).fetchall()
+        for day, status in rows:
+            if not final or is_final(status):
+                return day
+        return None
+
+    def entities(self) -> List[str]:
+        """
+        :return: Keys for the synced queries.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT entity FROM watermarks ORDER BY entity"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def clear(self, entity: Optional[str] = None) -> None:
+        """
+        :param entity: Key for the query, None to clear all.
+        """
+        with self._lock:
+            if entity is None:
+                self._conn.execute("DELETE FROM watermarks")
+            else:
+                self._conn.execute("DELETE FROM watermarks WHERE entity = ?", (entity,))
+            self._conn.commit()
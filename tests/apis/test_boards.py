@@ -0,0 +1,117 @@
+"""
+    Tests for boards
+"""
+
+import asyncio
+
+import pytest
+import respx
+
+import pinterest as pin
+
+
+def pins_pages(helpers):
+    pin_data = helpers.load_data("tests/data/pins/pin_data.json")
+    return [
+        {"items": [pin_data, pin_data], "bookmark": "bookmark1"},
+        {"items": [pin_data], "bookmark": None},
+    ]
+
+
+@respx.mock
+def test_iter_board_pins(api, helpers):
+    board_id = "1022106146619703648"
+    pages = pins_pages(helpers)
+    route = respx.get(f"{pin.Api.DEFAULT_API_URL}boards/{board_id}/pins")
+    route.side_effect = [respx.MockResponse(200, json=page) for page in pages]
+
+    pins = list(api.boards.iter_pins(board_id=board_id, page_size=2))
+    assert len(pins) == 3
+    assert pins[0].board_id == board_id
+    assert route.call_count == 2
+    assert "bookmark" not in route.calls[0].request.url.params
+    assert route.calls[1].request.url.params["bookmark"] == "bookmark1"
+
+    route.side_effect = [respx.MockResponse(200, json=page) for page in pages]
+    pins = api.boards.iter_pins(board_id=board_id, return_json=True)
+    assert next(pins)["board_id"] == board_id
+    # generator is lazy, the second page is not requested yet.
+    assert route.call_count == 3
+
+
+@respx.mock
+@pytest.mark.asyncio
+async def test_async_iter_board_pins(async_api, helpers):
+    board_id = "1022106146619703648"
+    route = respx.get(f"{pin.Api.DEFAULT_API_URL}boards/{board_id}/pins")
+    route.side_effect = [
+        respx.MockResponse(200, json=page) for page in pins_pages(helpers)
+    ]
+
+    pins = [p async for p in async_api.boards.iter_pins(board_id=board_id)]
+    assert len(pins) == 3
+    assert pins[-1].media.media_type == "image"
+    assert route.calls[1].request.url.params["bookmark"] == "bookmark1"
+
+
+@respx.mock
+@pytest.mark.asyncio
+async def test_async_iter_board_pins_prefetch(async_api, helpers):
+    board_id = "1022106146619703648"
+    pin_data = helpers.load_data("tests/data/pins/pin_data.json")
+    pages = [
+        {"items": [pin_data], "bookmark": f"bookmark{i + 1}" if i < 4 else None}
+        for i in range(5)
+    ]
+    route = respx.get(f"{pin.Api.DEFAULT_API_URL}boards/{board_id}/pins")
+    route.side_effect = [respx.MockResponse(200, json=page) for page in pages]
+
+    pins = async_api.boards.iter_pins(board_id=board_id, prefetch=2)
+    first = await pins.__anext__()
+    assert first.id == pin_data["id"]
+    await asyncio.sleep(0.01)
+    # pages requested ahead are bounded by the buffer size.
+    assert 2 <= route.call_count <= 4
+
+    rest = [p async for p in pins]
+    assert len(rest) == 4
+    assert route.call_count == 5
+    assert route.calls[4].request.url.params["bookmark"] == "bookmark4"
+
+
+@respx.mock
+@pytest.mark.asyncio
+async def test_async_iter_board_pins_prefetch_error(async_api, helpers):
+    board_id = "1022106146619703648"
+    pin_data = helpers.load_data("tests/data/pins/pin_data.json")
+    route = respx.get(f"{pin.Api.DEFAULT_API_URL}boards/{board_id}/pins")
+    route.side_effect = [
+        respx.MockResponse(200, json={"items": [pin_data], "bookmark": "bookmark1"}),
+        respx.MockResponse(400, json={"code": 1, "message": "Bad request"}),
+    ]
+
+    pins = []
+    with pytest.raises(pin.PinterestException):
+        async for p in async_api.boards.iter_pins(board_id=board_id, prefetch=1):
+            pins.append(p)
+    assert len(pins) == 1
+
+
+@respx.mock
+@pytest.mark.asyncio
+async def test_async_iter_board_pins_prefetch_break(async_api, helpers):
+    board_id = "1022106146619703648"
+    pin_data = helpers.load_data("tests/data/pins/pin_data.json")
+    route = respx.get(f"{pin.Api.DEFAULT_API_URL}boards/{board_id}/pins")
+    route.side_effect = [
+        respx.MockResponse(200, json={"items": [pin_data], "bookmark": f"bookmark{i}"})
+        for i in range(5)
+    ]
+
+    tasks = asyncio.all_tasks()
+    pins = async_api.boards.iter_pins(board_id=board_id, prefetch=1)
+    async for _ in pins:
+        break
+    await pins.aclose()
+    # The producer is cancelled and awaited, no task is left pending.
+    assert asyncio.all_tasks() == tasks
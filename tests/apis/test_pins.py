@@ -2,6 +2,9 @@
     Tests for pins
 """
 
+import asyncio
+import functools
+
 import pytest
 import respx
 
@@ -151,3 +154,84 @@ async def test_async_get_pin_analytics(async_api, helpers):
     )
     assert analytics.all.summary_metrics["IMPRESSION"] == 0.0
     assert analytics.all.daily_metrics[0].data_status == "PROCESSING"
+
+
+@respx.mock
+@pytest.mark.asyncio
+async def test_async_get_many_pins(async_api, helpers):
+    pin_data = helpers.load_data("tests/data/pins/pin_data.json")
+    pin_ids = ["1", "2", "3", "4"]
+    for pin_id in pin_ids:
+        respx.get(f"{pin.Api.DEFAULT_API_URL}pins/{pin_id}").respond(
+            status_code=200, json=dict(pin_data, id=pin_id)
+        )
+    respx.get(f"{pin.Api.DEFAULT_API_URL}pins/5").respond(
+        status_code=404, json={"code": 50, "message": "Pin not found."}
+    )
+
+    pins = await async_api.pins.get_many(pin_ids=pin_ids + ["5"], concurrency=2)
+    assert [p.id for p in pins[:4]] == pin_ids
+    assert isinstance(pins[4], pin.PinterestException)
+    assert pins[4].code == 50
+
+
+@respx.mock
+@pytest.mark.asyncio
+async def test_async_max_in_flight(helpers):
+    pin_data = helpers.load_data("tests/data/pins/pin_data.json")
+    api = pin.AsyncApi(access_token="access token", max_in_flight=2)
+    in_flight, peak = 0, 0
+
+    async def side_effect(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return respx.MockResponse(200, json=pin_data)
+
+    respx.get(url__startswith=f"{pin.Api.DEFAULT_API_URL}pins/").mock(
+        side_effect=side_effect
+    )
+    pins = await api.pins.get_many(pin_ids=[str(i) for i in range(8)], concurrency=8)
+    assert len(pins) == 8
+    assert peak == 2
+
+
+@respx.mock
+def test_get_many_pins(api, helpers):
+    pin_data = helpers.load_data("tests/data/pins/pin_data.json")
+    for pin_id in ["1", "2", "3"]:
+        respx.get(f"{pin.Api.DEFAULT_API_URL}pins/{pin_id}").respond(
+            status_code=200, json=dict(pin_data, id=pin_id)
+        )
+    respx.get(f"{pin.Api.DEFAULT_API_URL}pins/4").respond(
+        status_code=404, json={"code": 50, "message": "Pin not found."}
+    )
+
+    pins = api.pins.get_many(pin_ids=["1", "2", "3", "4"], concurrency=2)
+    assert [p.id for p in pins[:3]] == ["1", "2", "3"]
+    assert isinstance(pins[3], pin.PinterestException)
+
+
+@respx.mock
+def test_bulk(api, helpers):
+    pin_id, board_id = "1022106077905927852", "1022106146619703648"
+    respx.get(f"{pin.Api.DEFAULT_API_URL}pins/{pin_id}").respond(
+        status_code=200, json=helpers.load_data("tests/data/pins/pin_data.json")
+    )
+    respx.get(f"{pin.Api.DEFAULT_API_URL}boards/{board_id}").respond(
+        status_code=200, json={"id": board_id, "name": "Food"}
+    )
+
+    p, board, error = api.bulk(
+        [
+            functools.partial(api.pins.get, pin_id=pin_id),
+            functools.partial(api.boards.get, board_id=board_id),
+            functools.partial(api.boards.update, board_id=board_id),
+        ],
+        max_workers=3,
+    )
+    assert p.id == pin_id
+    assert board.name == "Food"
+    assert isinstance(error, pin.PinterestException)
@@ -0,0 +1,193 @@
+"""
+    Tests for splitting analytics queries and merging the results
+"""
+
+import json
+
+import httpx
+import pytest
+import respx
+
+import pinterest as pin
+from pinterest.utils.analytics import (
+    MAX_ANALYTICS_DAYS,
+    MAX_ANALYTICS_IDS,
+    merge_analytics,
+    merge_metrics,
+    merge_rows,
+    split_date_range,
+    split_ids,
+)
+
+
+def test_split_date_range():
+    assert split_date_range("2022-01-01", "2022-01-10", days=90) == [
+        ("2022-01-01", "2022-01-10")
+    ]
+    assert split_date_range("2022-01-01", "2022-01-10", days=4) == [
+        ("2022-01-01", "2022-01-04"),
+        ("2022-01-05", "2022-01-08"),
+        ("2022-01-09", "2022-01-10"),
+    ]
+    assert split_date_range("2022-01-01", "bad", days=4) == [("2022-01-01", "bad")]
+
+
+def test_split_ids():
+    assert split_ids("1,2,3,4,5", size=2) == ["1,2", "3,4", "5"]
+    assert split_ids("1", size=100) == ["1"]
+
+
+def test_merge_metrics():
+    merged = merge_metrics(
+        [
+            {"IMPRESSION": 100, "SAVE": 10, "SAVE_RATE": 0.1, "CTR": 0.2},
+            {"IMPRESSION": 300, "SAVE": 0, "SAVE_RATE": 0.0, "CTR": 0.1},
+        ]
+    )
+    assert merged["IMPRESSION"] == 400
+    assert merged["SAVE"] == 10
+    assert merged["SAVE_RATE"] == 10 / 400
+    assert merged["CTR"] == pytest.approx(0.125)
+
+
+def test_merge_analytics_and_rows():
+    merged = merge_analytics(
+        [
+            {
+                "all": {
+                    "daily_metrics": [{"date": "2022-01-02"}],
+                    "summary_metrics": {"IMPRESSION": 1},
+                }
+            },
+            {
+                "all": {
+                    "daily_metrics": [{"date": "2022-01-01"}],
+                    "summary_metrics": {"IMPRESSION": 2},
+                }
+            },
+        ]
+    )
+    assert [m["date"] for m in merged["all"]["daily_metrics"]] == [
+        "2022-01-01",
+        "2022-01-02",
+    ]
+    assert merged["all"]["summary_metrics"] == {"IMPRESSION": 3}
+
+    results = [[{"AD_ID": "1", "SPEND": 1}], [{"AD_ID": "1", "SPEND": 2}]]
+    assert len(merge_rows(results, granularity="DAY")) == 2
+    assert merge_rows(results, granularity="TOTAL") == [{"AD_ID": "1", "SPEND": 3}]
+    # Integer ids are keys, not metrics.
+    results = [
+        [{"AD_ID": 1, "SPEND": 1}, {"AD_ID": 2, "SPEND": 5}],
+        [{"AD_ID": 1, "SPEND": 2}, {"AD_ID": 2, "SPEND": 1}],
+    ]
+    assert merge_rows(results, granularity="TOTAL") == [
+        {"AD_ID": 1, "SPEND": 3},
+        {"AD_ID": 2, "SPEND": 6},
+    ]
+
+
+def _analytics_response(request):
+    params = request.url.params
+    return httpx.Response(
+        200,
+        json={
+            "all": {
+                "daily_metrics": [{"date": params["start_date"], "metrics": {}}],
+                "summary_metrics": {"IMPRESSION": 1},
+            }
+        },
+    )
+
+
+@respx.mock
+def test_get_analytics_windows(api):
+    route = respx.get(f"{pin.Api.DEFAULT_API_URL}user_account/analytics").mock(
+        side_effect=_analytics_response
+    )
+    analytics = api.user_account.get_analytics(
+        start_date="2022-01-01", end_date="2022-04-30", window_days=MAX_ANALYTICS_DAYS
+    )
+    assert route.call_count == 2
+    assert [m.date for m in analytics.all.daily_metrics] == [
+        "2022-01-01",
+        "2022-04-01",
+    ]
+    assert analytics.all.summary_metrics["IMPRESSION"] == 2
+
+    # Not split by default.
+    api.user_account.get_analytics(start_date="2022-01-01", end_date="2022-04-30")
+    assert route.call_count == 3
+
+
+@respx.mock
+@pytest.mark.asyncio
+async def test_async_get_analytics_windows(async_api):
+    route = respx.get(f"{pin.Api.DEFAULT_API_URL}pins/pin_id/analytics").mock(
+        side_effect=_analytics_response
+    )
+    analytics = await async_api.pins.get_analytics(
+        pin_id="pin_id",
+        start_date="2022-01-01",
+        end_date="2022-04-30",
+        metric_types="IMPRESSION",
+        window_days=30,
+    )
+    assert route.call_count == 4
+    assert analytics.all.summary_metrics["IMPRESSION"] == 4
+
+
+def _rows_response(request):
+    ids = json.loads(request.content)["campaign_ids"].split(",")
+    return httpx.Response(
+        200, json=[{"CAMPAIGN_ID": i, "SPEND_IN_DOLLAR": 1} for i in ids]
+    )
+
+
+@respx.mock
+def test_get_campaign_analytics_shards(api):
+    route = respx.get(
+        f"{pin.Api.DEFAULT_API_URL}ad_accounts/549755885175/campaigns/analytics"
+    ).mock(side_effect=_rows_response)
+    campaign_ids = [str(i) for i in range(250)]
+    rows = api.ad_accounts.get_campaign_analytics(
+        ad_account_id="549755885175",
+        campaign_ids=campaign_ids,
+        start_date="2022-08-01",
+        end_date="2022-08-31",
+        columns="SPEND_IN_DOLLAR",
+        granularity="TOTAL",
+        ids_per_request=MAX_ANALYTICS_IDS,
+    )
+    assert route.call_count == 3
+    assert sorted(r["CAMPAIGN_ID"] for r in rows) == sorted(campaign_ids)
+
+    # Not split by default.
+    api.ad_accounts.get_campaign_analytics(
+        ad_account_id="549755885175",
+        campaign_ids=campaign_ids,
+        start_date="2022-08-01",
+        end_date="2022-08-31",
+        columns="SPEND_IN_DOLLAR",
+        granularity="TOTAL",
+    )
+    assert route.call_count == 4
+
+
+@respx.mock
+@pytest.mark.asyncio
+async def test_async_get_campaign_analytics_shards(async_api):
+    route = respx.get(
+        f"{pin.Api.DEFAULT_API_URL}ad_accounts/549755885175/campaigns/analytics"
+    ).mock(side_effect=_rows_response)
+    rows = await async_api.ad_accounts.get_campaign_analytics(
+        ad_account_id="549755885175",
+        campaign_ids=["1", "2", "3"],
+        start_date="2022-08-01",
+        end_date="2022-08-31",
+        columns="SPEND_IN_DOLLAR",
+        granularity="DAY",
+        ids_per_request=2,
+    )
+    assert route.call_count == 2
+    assert [r["CAMPAIGN_ID"] for r in rows] == ["1", "2", "3"]
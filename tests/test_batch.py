@@ -0,0 +1,161 @@
+"""
+    Tests for uploading catalog items in batches
+"""
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+import respx
+
+import pinterest as pin
+from pinterest.utils.batch import PollInterval, chunked
+from pinterest.utils.concurrency import async_run_bounded, run_bounded
+
+
+def test_chunked():
+    assert list(chunked(iter(range(5)), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(chunked([], 2)) == []
+
+
+def test_poll_interval():
+    interval = PollInterval(initial=1, maximum=5, factor=2)
+    assert [interval.next() for _ in range(4)] == [2, 4, 5, 5]
+    assert interval.next(progress=True) == 2.5
+    assert interval.next(progress=True) == 1.25
+    assert interval.next(progress=True) == 1
+    interval.next()
+    interval.reset()
+    # The next interval is the initial one, not grown from it.
+    assert interval.next() == 1
+    assert interval.next() == 2
+
+
+def test_run_bounded():
+    running, peak = [0], [0]
+    lock = threading.Lock()
+
+    def work(i):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+        if i == 3:
+            raise ValueError(i)
+        return i
+
+    results = list(run_bounded((lambda i=i: work(i) for i in range(10)), max_workers=2))
+    assert peak[0] <= 2
+    assert sorted(r for r in results if not isinstance(r, Exception)) == [
+        i for i in range(10) if i != 3
+    ]
+    assert sum(isinstance(r, ValueError) for r in results) == 1
+
+
+@pytest.mark.asyncio
+async def test_async_run_bounded():
+    running, peak = [0], [0]
+
+    async def work(i):
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        await asyncio.sleep(0.001)
+        running[0] -= 1
+        return i
+
+    results = [
+        r
+        async for r in async_run_bounded(
+            (lambda i=i: work(i) for i in range(10)), concurrency=3
+        )
+    ]
+    assert peak[0] == 3
+    assert sorted(results) == list(range(10))
+
+
+def _batch(batch_id, status, items=None):
+    return {"batch_id": batch_id, "status": status, "items": items or []}
+
+
+@respx.mock
+def test_upload_items(api):
+    submitted = []
+
+    def perform(request):
+        batch_id = f"batch-{len(submitted)}"
+        submitted.append(request)
+        return httpx.Response(200, json=_batch(batch_id, "PROCESSING"))
+
+    polls = {}
+
+    def get_batch(request):
+        batch_id = request.url.path.rsplit("/", 1)[-1]
+        polls[batch_id] = polls.get(batch_id, 0) + 1
+        if polls[batch_id] < 2:
+            return httpx.Response(200, json=_batch(batch_id, "PROCESSING"))
+        items = [
+            {"item_id": f"{batch_id}-ok", "status": "SUCCESS"},
+            {
+                "item_id": f"{batch_id}-bad",
+                "status": "FAILURE",
+                "errors": [{"attribute": "title", "code": 106, "message": "missing"}],
+            },
+        ]
+        return httpx.Response(200, json=_batch(batch_id, "COMPLETED", items))
+
+    respx.post(f"{pin.Api.DEFAULT_API_URL}catalogs/items/batch").mock(
+        side_effect=perform
+    )
+    respx.get(url__regex=rf"{pin.Api.DEFAULT_API_URL}catalogs/items/batch/.+").mock(
+        side_effect=get_batch
+    )
+    done = []
+    report = api.catalogs.upload_items(
+        ({"item_id": str(i), "attributes": {}} for i in range(5)),
+        country="US",
+        language="EN",
+        batch_size=2,
+        concurrency=2,
+        poll_interval=0,
+        callback=done.append,
+    )
+    assert len(submitted) == 3
+    assert len(done) == 3
+    assert report.item_count == 5
+    assert report.success_count == 3
+    assert len(report.errors) == 3
+    assert report.errors[0].errors[0].code == 106
+    assert not report.ok
+
+
+@respx.mock
+@pytest.mark.asyncio
+async def test_async_upload_items(async_api):
+    calls = []
+
+    def perform(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(400, json={"code": 1, "message": "Invalid"})
+        return httpx.Response(
+            200,
+            json=_batch("b", "COMPLETED", [{"item_id": "2", "status": "SUCCESS"}]),
+        )
+
+    respx.post(f"{pin.Api.DEFAULT_API_URL}catalogs/items/batch").mock(
+        side_effect=perform
+    )
+    report = await async_api.catalogs.upload_items(
+        [{"item_id": "1"}, {"item_id": "2"}],
+        operation="DELETE",
+        batch_size=1,
+        concurrency=1,
+    )
+    assert report.item_count == 2
+    assert report.success_count == 1
+    assert report.failed_item_ids == ["1"]
+    assert isinstance(report.exceptions[0], pin.PinterestException)
@@ -0,0 +1,274 @@
+"""
+    Tests for response cache
+"""
+
+import fnmatch
+import gzip
+import json
+import time
+
+import httpx
+import pytest
+import respx
+
+import pinterest as pin
+from pinterest.cache import CacheEntry, MemoryCache, RedisCache, SQLiteCache
+from pinterest.poller import MediaPoller
+
+
+class FakeRedis:
+    """Stub for the redis client used by RedisCache."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, name):
+        value, expires_at = self.data.get(name, (None, 0))
+        return value if expires_at > time.monotonic() else None
+
+    def set(self, name, value, px=None):
+        self.data[name] = (value, time.monotonic() + px / 1000)
+
+    def delete(self, *names):
+        for name in names:
+            self.data.pop(name, None)
+
+    def scan_iter(self, match=None):
+        return [k for k in list(self.data) if fnmatch.fnmatchcase(k, match)]
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def cache(request):
+    if request.param == "memory":
+        return MemoryCache()
+    if request.param == "sqlite":
+        return SQLiteCache()
+    return RedisCache(FakeRedis())
+
+
+def test_cache_backends(cache):
+    entry = CacheEntry(200, [("content-type", "application/json")], b'{"id": "1"}')
+    cache.set("GET a", entry, ttl=60)
+    cache.set("GET b", entry, ttl=60)
+    cache.set("GET c", entry, ttl=0.001)
+    got = cache.get("GET a")
+    assert got.content == entry.content
+    assert got.headers == entry.headers
+    time.sleep(0.01)
+    assert cache.get("GET c") is None
+
+    cache.delete_prefix("GET a")
+    assert cache.get("GET a") is None
+    cache.clear()
+    assert cache.get("GET b") is None
+
+
+def test_lru_eviction():
+    for cache in (MemoryCache(maxsize=2), SQLiteCache(maxsize=2)):
+        entry = CacheEntry(200, [], b"{}")
+        cache.set("a", entry, ttl=60)
+        cache.set("b", entry, ttl=60)
+        time.sleep(0.001)
+        cache.get("a")
+        cache.set("c", entry, ttl=60)
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+
+
+def test_ttl_for():
+    cache = MemoryCache(ttl=60, endpoint_ttls={"boards": 10, "boards/x/pins": 0})
+    assert cache.ttl_for("user_account") == 60
+    assert cache.ttl_for("boards") == 10
+    assert cache.ttl_for("boards/y") == 10
+    assert cache.ttl_for("boards/x/pins") == 0
+    assert cache.ttl_for("boardsx") == 60
+
+
+@respx.mock
+def test_api_cache():
+    api = pin.Api(
+        access_token="access token",
+        cache=MemoryCache(endpoint_ttls={"pins": 0}),
+    )
+    board_id = "1022106146619703648"
+    route = respx.get(f"{pin.Api.DEFAULT_API_URL}boards/{board_id}").respond(
+        200, json={"id": board_id, "name": "Food"}
+    )
+    list_route = respx.get(f"{pin.Api.DEFAULT_API_URL}boards").respond(
+        200, json={"items": [{"id": board_id, "name": "Food"}]}
+    )
+
+    assert api.boards.get(board_id=board_id).name == "Food"
+    assert api.boards.get(board_id=board_id).name == "Food"
+    assert route.call_count == 1
+    api.boards.list()
+    api.boards.list()
+    assert list_route.call_count == 1
+
+    # other token not shares the cache
+    api.access_token = "other token"
+    api.boards.get(board_id=board_id)
+    assert route.call_count == 2
+
+    # write on the resource invalidates the cached responses
+    respx.patch(f"{pin.Api.DEFAULT_API_URL}boards/{board_id}").respond(
+        200, json={"id": board_id, "name": "City"}
+    )
+    route.respond(200, json={"id": board_id, "name": "City"})
+    api.boards.update(board_id=board_id, name="City")
+    assert api.boards.get(board_id=board_id).name == "City"
+    api.boards.list()
+    assert route.call_count == 3
+    assert list_route.call_count == 2
+
+    # not cache endpoint with ttl 0
+    pin_route = respx.get(f"{pin.Api.DEFAULT_API_URL}pins/1").respond(
+        200, json={"id": "1"}
+    )
+    api.pins.get(pin_id="1")
+    api.pins.get(pin_id="1")
+    assert pin_route.call_count == 2
+
+    # errors are not cached
+    error_route = respx.get(f"{pin.Api.DEFAULT_API_URL}boards/2").mock(
+        side_effect=[
+            httpx.Response(500, json={"code": 1, "message": "error"}),
+            httpx.Response(200, json={"id": "2"}),
+        ]
+    )
+    with pytest.raises(pin.PinterestException):
+        api.boards.get(board_id="2")
+    assert api.boards.get(board_id="2").id == "2"
+    assert error_route.call_count == 2
+
+
+def _gzip_response(data, status_code=200, headers=None):
+    return httpx.Response(
+        status_code,
+        content=gzip.compress(json.dumps(data).encode()),
+        headers=dict(
+            {"Content-Type": "application/json", "Content-Encoding": "gzip"},
+            **(headers or {}),
+        ),
+    )
+
+
+@respx.mock
+def test_api_cache_gzip(cache):
+    api = pin.Api(access_token="access token", cache=cache)
+    route = respx.get(f"{pin.Api.DEFAULT_API_URL}user_account").mock(
+        return_value=_gzip_response({"username": "merlin"})
+    )
+    assert api.user_account.get().username == "merlin"
+    # The cached content is decoded already, not gzip anymore.
+    assert api.user_account.get().username == "merlin"
+    assert route.call_count == 1
+
+
+@respx.mock
+def test_conditional_requests_gzip():
+    api = pin.Api(access_token="access token", validator_cache=MemoryCache())
+    route = respx.get(f"{pin.Api.DEFAULT_API_URL}user_account").mock(
+        side_effect=[
+            _gzip_response({"username": "merlin"}, headers={"ETag": '"v1"'}),
+            httpx.Response(304, headers={"ETag": '"v1"'}),
+        ]
+    )
+    assert api.user_account.get().username == "merlin"
+    assert api.user_account.get().username == "merlin"
+    assert route.calls[1].request.headers["If-None-Match"] == '"v1"'
+
+
+@respx.mock
+@pytest.mark.asyncio
+async def test_async_conditional_requests_gzip():
+    api = pin.AsyncApi(access_token="access token", validator_cache=MemoryCache())
+    route = respx.get(f"{pin.Api.DEFAULT_API_URL}user_account").mock(
+        side_effect=[
+            _gzip_response({"username": "merlin"}, headers={"ETag": '"v1"'}),
+            httpx.Response(304, headers={"ETag": '"v1"'}),
+        ]
+    )
+    assert (await api.user_account.get()).username == "merlin"
+    assert (await api.user_account.get()).username == "merlin"
+    assert route.calls[1].request.headers["If-None-Match"] == '"v1"'
+
+
+@respx.mock
+@pytest.mark.asyncio
+async def test_conditional_requests(helpers):
+    api = pin.AsyncApi(access_token="access token", validator_cache=MemoryCache())
+    feed_id = "2680059592705"
+    data = helpers.load_data(
+        "tests/data/catalogs/list_catalogs_feed_process_results_resp.json"
+    )
+    route = respx.get(
+        f"{pin.Api.DEFAULT_API_URL}catalogs/feeds/{feed_id}/processing_results"
+    )
+    route.side_effect = [
+        httpx.Response(200, json=data, headers={"ETag": '"v1"'}),
+        httpx.Response(304, headers={"ETag": '"v1"'}),
+        httpx.Response(200, json={"items": [], "bookmark": None}),
+    ]
+
+    first = await api.catalogs.list_catalogs_feed_processing_results(feed_id=feed_id)
+    assert "If-None-Match" not in route.calls[0].request.headers
+    second = await api.catalogs.list_catalogs_feed_processing_results(feed_id=feed_id)
+    assert route.calls[1].request.headers["If-None-Match"] == '"v1"'
+    assert second == first
+    # changed resource
+    third = await api.catalogs.list_catalogs_feed_processing_results(feed_id=feed_id)
+    assert third.items == []
+    assert route.call_count == 3
+
+
+@respx.mock
+def test_status_polls_skip_cache():
+    api = pin.Api(access_token="access token", cache=MemoryCache())
+    statuses = iter(["registered", "processing", "succeeded"])
+    media_route = respx.get(f"{pin.Api.DEFAULT_API_URL}media/1").mock(
+        side_effect=lambda request: httpx.Response(
+            200,
+            json={"media_id": "1", "media_type": "video", "status": next(statuses)},
+        )
+    )
+    assert api.media.get(media_id="1").status == "registered"
+    # The polls get fresh status, not the cached "registered".
+    assert api.media.wait(media_id="1", poll_interval=0).status == "succeeded"
+    assert media_route.call_count == 3
+    # The fresh response updates the cache.
+    assert api.media.get(media_id="1").status == "succeeded"
+    assert media_route.call_count == 3
+
+    batches = iter(["PROCESSING", "COMPLETED"])
+    batch_route = respx.get(f"{pin.Api.DEFAULT_API_URL}catalogs/items/batch/b").mock(
+        side_effect=lambda request: httpx.Response(
+            200, json={"batch_id": "b", "status": next(batches), "items": []}
+        )
+    )
+    api.catalogs.get_catalogs_items_batch(batch_id="b")
+    batch = api.catalogs.wait_items_batch(batch_id="b", poll_interval=0)
+    assert batch.status == "COMPLETED"
+    assert batch_route.call_count == 2
+
+
+@respx.mock
+def test_poller_skips_cache():
+    api = pin.Api(access_token="access token", cache=MemoryCache())
+    statuses = iter(["processing", "succeeded"])
+    respx.get(f"{pin.Api.DEFAULT_API_URL}media").mock(
+        side_effect=lambda request: httpx.Response(
+            200,
+            json={
+                "items": [
+                    {"media_id": "1", "media_type": "video", "status": next(statuses)}
+                ],
+                "bookmark": None,
+            },
+        )
+    )
+    poller = MediaPoller(api.media, poll_interval=0, max_requests_per_second=1000)
+    future = poller.add("1")
+    assert poller.wait(timeout=5)
+    assert future.result().status == "succeeded"
@@ -0,0 +1,248 @@
+"""
+    Tests for the http client options
+"""
+
+import asyncio
+import datetime
+import functools
+import ipaddress
+import ssl
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from httpx import Limits
+
+import pinterest as pin
+from pinterest.api import DEFAULT_LIMITS, SYNC_HTTP2
+
+
+def _pool(api):
+    return api.client._transport._pool
+
+
+def test_default_client(api, async_api):
+    for client in (api, async_api):
+        pool = _pool(client)
+        assert not pool._http2
+        assert pool._max_connections == DEFAULT_LIMITS.max_connections
+        assert pool._keepalive_expiry == DEFAULT_LIMITS.keepalive_expiry
+
+
+def test_http2_client():
+    pytest.importorskip("h2")
+    api = pin.AsyncApi(
+        access_token="access token",
+        http2=True,
+        limits=Limits(
+            max_connections=10, max_keepalive_connections=5, keepalive_expiry=30
+        ),
+    )
+    pool = _pool(api)
+    assert pool._http2
+    assert pool._max_connections == 10
+    assert pool._max_keepalive_connections == 5
+    assert pool._keepalive_expiry == 30
+
+
+@pytest.mark.skipif(SYNC_HTTP2, reason="Api supports HTTP/2 with httpcore 1.0")
+def test_sync_http2_rejected():
+    with pytest.raises(ValueError):
+        pin.Api(access_token="access token", http2=True)
+    # Limits are still accepted.
+    api = pin.Api(access_token="access token", limits=Limits(max_connections=10))
+    assert _pool(api)._max_connections == 10
+
+
+class _PinHandler(BaseHTTPRequestHandler):
+    """Server for pins.get, which replies after a latency and counts the connections."""
+
+    protocol_version = "HTTP/1.1"
+    lock = threading.Lock()
+    connections = 0
+    active = 0
+    peak = 0
+
+    def setup(self):
+        super().setup()
+        with self.lock:
+            type(self).connections += 1
+
+    def do_GET(self):
+        cls = type(self)
+        with self.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        time.sleep(0.05)
+        with self.lock:
+            cls.active -= 1
+        body = b'{"id": "1"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_limits_concurrent_requests():
+    _PinHandler.connections = _PinHandler.peak = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _PinHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    api = pin.Api(
+        access_token="access token", limits=Limits(max_connections=3), timeout=10
+    )
+    api.DEFAULT_API_URL = f"http://127.0.0.1:{server.server_address[1]}/v5/"
+    try:
+        results = api.bulk(
+            [functools.partial(api.pins.get, pin_id="1") for _ in range(12)],
+            max_workers=6,
+        )
+    finally:
+        api.client.close()
+        server.shutdown()
+        server.server_close()
+    assert [p.id for p in results] == ["1"] * 12
+    # The threads share the pool of the configured client, at most 3 connections.
+    assert _PinHandler.connections <= 3
+    assert 1 < _PinHandler.peak <= 3
+
+
+def _self_signed_cert(tmp_path):
+    """
+    Write a certificate for 127.0.0.1 and its key, return their paths.
+    """
+    x509 = pytest.importorskip("cryptography.x509")
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "127.0.0.1")])
+    now = datetime.datetime.utcnow()
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(
+            x509.SubjectAlternativeName(
+                [x509.IPAddress(ipaddress.ip_address("127.0.0.1"))]
+            ),
+            critical=False,
+        )
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .add_extension(
+            x509.SubjectKeyIdentifier.from_public_key(key.public_key()), critical=False
+        )
+        .add_extension(
+            x509.AuthorityKeyIdentifier.from_issuer_public_key(key.public_key()),
+            critical=False,
+        )
+        .sign(key, hashes.SHA256())
+    )
+    cert_path, key_path = tmp_path / "cert.pem", tmp_path / "key.pem"
+    cert_path.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+    key_path.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    return str(cert_path), str(key_path)
+
+
+class _Http2Server:
+    """HTTP/2 server negotiated by ALPN, which replies after a latency and counts the connections."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.connections = 0
+        self.active = 0
+        self.peak = 0
+        self.tasks = set()
+
+    async def handle(self, reader, writer):
+        import h2.config
+        import h2.connection
+        import h2.events
+
+        self.connections += 1
+        conn = h2.connection.H2Connection(
+            config=h2.config.H2Configuration(client_side=False)
+        )
+        conn.initiate_connection()
+        writer.write(conn.data_to_send())
+
+        async def respond(stream_id):
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            await asyncio.sleep(self.latency)
+            self.active -= 1
+            body = b'{"id": "1"}'
+            conn.send_headers(
+                stream_id,
+                [
+                    (":status", "200"),
+                    ("content-type", "application/json"),
+                    ("content-length", str(len(body))),
+                ],
+            )
+            conn.send_data(stream_id, body, end_stream=True)
+            writer.write(conn.data_to_send())
+
+        try:
+            while True:
+                data = await reader.read(65535)
+                if not data:
+                    break
+                for event in conn.receive_data(data):
+                    if isinstance(event, h2.events.RequestReceived):
+                        task = asyncio.ensure_future(respond(event.stream_id))
+                        self.tasks.add(task)
+                        task.add_done_callback(self.tasks.discard)
+                writer.write(conn.data_to_send())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+@pytest.mark.asyncio
+async def test_http2_concurrent_requests(tmp_path, monkeypatch):
+    pytest.importorskip("h2")
+    cert_path, key_path = _self_signed_cert(tmp_path)
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(cert_path, key_path)
+    context.set_alpn_protocols(["h2"])
+    server = _Http2Server(latency=0.05)
+    tcp_server = await asyncio.start_server(server.handle, "127.0.0.1", 0, ssl=context)
+    port = tcp_server.sockets[0].getsockname()[1]
+    # Trust the certificate of the local server.
+    monkeypatch.setenv("SSL_CERT_FILE", cert_path)
+    api = pin.AsyncApi(
+        access_token="access token",
+        http2=True,
+        limits=Limits(max_connections=10),
+        timeout=10,
+    )
+    api.DEFAULT_API_URL = f"https://127.0.0.1:{port}/v5/"
+    try:
+        pins = await asyncio.gather(*(api.pins.get(pin_id="1") for _ in range(20)))
+    finally:
+        await api.client.aclose()
+        tcp_server.close()
+        await tcp_server.wait_closed()
+    assert [p.id for p in pins] == ["1"] * 20
+    # The concurrent requests are multiplexed on one connection.
+    assert server.connections == 1
+    assert server.peak > 1
@@ -0,0 +1,81 @@
+"""
+    Tests for json codecs
+"""
+
+import glob
+import json
+
+import httpx
+import pytest
+import respx
+
+import pinterest as pin
+from pinterest.api import BaseApi
+from pinterest.codec import JsonCodec, OrjsonCodec, get_codec
+
+
+def test_codecs():
+    codecs = [JsonCodec()]
+    try:
+        codecs.append(OrjsonCodec())
+    except ImportError:
+        pass
+    for filename in glob.glob("tests/data/**/*.json", recursive=True):
+        with open(filename, "rb") as f:
+            content = f.read()
+        for codec in codecs:
+            data = codec.loads(content)
+            assert data == json.loads(content)
+            assert codec.loads(codec.dumps(data)) == data
+
+
+def test_get_codec():
+    assert get_codec("json").name == "json"
+    assert get_codec("auto").name in ("orjson", "msgspec", "json")
+    codec = JsonCodec()
+    assert get_codec(codec) is codec
+    with pytest.raises(ValueError):
+        get_codec("unknown")
+
+
+class CountingCodec(JsonCodec):
+    def __init__(self):
+        self.calls = []
+
+    def loads(self, data):
+        self.calls.append("loads")
+        return super().loads(data)
+
+    def dumps(self, obj):
+        self.calls.append("dumps")
+        return super().dumps(obj)
+
+
+@respx.mock
+def test_api_json_codec():
+    codec = CountingCodec()
+    api = pin.Api(access_token="access token", json_codec=codec)
+    route = respx.post(f"{pin.Api.DEFAULT_API_URL}boards").respond(
+        201, json={"id": "1", "name": "Food"}
+    )
+    board = api.boards.create(name="Food")
+    assert board.id == "1"
+    assert codec.calls == ["dumps", "loads"]
+    request = route.calls[0].request
+    assert request.headers["Content-Type"] == "application/json"
+    assert json.loads(request.content)["name"] == "Food"
+
+
+def test_parse_response():
+    resp = httpx.Response(200, json={"id": "1"})
+    # Static parser for the callers without an api.
+    assert pin.Api.parse_response(resp) == {"id": "1"}
+    assert BaseApi.parse_response(resp) == {"id": "1"}
+    codec = CountingCodec()
+    api = pin.Api(access_token="access token", json_codec=codec)
+    assert api.decode_response(resp) == {"id": "1"}
+    assert codec.calls == ["loads"]
+    with pytest.raises(pin.PinterestException):
+        BaseApi.parse_response(
+            httpx.Response(404, json={"code": 404, "message": "Not found"})
+        )
@@ -0,0 +1,77 @@
+"""
+    Tests for columnar analytics
+"""
+
+import math
+
+import pytest
+
+from pinterest.columns import Columns, rows_columns
+from pinterest.models import Analytics, TopPinsAnalytics
+from pinterest.models.base import MODEL_MODES, get_decoder
+
+
+def test_analytics_columns(helpers):
+    data = helpers.load_data("tests/data/user_account/analytics.json")
+    analytics = Analytics.new_from_json_dict(data)
+    columns = analytics.to_columns()
+    daily_metrics = data["all"]["daily_metrics"]
+    assert len(columns) == len(daily_metrics)
+    assert columns.index == [m["date"] for m in daily_metrics]
+    assert columns["data_status"] == [m["data_status"] for m in daily_metrics]
+    assert columns.sum("IMPRESSION") == sum(
+        m["metrics"].get("IMPRESSION", 0) for m in daily_metrics
+    )
+
+    data = helpers.load_data("tests/data/user_account/top_pins_analytics.json")
+    columns = TopPinsAnalytics.new_from_json_dict(data).to_columns()
+    assert columns.index == [p["pin_id"] for p in data["pins"]]
+    assert columns.sum("IMPRESSION") == sum(
+        p["metrics"]["IMPRESSION"] for p in data["pins"]
+    )
+
+
+@pytest.mark.parametrize("mode", MODEL_MODES)
+def test_analytics_columns_modes(helpers, mode):
+    data = helpers.load_data("tests/data/user_account/analytics.json")
+    expected = Analytics.new_from_json_dict(data).to_columns()
+    columns = get_decoder(Analytics, mode=mode)(data).to_columns()
+    assert columns.index == expected.index
+    assert columns.to_dict() == expected.to_dict()
+
+    data = helpers.load_data("tests/data/user_account/top_pins_analytics.json")
+    expected = TopPinsAnalytics.new_from_json_dict(data).to_columns()
+    columns = get_decoder(TopPinsAnalytics, mode=mode)(data).to_columns()
+    assert columns.index == expected.index
+    assert columns.to_dict() == expected.to_dict()
+
+
+def test_columns_aggregate():
+    rows = [
+        {"DATE": "2022-08-01", "CAMPAIGN_ID": "1", "IMPRESSION": 10, "CLICK": 1},
+        {"DATE": "2022-08-02", "CAMPAIGN_ID": "1", "IMPRESSION": 0},
+        {"DATE": "2022-08-03", "CAMPAIGN_ID": "1", "IMPRESSION": 30, "CLICK": 3},
+    ]
+    columns = rows_columns(rows)
+    assert columns.index == ["2022-08-01", "2022-08-02", "2022-08-03"]
+    assert columns["CAMPAIGN_ID"] == ["1", "1", "1"]
+    assert math.isnan(columns["CLICK"][1])
+    assert columns.sum("CLICK") == 4
+    assert columns.mean("CLICK") == 2
+    ratio = columns.ratio("CLICK", "IMPRESSION")
+    assert ratio[0] == 0.1 and math.isnan(ratio[1])
+    rolling = columns.rolling_sum("IMPRESSION", window=2)
+    assert math.isnan(rolling[0]) and list(rolling[1:]) == [10, 30]
+    assert columns.to_dict()["IMPRESSION"] == [10, 0, 30]
+
+
+def test_columns_export():
+    pd = pytest.importorskip("pandas")
+    columns = Columns.from_rows(
+        [{"date": "2022-08-01", "metrics": {"SAVE": 1}}],
+        index="date",
+        metrics_key="metrics",
+    )
+    df = columns.to_pandas()
+    assert isinstance(df, pd.DataFrame)
+    assert df.loc["2022-08-01", "SAVE"] == 1
@@ -0,0 +1,181 @@
+"""
+    Tests for the pin image downloader
+"""
+
+import os
+import threading
+
+import httpx
+import pytest
+import respx
+
+from pinterest.downloader import (
+    VALIDATOR_SUFFIX,
+    AsyncImageDownloader,
+    ImageDownloader,
+    image_filename,
+    pick_image,
+)
+from pinterest.models import Pin
+from pinterest.retry import RetryPolicy
+
+IMAGES = {
+    "https://i.pinimg.com/originals/aa/a.jpg": b"a" * 1000,
+    "https://i.pinimg.com/originals/bb/b.png": b"b" * 1000,
+}
+ETAG = '"v1"'
+
+
+def _write_part(directory, url, content, validator=ETAG):
+    path = directory / image_filename(url)
+    (directory / (path.name + ".part")).write_bytes(content)
+    if validator:
+        (directory / (path.name + VALIDATOR_SUFFIX)).write_text(validator)
+
+
+def _pin(pin_id, url):
+    return {
+        "id": pin_id,
+        "media": {
+            "media_type": "image",
+            "images": {
+                "150x150": {"width": 150, "height": 150, "url": url + "?150"},
+                "originals": {"width": 1000, "height": 1000, "url": url},
+            },
+        },
+    }
+
+
+def _mock_images(fail_first=()):
+    failed = set()
+
+    def serve(request):
+        url = str(request.url)
+        if url in fail_first and url not in failed:
+            failed.add(url)
+            return httpx.Response(503)
+        content = IMAGES[url]
+        value = request.headers.get("Range")
+        if not value or request.headers.get("If-Range") != ETAG:
+            return httpx.Response(200, content=content, headers={"ETag": ETAG})
+        start = int(value[len("bytes=") :].rstrip("-"))
+        if start >= len(content):
+            return httpx.Response(
+                416, headers={"Content-Range": f"bytes */{len(content)}"}
+            )
+        return httpx.Response(
+            206,
+            content=content[start:],
+            headers={
+                "Content-Range": f"bytes {start}-{len(content) - 1}/{len(content)}"
+            },
+        )
+
+    return respx.get(url__startswith="https://i.pinimg.com/").mock(side_effect=serve)
+
+
+def test_pick_image():
+    images = Pin.from_dict(_pin("1", "https://i.pinimg.com/x.jpg")).media.images
+    assert pick_image(images) == "https://i.pinimg.com/x.jpg"
+    assert pick_image(images, sizes=["150x150"]) == "https://i.pinimg.com/x.jpg?150"
+    # The widest image if no preferred size.
+    assert pick_image(images, sizes=["600x"]) == "https://i.pinimg.com/x.jpg"
+    assert pick_image({}) is None
+
+
+@respx.mock
+def test_download(api, tmp_path):
+    route = _mock_images()
+    a, b = IMAGES
+    pins = [_pin("1", a), _pin("2", b), _pin("3", a), {"id": "4", "media": {}}]
+    pins[0] = Pin.from_dict(pins[0])
+    # The second image was interrupted in a previous run.
+    _write_part(tmp_path, b, IMAGES[b][:300])
+
+    done = []
+    results = ImageDownloader(api, tmp_path, max_connections=2).download(
+        pins, callback=done.append
+    )
+    assert len(results) == len(done) == 2
+    by_url = {item.url: item for item in results}
+    assert by_url[a].pin_ids == ["1", "3"]
+    assert by_url[a].status == "downloaded"
+    assert by_url[b].status == "resumed"
+    assert by_url[b].received == 700
+    assert [c.request.headers.get("Range") for c in route.calls].count(
+        "bytes=300-"
+    ) == 1
+    for url, content in IMAGES.items():
+        assert (tmp_path / image_filename(url)).read_bytes() == content
+    assert not list(tmp_path.glob("*.part*"))
+
+    # Downloaded files are skipped.
+    results = ImageDownloader(api, tmp_path).download(pins)
+    assert {item.status for item in results} == {"skipped"}
+    assert route.call_count == 2
+
+
+@respx.mock
+def test_download_retry(api, tmp_path):
+    a, b = IMAGES
+    respx.get("https://i.pinimg.com/missing.jpg").respond(404)
+    route = _mock_images(fail_first=(a,))
+    # The ".part" file is complete, only the rename was interrupted.
+    _write_part(tmp_path, b, IMAGES[b])
+
+    downloader = ImageDownloader(
+        api, tmp_path, retry_policy=RetryPolicy(backoff_factor=0)
+    )
+    results = downloader.download(
+        [_pin("1", a), _pin("2", b), _pin("3", "https://i.pinimg.com/missing.jpg")]
+    )
+    by_url = {item.url: item for item in results}
+    assert by_url[a].ok
+    assert by_url[b].status == "resumed"
+    assert (tmp_path / image_filename(b)).read_bytes() == IMAGES[b]
+    missing = by_url["https://i.pinimg.com/missing.jpg"]
+    assert not missing.ok
+    assert missing.error.code == 404
+    assert route.call_count == 3
+
+
+@respx.mock
+def test_download_changed_image(api, tmp_path):
+    route = _mock_images()
+    a, b = IMAGES
+    # The image has changed since the ".part" file, or its validator is unknown.
+    _write_part(tmp_path, a, b"x" * 300, validator='"v0"')
+    _write_part(tmp_path, b, b"x" * 300, validator=None)
+    results = ImageDownloader(api, tmp_path).download([_pin("1", a), _pin("2", b)])
+    assert {item.status for item in results} == {"downloaded"}
+    for url, content in IMAGES.items():
+        assert (tmp_path / image_filename(url)).read_bytes() == content
+    headers = {str(c.request.url): c.request.headers for c in route.calls}
+    assert headers[a]["If-Range"] == '"v0"'
+    assert "Range" not in headers[b]
+    assert not list(tmp_path.glob("*.part*"))
+
+
+@respx.mock
+@pytest.mark.asyncio
+async def test_async_download(async_api, tmp_path, monkeypatch):
+    _mock_images()
+    a, b = IMAGES
+    threads = set()
+    replace = os.replace
+
+    def record_replace(*args):
+        threads.add(threading.current_thread())
+        return replace(*args)
+
+    monkeypatch.setattr(os, "replace", record_replace)
+    # A ".part" file longer than the image is dropped and downloaded again.
+    _write_part(tmp_path, a, b"x" * 2000)
+    results = await AsyncImageDownloader(async_api, tmp_path).download(
+        [_pin("1", a), _pin("2", b)]
+    )
+    assert all(item.ok for item in results)
+    for url, content in IMAGES.items():
+        assert (tmp_path / image_filename(url)).read_bytes() == content
+    # The ".part" files are renamed in the executor, not in the thread of the event loop.
+    assert threads and threading.current_thread() not in threads
@@ -0,0 +1,148 @@
+"""
+    Tests for streaming json responses
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+import respx
+
+import pinterest as pin
+from pinterest.models import CatalogItem, DailyMetric
+from pinterest.utils.json_stream import JsonArrayParser
+
+
+def parse(content: bytes, path, size):
+    parser = JsonArrayParser(path=path)
+    items = []
+    for i in range(0, len(content), size):
+        items.extend(parser.feed(content[i : i + size]))
+    items.extend(parser.close())
+    return items
+
+
+def test_json_array_parser(helpers):
+    data = helpers.load_data("tests/data/pins/pin_analytics.json")
+    rows = [{"id": "1"}, 2, -3.5e-3, "é\U0001F600", None, True, [1, [2]]]
+    docs = [
+        (data, ["all", "daily_metrics"], data["all"]["daily_metrics"]),
+        (rows, [], rows),
+        ({"bookmark": "b", "x": {"items": [9]}, "items": [1, 22]}, ["items"], [1, 22]),
+        ({"items": None}, ["items"], []),
+        ({"other": 1.25}, ["items"], []),
+        # Brackets and escaped quotes in the strings of skipped values and items.
+        (
+            {"x": ['a\\"]}', {"y": "[{"}], "items": ['"]', {"z": "}\\"}]},
+            ["items"],
+            ['"]', {"z": "}\\"}],
+        ),
+    ]
+    for doc, path, expected in docs:
+        for indent in (None, 2):
+            content = json.dumps(doc, ensure_ascii=False, indent=indent).encode()
+            for size in (1, 3, 7, 1024):
+                assert parse(content, path, size) == expected
+
+    with pytest.raises(pin.PinterestException):
+        parse(b'{"items": [1, 2', ["items"], 1024)
+    with pytest.raises(pin.PinterestException):
+        parse(b'{"items": {}}', ["items"], 1024)
+
+
+@respx.mock
+def test_stream_catalogs_items(api, helpers):
+    content = json.dumps(
+        helpers.load_data("tests/data/catalogs/get_catalog_items_resp.json")
+    ).encode()
+    route = respx.get(f"{pin.Api.DEFAULT_API_URL}catalogs/items").mock(
+        return_value=httpx.Response(
+            200, content=(content[i : i + 16] for i in range(0, len(content), 16))
+        )
+    )
+    items = list(
+        api.catalogs.stream_catalogs_items(
+            country="US", item_ids=["DS0294-M"], language="EN"
+        )
+    )
+    assert route.called
+    assert len(items) == 1
+    assert isinstance(items[0], CatalogItem)
+    assert items[0].item_id == "DS0294-M"
+
+    route.respond(400, json={"code": 1, "message": "Invalid parameters"})
+    with pytest.raises(pin.PinterestException):
+        list(
+            api.catalogs.stream_catalogs_items(
+                country="US", item_ids=["DS0294-M"], language="EN"
+            )
+        )
+
+
+@respx.mock
+@pytest.mark.asyncio
+async def test_async_stream(async_api, helpers):
+    respx.get(f"{pin.Api.DEFAULT_API_URL}user_account/analytics").respond(
+        200, json=helpers.load_data("tests/data/user_account/analytics.json")
+    )
+    metrics = [
+        m
+        async for m in async_api.user_account.stream_daily_metrics(
+            start_date="2022-08-01", end_date="2022-08-10"
+        )
+    ]
+    assert metrics and all(isinstance(m, DailyMetric) for m in metrics)
+
+    respx.get(
+        f"{pin.Api.DEFAULT_API_URL}ad_accounts/549755885175/campaigns/analytics"
+    ).respond(200, json=[{"CAMPAIGN_ID": "1", "SPEND_IN_DOLLAR": 1.5}])
+    rows = [
+        r
+        async for r in async_api.ad_accounts.stream_campaign_analytics(
+            ad_account_id="549755885175",
+            campaign_ids=["1"],
+            start_date="2022-08-01",
+            end_date="2022-08-10",
+            columns=["SPEND_IN_DOLLAR"],
+            granularity="HOUR",
+        )
+    ]
+    assert rows == [{"CAMPAIGN_ID": "1", "SPEND_IN_DOLLAR": 1.5}]
+
+
+@respx.mock
+def test_stream_releases_in_flight(helpers):
+    api = pin.Api(access_token="access token", max_in_flight=1)
+    respx.get(f"{pin.Api.DEFAULT_API_URL}user_account/analytics").respond(
+        200, json=helpers.load_data("tests/data/user_account/analytics.json")
+    )
+    pin_route = respx.get(f"{pin.Api.DEFAULT_API_URL}pins/1").respond(
+        200, json={"id": "1"}
+    )
+    # Other requests can be sent while the stream is being iterated.
+    for _ in api.user_account.stream_daily_metrics(
+        start_date="2022-08-01", end_date="2022-08-10"
+    ):
+        assert api.pins.get(pin_id="1").id == "1"
+    assert pin_route.called
+    assert api.in_flight.acquire(blocking=False)
+
+
+@respx.mock
+@pytest.mark.asyncio
+async def test_async_stream_releases_in_flight(helpers):
+    async_api = pin.AsyncApi(access_token="access token", max_in_flight=1)
+    respx.get(f"{pin.Api.DEFAULT_API_URL}user_account/analytics").respond(
+        200, json=helpers.load_data("tests/data/user_account/analytics.json")
+    )
+    pin_route = respx.get(f"{pin.Api.DEFAULT_API_URL}pins/1").respond(
+        200, json={"id": "1"}
+    )
+    async for _ in async_api.user_account.stream_daily_metrics(
+        start_date="2022-08-01", end_date="2022-08-10"
+    ):
+        pin_item = await asyncio.wait_for(async_api.pins.get(pin_id="1"), 5)
+        assert pin_item.id == "1"
+    assert pin_route.called
+    assert not async_api.in_flight.locked()
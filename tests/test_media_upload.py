@@ -0,0 +1,273 @@
+"""
+    Tests for the media upload pipeline
+"""
+
+import io
+import json
+import threading
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+import respx
+
+import pinterest as pin
+from pinterest.models import RegisterMediaUploadResponse
+from pinterest.retry import RetryPolicy
+from pinterest.utils.media import UploadBody
+
+
+class UploadHandler(BaseHTTPRequestHandler):
+    """Stand-in for the upload url, keeps the bodies of the uploads."""
+
+    uploads = []
+    # Status codes for the first uploads, before the successful ones.
+    failures = []
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        if self.failures:
+            self.send_response(self.failures.pop(0))
+            self.end_headers()
+            return
+        self.uploads.append(body)
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def upload_server():
+    UploadHandler.uploads = []
+    UploadHandler.failures = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), UploadHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/", UploadHandler.uploads
+    server.shutdown()
+    server.server_close()
+
+
+def _mock_media_api(upload_url, failed_ids=()):
+    registered, created = [], []
+
+    def register(request):
+        media_id = str(len(registered) + 1)
+        registered.append(media_id)
+        return httpx.Response(
+            201,
+            json={
+                "media_id": media_id,
+                "media_type": "video",
+                "upload_url": upload_url,
+                "upload_parameters": {"key": f"uploads/{media_id}", "policy": "xxx"},
+            },
+        )
+
+    polls = {}
+
+    def get_media(request):
+        media_id = request.url.path.rsplit("/", 1)[-1]
+        polls[media_id] = polls.get(media_id, 0) + 1
+        if polls[media_id] < 2:
+            status = "processing"
+        else:
+            status = "failed" if media_id in failed_ids else "succeeded"
+        return httpx.Response(
+            200, json={"media_id": media_id, "media_type": "video", "status": status}
+        )
+
+    def create_pin(request):
+        created.append(json.loads(request.content))
+        return httpx.Response(201, json={"id": str(len(created)), "board_id": "board"})
+
+    respx.post(f"{pin.Api.DEFAULT_API_URL}media").mock(side_effect=register)
+    respx.get(url__regex=rf"{pin.Api.DEFAULT_API_URL}media/\d+").mock(
+        side_effect=get_media
+    )
+    respx.post(f"{pin.Api.DEFAULT_API_URL}pins").mock(side_effect=create_pin)
+    return created
+
+
+@respx.mock
+def test_get_media(api):
+    route = respx.get(f"{pin.Api.DEFAULT_API_URL}media/12345").respond(
+        200, json={"media_id": "12345", "media_type": "video", "status": "succeeded"}
+    )
+    media = api.media.get(media_id="12345")
+    assert route.called
+    assert media.status == "succeeded"
+
+
+@respx.mock
+def test_create_video_pins(api, upload_server, tmp_path):
+    upload_url, uploads = upload_server
+    respx.route(host="127.0.0.1").pass_through()
+    created = _mock_media_api(upload_url, failed_ids=("3",))
+
+    files = []
+    for i in range(3):
+        path = tmp_path / f"video-{i}.mp4"
+        path.write_bytes(b"video %d " % i * 1000)
+        files.append(path)
+
+    done = []
+    results = api.pins.create_video_pins(
+        (
+            {
+                "file": path,
+                "board_id": "board",
+                "title": path.name,
+                "cover_image_key_frame_time": 1,
+            }
+            for path in files
+        ),
+        concurrency=2,
+        poll_interval=0,
+        callback=done.append,
+    )
+    assert len(done) == len(results) == 3
+    assert len(uploads) == 3
+    assert all(b"uploads/" in body and b"video " in body for body in uploads)
+
+    ok = [r for r in results if r.ok]
+    assert len(ok) == 2
+    assert ok[0].pin.board_id == "board"
+    assert len(created) == 2
+    assert created[0]["title"].startswith("video-")
+    assert created[0]["media_source"]["source_type"] == "video_id"
+    assert created[0]["media_source"]["cover_image_key_frame_time"] == 1
+    failed = [r for r in results if not r.ok]
+    assert failed[0].status == "failed"
+    assert isinstance(failed[0].error, pin.PinterestException)
+
+
+@respx.mock
+@pytest.mark.asyncio
+async def test_async_create_video_pins(async_api):
+    upload_url = "https://pinterest-media-upload.s3-accelerate.amazonaws.com/"
+    upload = respx.post(upload_url).respond(204)
+    created = _mock_media_api(upload_url)
+    results = await async_api.pins.create_video_pins(
+        [{"file": io.BytesIO(b"video"), "board_id": "board"}], poll_interval=0
+    )
+    assert upload.called
+    assert b'name="key"' in upload.calls.last.request.content
+    assert results[0].ok
+    assert created[0]["media_source"]["media_id"] == "1"
+
+
+def _registered(upload_url):
+    return RegisterMediaUploadResponse.from_dict(
+        {
+            "media_id": "1",
+            "media_type": "video",
+            "upload_url": upload_url,
+            "upload_parameters": {"key": "uploads/1"},
+        }
+    )
+
+
+def test_upload_body(tmp_path):
+    path = tmp_path / "video.mp4"
+    path.write_bytes(b"0123456789" * 1000)
+    sent = []
+    with open(path, "rb") as f:
+        body = UploadBody(
+            {"key": "uploads/1"},
+            f,
+            filename="video.mp4",
+            chunk_size=4096,
+            progress=lambda done, total: sent.append((done, total)),
+        )
+        chunks = list(body)
+        assert max(len(c) for c in chunks[1:-1]) == 4096
+        assert sent[-1] == (10000, 10000)
+        content = b"".join(chunks)
+        assert int(body.headers["Content-Length"]) == len(content)
+        assert b'filename="video.mp4"' in content
+        assert path.read_bytes() in content
+        # The body can be sent again.
+        assert b"".join(body) == content
+
+    body = UploadBody({}, b"abcdef", chunk_size=4)
+    assert list(body)[1:-1] == [b"abcd", b"ef"]
+
+
+@pytest.mark.asyncio
+async def test_upload_body_async_read():
+    class File(io.BytesIO):
+        def read(self, size=-1):
+            threads.add(threading.current_thread())
+            return super().read(size)
+
+    threads = set()
+    sent = []
+    body = UploadBody(
+        {},
+        File(b"0123456789" * 100),
+        chunk_size=256,
+        progress=lambda done, total: sent.append((done, total)),
+    )
+    content = b"".join([chunk async for chunk in body.aiter_chunks()])
+    # The file is read in the executor, not in the thread of the event loop.
+    assert threads and threading.current_thread() not in threads
+    assert content == b"".join(body)
+    assert sent[-1] == (1000, 1000)
+
+
+def test_upload_body_memory(tmp_path):
+    path = tmp_path / "video.mp4"
+    with open(path, "wb") as f:
+        f.truncate(32 * 1024 * 1024)
+    with open(path, "rb") as f:
+        body = UploadBody({}, f, chunk_size=64 * 1024)
+        tracemalloc.start()
+        try:
+            size = sum(len(chunk) for chunk in body)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    assert size == body.size + len(body.head) + len(body.tail)
+    assert peak < 1024 * 1024
+
+
+@respx.mock
+def test_upload_retry(api, upload_server, tmp_path):
+    upload_url, uploads = upload_server
+    UploadHandler.failures = [503]
+    respx.route(host="127.0.0.1").pass_through()
+    path = tmp_path / "video.mp4"
+    path.write_bytes(b"video " * 10000)
+    sent = []
+    api.media.upload(
+        _registered(upload_url),
+        path,
+        chunk_size=8192,
+        progress=lambda done, total: sent.append(done),
+        retry_policy=RetryPolicy(backoff_factor=0, idempotent_methods=()),
+    )
+    assert not UploadHandler.failures
+    assert len(uploads) == 1
+    assert path.read_bytes() in uploads[0]
+    # Progress restarts for the retry.
+    assert sent.count(8192) == 2
+
+
+@respx.mock
+@pytest.mark.asyncio
+async def test_async_upload_failed(async_api):
+    upload_url = "https://pinterest-media-upload.s3-accelerate.amazonaws.com/"
+    upload = respx.post(upload_url).respond(403, text="AccessDenied")
+    with pytest.raises(pin.PinterestException):
+        await async_api.media.upload(
+            _registered(upload_url),
+            io.BytesIO(b"video"),
+            retry_policy=RetryPolicy(backoff_factor=0),
+        )
+    # Client errors are not retried.
+    assert upload.call_count == 1
@@ -0,0 +1,143 @@
+"""
+    Tests for models
+"""
+
+import glob
+import inspect
+import json
+import pickle
+import warnings
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import pytest
+import respx
+
+import pinterest as pin
+import pinterest.models as models
+from pinterest.models import CatalogItemAttributes, Media, Pin, PinsResponse
+from pinterest.models.base import MODEL_MODES, BaseModel, get_decoder
+from pinterest.models.compact import CompactModel
+
+
+def test_decoder_same_as_from_dict(helpers):
+    classes = [
+        c
+        for c in vars(models).values()
+        if inspect.isclass(c) and issubclass(c, BaseModel) and c is not BaseModel
+    ]
+    for filename in glob.glob("tests/data/**/*.json", recursive=True):
+        data = helpers.load_data(filename)
+        for cls in classes:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                try:
+                    expected = cls.from_dict(data)
+                except Exception:
+                    continue
+            assert get_decoder(cls)(data) == expected, (cls, filename)
+
+
+def test_decoder(helpers):
+    pin_data = helpers.load_data("tests/data/pins/pin_data.json")
+    page = PinsResponse.new_from_json_dict({"items": [pin_data], "bookmark": None})
+    assert isinstance(page.items[0], Pin)
+    assert isinstance(page.items[0].media, Media)
+    assert page.items[0] == Pin.from_dict(pin_data)
+
+    # values are converted to the annotated types like from_dict
+    data = {"gtin": 1.5, "adult": "true", "image_link": [1], "unknown": "x"}
+    attributes = CatalogItemAttributes.new_from_json_dict(data)
+    assert attributes == CatalogItemAttributes.from_dict(data)
+    assert attributes.gtin == 1
+    assert attributes.image_link == ["1"]
+
+
+def test_compact_models(helpers):
+    pin_data = helpers.load_data("tests/data/pins/pin_data.json")
+    page = PinsResponse.new_from_json_dict(
+        {"items": [pin_data], "bookmark": None}, mode="compact"
+    )
+    p = page.items[0]
+    assert isinstance(p, CompactModel) and isinstance(p, Pin)
+    assert "id" in type(p).__slots__
+    assert isinstance(p.media, CompactModel) and p.media.model is Media
+    assert p.id == pin_data["id"]
+    assert p.to_model() == Pin.from_dict(pin_data)
+    assert pickle.loads(pickle.dumps(p)) == p
+    assert repr(p).startswith("Pin(id=")
+    # Methods of the model work on the compact model.
+    assert p.to_dict() == Pin.from_dict(pin_data).to_dict()
+    assert json.loads(p.to_json())["media"] == p.media.to_dict()
+
+
+@respx.mock
+def test_api_model_mode(helpers):
+    api = pin.Api(access_token="access token", model_mode="compact")
+    pin_data = helpers.load_data("tests/data/pins/pin_data.json")
+    respx.get(f"{pin.Api.DEFAULT_API_URL}pins/{pin_data['id']}").respond(
+        200, json=pin_data
+    )
+    p = api.pins.get(pin_id=pin_data["id"])
+    assert isinstance(p, CompactModel)
+    assert p.to_dict()["id"] == pin_data["id"]
+
+    with pytest.raises(ValueError):
+        pin.Api(access_token="access token", model_mode="unknown")
+
+
+def test_keep_raw():
+    first = Pin.new_from_json_dict({"id": "1"})
+    assert first.raw_json is None
+    assert "_json" not in vars(Pin)
+
+    for mode in ("dataclass", "compact"):
+        first = Pin.new_from_json_dict({"id": "1"}, mode=mode, keep_raw=True)
+        second = Pin.new_from_json_dict({"id": "2"}, mode=mode, keep_raw=True)
+        assert first.raw_json == {"id": "1"}
+        assert second.raw_json == {"id": "2"}
+
+
+@respx.mock
+def test_api_keep_raw(helpers):
+    api = pin.Api(access_token="access token", keep_raw=True)
+    pin_data = helpers.load_data("tests/data/pins/pin_data.json")
+    respx.get(f"{pin.Api.DEFAULT_API_URL}pins/{pin_data['id']}").respond(
+        200, json=pin_data
+    )
+    p = api.pins.get(pin_id=pin_data["id"])
+    assert p.raw_json == pin_data
+    assert p.media.raw_json is None
+
+
+def test_lazy_models(helpers):
+    pin_data = helpers.load_data("tests/data/pins/pin_data.json")
+    page = PinsResponse.new_from_json_dict(
+        {"items": [pin_data, {"id": "2"}], "bookmark": None}, mode="lazy"
+    )
+    p = page.items[0]
+    assert isinstance(p, Pin)
+    assert p.id == pin_data["id"]
+    assert "media" not in vars(p)
+    assert isinstance(p.media, Media)
+    assert "media" in vars(p)
+    assert p == Pin.from_dict(pin_data)
+    assert pickle.loads(pickle.dumps(p)) == p
+    assert page.items[1].media is None
+
+
+@dataclass
+class RequiredModel(BaseModel):
+    name: str
+    tags: List[str] = field(default_factory=list)
+    media: Optional[Media] = None
+
+
+def test_lazy_model_defaults():
+    for mode in MODEL_MODES:
+        # Missing required field raises when decoding, the same for all the modes.
+        with pytest.raises(TypeError):
+            RequiredModel.new_from_json_dict({"tags": ["a"]}, mode=mode)
+        obj = RequiredModel.new_from_json_dict({"name": "a"}, mode=mode)
+        assert obj.tags == []
+        assert obj.media is None
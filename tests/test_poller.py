@@ -0,0 +1,178 @@
+"""
+    Tests for the batched media status poller
+"""
+
+import asyncio
+
+import httpx
+import pytest
+import respx
+
+import pinterest as pin
+from pinterest.poller import AsyncMediaPoller, MediaPoller
+
+
+def _mock_media(statuses):
+    """
+    Mock media.list with the media in statuses, and media.get for any media.
+    Status for a media is taken from the list of statuses, one for each round.
+    """
+    rounds = {"list": 0}
+
+    def status_of(media_id):
+        values = statuses[media_id]
+        return values[min(rounds["list"] - 1, len(values) - 1)]
+
+    def list_media(request):
+        rounds["list"] += 1
+        items = [
+            {"media_id": media_id, "media_type": "video", "status": status_of(media_id)}
+            for media_id in statuses
+            if media_id != "hidden"
+        ]
+        return httpx.Response(200, json={"items": items, "bookmark": None})
+
+    def get_media(request):
+        media_id = request.url.path.rsplit("/", 1)[-1]
+        return httpx.Response(
+            200,
+            json={"media_id": media_id, "media_type": "video", "status": "succeeded"},
+        )
+
+    list_route = respx.get(f"{pin.Api.DEFAULT_API_URL}media").mock(
+        side_effect=list_media
+    )
+    get_route = respx.get(url__regex=rf"{pin.Api.DEFAULT_API_URL}media/.+").mock(
+        side_effect=get_media
+    )
+    return list_route, get_route
+
+
+@respx.mock
+def test_poll(api):
+    list_route, get_route = _mock_media(
+        {
+            "1": ["succeeded"],
+            "2": ["processing", "failed"],
+            "3": ["succeeded"],
+            "hidden": ["succeeded"],
+        }
+    )
+    poller = MediaPoller(api.media, poll_interval=0, max_requests_per_second=1000)
+    done = []
+    futures = {
+        media_id: poller.add(media_id, callback=done.append)
+        for media_id in ("1", "2", "hidden")
+    }
+    assert poller.poll() == 2
+    assert list_route.call_count == 1
+    # Only the media not found in the list is requested by id.
+    assert get_route.call_count == 1
+    assert poller.pending == {"2"}
+    assert futures["1"].result().status == "succeeded"
+    assert futures["hidden"].result().status == "succeeded"
+
+    assert poller.wait(timeout=5)
+    assert futures["2"].result().status == "failed"
+    assert sorted(m.media_id for m in done) == ["1", "2", "hidden"]
+    assert get_route.call_count == 1
+
+
+@respx.mock
+def test_poll_background(api):
+    _mock_media({"1": ["processing", "processing", "succeeded"]})
+    with MediaPoller(
+        api.media, poll_interval=0.01, max_requests_per_second=1000
+    ) as poller:
+        future = poller.add("1")
+        assert future.result(timeout=5).status == "succeeded"
+        assert poller.wait(timeout=5)
+    assert not poller.running
+
+
+@respx.mock
+def test_poll_failed_get(api):
+    respx.get(f"{pin.Api.DEFAULT_API_URL}media").respond(
+        200, json={"items": [], "bookmark": None}
+    )
+    respx.get(f"{pin.Api.DEFAULT_API_URL}media/404").respond(
+        404, json={"code": 404, "message": "Media upload not found"}
+    )
+    poller = MediaPoller(api.media, max_requests_per_second=1000)
+    future = poller.add("404")
+    poller.poll()
+    assert isinstance(future.exception(), pin.PinterestException)
+    assert len(poller) == 0
+
+
+def test_poll_cancelled_callback(api, caplog):
+    poller = MediaPoller(api.media)
+    done = []
+    future = poller.add("1", callback=done.append)
+    assert poller.interval.next() == poller.interval.initial
+    future.cancel()
+    assert not done
+    assert not caplog.records
+
+
+@respx.mock
+def test_async_poller_outside_loop(async_api):
+    # Created before the event loop runs, like at the import of a module.
+    poller = AsyncMediaPoller(
+        async_api.media, poll_interval=0.01, max_requests_per_second=1000
+    )
+    _mock_media({"1": ["processing", "succeeded"]})
+
+    async def run():
+        async with poller:
+            future = poller.add("1")
+            return (await asyncio.wait_for(future, 5)).status
+
+    assert asyncio.run(run()) == "succeeded"
+    assert not poller.running
+
+
+@respx.mock
+@pytest.mark.asyncio
+async def test_async_poll(async_api):
+    list_route, get_route = _mock_media(
+        {"1": ["processing", "succeeded"], "2": ["succeeded"]}
+    )
+    poller = AsyncMediaPoller(
+        async_api.media, poll_interval=0, max_requests_per_second=1000
+    )
+    first, second = poller.add("1"), poller.add("2")
+    assert await poller.wait(timeout=5)
+    assert (await first).status == "succeeded"
+    assert (await second).status == "succeeded"
+    assert list_route.call_count == 2
+    assert not get_route.called
+
+
+@respx.mock
+@pytest.mark.asyncio
+async def test_async_create_video_pins_with_poller(async_api):
+    upload_url = "https://pinterest-media-upload.s3-accelerate.amazonaws.com/"
+    respx.post(upload_url).respond(204)
+    respx.post(f"{pin.Api.DEFAULT_API_URL}media").respond(
+        201,
+        json={
+            "media_id": "1",
+            "media_type": "video",
+            "upload_url": upload_url,
+            "upload_parameters": {"key": "uploads/1"},
+        },
+    )
+    respx.post(f"{pin.Api.DEFAULT_API_URL}pins").respond(201, json={"id": "pin"})
+    list_route, get_route = _mock_media({"1": ["processing", "succeeded"]})
+    poller = AsyncMediaPoller(
+        async_api.media, poll_interval=0.01, max_requests_per_second=1000
+    )
+    results = await async_api.pins.create_video_pins(
+        [{"file": b"video", "board_id": "board"}], poller=poller, timeout=5
+    )
+    assert results[0].ok, results[0].error
+    assert results[0].pin.id == "pin"
+    assert list_route.called
+    assert not get_route.called
+    assert not poller.running
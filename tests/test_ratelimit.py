@@ -0,0 +1,102 @@
+"""
+    Tests for rate limiters
+"""
+
+import httpx
+import pytest
+import respx
+
+import pinterest as pin
+from pinterest.ratelimit import (
+    TokenBucketRateLimiter,
+    endpoint_category,
+    parse_rate_limit_header,
+)
+
+
+def test_endpoint_category():
+    assert endpoint_category("GET", "boards/123/pins") == "org_read"
+    assert endpoint_category("POST", "pins") == "org_write"
+    assert endpoint_category("GET", "pins/123/analytics") == "org_analytics"
+    assert endpoint_category("GET", "ad_accounts/1/campaigns") == "ads_read"
+    assert endpoint_category("GET", "ad_accounts/1/ads/analytics") == "ads_analytics"
+    assert endpoint_category("POST", "catalogs/items/batch") == "catalogs_write"
+
+
+def test_parse_rate_limit_header():
+    assert parse_rate_limit_header("1000") == 1000
+    assert parse_rate_limit_header("100, 100;w=60") == 100
+    assert parse_rate_limit_header(None) is None
+    assert parse_rate_limit_header("unknown") is None
+
+
+def test_token_bucket():
+    limiter = TokenBucketRateLimiter(rate=10, capacity=2)
+    key = ("token", "org_read")
+    assert limiter.acquire(key) == 0
+    assert limiter.acquire(key) == 0
+    assert limiter.acquire(key) == pytest.approx(0.1, abs=0.01)
+    assert limiter.acquire(key) == pytest.approx(0.2, abs=0.01)
+    # other token or category has its own bucket.
+    assert limiter.acquire(("other token", "org_read")) == 0
+
+    limiter = TokenBucketRateLimiter(rate=10, category_rates={"org_analytics": 1})
+    analytics = ("token", "org_analytics")
+    assert limiter.acquire(analytics) == 0
+    assert limiter.acquire(analytics) == pytest.approx(1, abs=0.01)
+
+
+def test_token_bucket_adapt_headers():
+    limiter = TokenBucketRateLimiter(rate=100, capacity=100)
+    key = ("token", "org_read")
+    limiter.acquire(key)
+
+    resp = httpx.Response(
+        200, headers={"X-RateLimit-Remaining": "10", "X-RateLimit-Reset": "5"}
+    )
+    limiter.update(key, resp)
+    bucket = limiter._buckets[key]
+    assert bucket.tokens == 10
+    assert bucket.rate == pytest.approx(2)
+
+    limiter.update(key, httpx.Response(429, headers={"Retry-After": "3"}))
+    assert limiter.acquire(key) == pytest.approx(3, abs=0.01)
+
+
+def test_token_bucket_spread_after_block():
+    limiter = TokenBucketRateLimiter(rate=10, capacity=10)
+    key = ("token", "org_read")
+    limiter.update(key, httpx.Response(429, headers={"Retry-After": "2"}))
+    delays = [limiter.acquire(key) for _ in range(5)]
+    # The callers queued during the block go one by one at the rate after it, not all at once.
+    assert delays == pytest.approx([2, 2.1, 2.2, 2.3, 2.4], abs=0.01)
+    # A later response during the block doesn't reset the queue.
+    limiter.update(
+        key,
+        httpx.Response(429, headers={"Retry-After": "1", "X-RateLimit-Remaining": "0"}),
+    )
+    assert limiter.acquire(key) == pytest.approx(2.5, abs=0.01)
+
+
+@respx.mock
+def test_api_rate_limiter(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("pinterest.api.time.sleep", sleeps.append)
+    api = pin.Api(
+        access_token="access token",
+        rate_limiter=TokenBucketRateLimiter(rate=1, capacity=1),
+    )
+    respx.get(f"{pin.Api.DEFAULT_API_URL}user_account").respond(
+        200,
+        json={"username": "merleliukun"},
+        headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "30"},
+    )
+
+    api.user_account.get()
+    assert sleeps == []
+    api.user_account.get()
+    assert sleeps[0] == pytest.approx(30, abs=0.1)
+    # other category is not blocked.
+    respx.post(f"{pin.Api.DEFAULT_API_URL}boards").respond(200, json={"id": "1"})
+    api.boards.create(name="Food")
+    assert len(sleeps) == 1
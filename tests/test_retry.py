@@ -0,0 +1,111 @@
+"""
+    Tests for retry policy
+"""
+
+import httpx
+import pytest
+import respx
+
+import pinterest as pin
+from pinterest.retry import RetryPolicy, parse_retry_after
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("pinterest.api.time.sleep", sleeps.append)
+    return sleeps
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert parse_retry_after("unknown") is None
+    assert parse_retry_after(None) is None
+
+
+def test_retry_delay():
+    policy = RetryPolicy(backoff_factor=1, max_backoff=5, jitter=False)
+    assert [policy.get_delay(attempt) for attempt in range(1, 5)] == [1, 2, 4, 5]
+    policy = RetryPolicy(backoff_factor=1, jitter=True)
+    assert 0 <= policy.get_delay(attempt=3) <= 4
+    resp = httpx.Response(429, headers={"Retry-After": "7"})
+    assert policy.get_delay(attempt=1, response=resp) == 7
+
+
+@respx.mock
+def test_api_retry(no_sleep):
+    events = []
+    api = pin.Api(
+        access_token="access token",
+        retry_policy=RetryPolicy(max_attempts=3, jitter=False, on_retry=events.append),
+    )
+    route = respx.get(f"{pin.Api.DEFAULT_API_URL}user_account")
+    route.side_effect = [
+        httpx.ConnectError("connection reset"),
+        httpx.Response(503, json={"code": 1, "message": "unavailable"}),
+        httpx.Response(200, json={"username": "merleliukun"}),
+    ]
+
+    user = api.user_account.get()
+    assert user.username == "merleliukun"
+    assert route.call_count == 3
+    assert [e.attempt for e in events] == [1, 2]
+    assert isinstance(events[0].error, httpx.ConnectError)
+    assert events[1].response.status_code == 503
+    assert no_sleep == [0.5, 1.0]
+
+    # give up after max attempts
+    route.side_effect = [httpx.Response(500, json={"code": 1, "message": "error"})] * 3
+    with pytest.raises(pin.PinterestException):
+        api.user_account.get()
+    assert route.call_count == 6
+
+
+@respx.mock
+def test_api_retry_post(no_sleep):
+    api = pin.Api(access_token="access token", retry_policy=RetryPolicy(jitter=False))
+    route = respx.post(f"{pin.Api.DEFAULT_API_URL}boards")
+    route.side_effect = [
+        httpx.Response(500, json={"code": 1, "message": "error"}),
+        httpx.Response(201, json={"id": "1", "name": "Food"}),
+    ]
+    # POST is not idempotent, not retry.
+    with pytest.raises(pin.PinterestException):
+        api.boards.create(name="Food")
+    assert route.call_count == 1
+
+    # Too many requests is safe to retry, and wait for Retry-After.
+    route.side_effect = [
+        httpx.Response(429, headers={"Retry-After": "2"}, json={"code": 8}),
+        httpx.Response(201, json={"id": "1", "name": "Food"}),
+    ]
+    board = api.boards.create(name="Food")
+    assert board.id == "1"
+    assert no_sleep == [2]
+
+    # marked idempotent
+    route.side_effect = [
+        httpx.Response(500, json={"code": 1, "message": "error"}),
+        httpx.Response(201, json={"id": "1", "name": "Food"}),
+    ]
+    resp = api.request("POST", "boards", json={"name": "Food"}, idempotent=True)
+    assert resp.status_code == 201
+
+
+@respx.mock
+@pytest.mark.asyncio
+async def test_async_api_retry(monkeypatch):
+    async def no_sleep(delay):
+        pass
+
+    monkeypatch.setattr("pinterest.api.asyncio.sleep", no_sleep)
+    api = pin.AsyncApi(access_token="access token", retry_policy=RetryPolicy())
+    route = respx.get(f"{pin.Api.DEFAULT_API_URL}user_account")
+    route.side_effect = [
+        httpx.ReadTimeout("timeout"),
+        httpx.Response(200, json={"username": "merleliukun"}),
+    ]
+    user = await api.user_account.get()
+    assert user.username == "merleliukun"
+    assert route.call_count == 2
@@ -0,0 +1,91 @@
+"""
+    Tests for single flight requests
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+import respx
+
+import pinterest as pin
+
+
+@respx.mock
+@pytest.mark.asyncio
+async def test_async_single_flight(helpers):
+    api = pin.AsyncApi(access_token="access token", single_flight=True)
+    pin_data = helpers.load_data("tests/data/pins/pin_data.json")
+
+    async def side_effect(request):
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json=pin_data)
+
+    route = respx.get(f"{pin.Api.DEFAULT_API_URL}pins/{pin_data['id']}").mock(
+        side_effect=side_effect
+    )
+    pins = await asyncio.gather(
+        *(api.pins.get(pin_id=pin_data["id"]) for _ in range(10))
+    )
+    assert route.call_count == 1
+    assert all(p.id == pin_data["id"] for p in pins)
+
+    # not merged when the first request is finished
+    await api.pins.get(pin_id=pin_data["id"])
+    assert route.call_count == 2
+
+    async def error_side_effect(request):
+        await asyncio.sleep(0.01)
+        raise httpx.ConnectError("connection reset")
+
+    route.mock(side_effect=error_side_effect)
+    results = await asyncio.gather(
+        *(api.pins.get(pin_id=pin_data["id"]) for _ in range(3)),
+        return_exceptions=True,
+    )
+    assert route.call_count == 3
+    assert all(isinstance(r, Exception) for r in results)
+
+
+@respx.mock
+@pytest.mark.asyncio
+async def test_async_single_flight_leader_cancelled(helpers):
+    api = pin.AsyncApi(access_token="access token", single_flight=True)
+    pin_data = helpers.load_data("tests/data/pins/pin_data.json")
+
+    sent = []
+
+    async def side_effect(request):
+        sent.append(request)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json=pin_data)
+
+    respx.get(f"{pin.Api.DEFAULT_API_URL}pins/{pin_data['id']}").mock(
+        side_effect=side_effect
+    )
+    leader = asyncio.ensure_future(api.pins.get(pin_id=pin_data["id"]))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(api.pins.get(pin_id=pin_data["id"]))
+    await asyncio.sleep(0)
+    leader.cancel()
+    p = await follower
+    assert p.id == pin_data["id"]
+    assert len(sent) == 2
+
+
+@respx.mock
+def test_single_flight(helpers):
+    api = pin.Api(access_token="access token", single_flight=True)
+    pin_data = helpers.load_data("tests/data/pins/pin_data.json")
+
+    def side_effect(request):
+        time.sleep(0.05)
+        return httpx.Response(200, json=pin_data)
+
+    route = respx.get(f"{pin.Api.DEFAULT_API_URL}pins/{pin_data['id']}").mock(
+        side_effect=side_effect
+    )
+    pins = api.pins.get_many(pin_ids=[pin_data["id"]] * 5, concurrency=5)
+    assert route.call_count == 1
+    assert all(p.id == pin_data["id"] for p in pins)
@@ -0,0 +1,163 @@
+"""
+    Tests for incremental analytics sync
+"""
+
+from datetime import date
+
+import httpx
+import pytest
+import respx
+
+import pinterest as pin
+from pinterest.watermark import (
+    WatermarkStore,
+    analytics_statuses,
+    is_final,
+    settled_statuses,
+    watermark_key,
+)
+
+
+def test_is_final():
+    assert is_final("READY")
+    assert is_final("BEFORE_DATA_RETENTION_PERIOD")
+    assert not is_final("ESTIMATE")
+    assert not is_final("PROCESSING")
+    assert not is_final(None)
+
+
+def test_watermark_key():
+    assert watermark_key("user_account/analytics") == "user_account/analytics"
+    assert watermark_key("a", {"x": 1, "concurrency": 2}) == watermark_key(
+        "a", {"x": 1}
+    )
+    assert watermark_key("a", {"x": 1}) != watermark_key("a", {"x": 2})
+
+
+def test_statuses(helpers):
+    data = helpers.load_data("tests/data/user_account/analytics.json")
+    assert analytics_statuses(data) == {
+        "2022-08-09": "READY",
+        "2022-08-10": "PROCESSING",
+        "2022-08-11": "PROCESSING",
+    }
+    assert settled_statuses(
+        "2022-08-01", "2022-08-03", settle_days=2, today=date(2022, 8, 4)
+    ) == {
+        "2022-08-01": "READY",
+        "2022-08-02": "READY",
+        "2022-08-03": "ESTIMATE",
+    }
+
+
+def test_statuses_gap():
+    # No daily metrics for the days without activity.
+    data = {
+        "all": {
+            "daily_metrics": [
+                {"date": "2022-08-01", "data_status": "READY"},
+                {"date": "2022-08-03", "data_status": "READY"},
+            ]
+        }
+    }
+    statuses = analytics_statuses(
+        data, "2022-08-01", "2022-08-04", settle_days=30, today=date(2022, 8, 10)
+    )
+    assert statuses == {
+        "2022-08-01": "READY",
+        "2022-08-02": "ESTIMATE",
+        "2022-08-03": "READY",
+        "2022-08-04": "ESTIMATE",
+    }
+    store = WatermarkStore()
+    store.record("a", statuses)
+    assert store.pending_range("a", "2022-08-01", "2022-08-04") == (
+        "2022-08-02",
+        "2022-08-04",
+    )
+
+    # The missing days are final once they are settled.
+    store.record(
+        "a",
+        analytics_statuses(
+            data, "2022-08-01", "2022-08-04", settle_days=30, today=date(2022, 9, 30)
+        ),
+    )
+    assert store.pending_range("a", "2022-08-01", "2022-08-04") is None
+
+
+def test_store(tmp_path):
+    path = str(tmp_path / "watermarks.db")
+    store = WatermarkStore(path)
+    assert store.pending_range("a", "2022-08-01", "2022-08-05") == (
+        "2022-08-01",
+        "2022-08-05",
+    )
+    store.record("a", {"2022-08-01": "READY", "2022-08-02": "READY"})
+    store.record("a", {"2022-08-03": "ESTIMATE"})
+
+    store = WatermarkStore(path)
+    assert store.pending_range("a", "2022-08-01", "2022-08-05") == (
+        "2022-08-03",
+        "2022-08-05",
+    )
+    assert store.pending_range("a", "2022-08-01", "2022-08-02") is None
+    assert store.last_synced("a") == "2022-08-02"
+    assert store.last_synced("a", final=False) == "2022-08-03"
+    assert store.entities() == ["a"]
+    store.clear("a")
+    assert store.entities() == []
+
+
+@respx.mock
+def test_sync_analytics(api, helpers):
+    route = respx.get(f"{pin.Api.DEFAULT_API_URL}user_account/analytics").respond(
+        status_code=200,
+        json=helpers.load_data("tests/data/user_account/analytics.json"),
+    )
+    store = WatermarkStore()
+    analytics = api.user_account.sync_analytics(
+        store, start_date="2022-08-09", end_date="2022-08-11"
+    )
+    assert len(analytics.all.daily_metrics) == 3
+    analytics = api.user_account.sync_analytics(
+        store, start_date="2022-08-09", end_date="2022-08-11"
+    )
+    assert route.calls.last.request.url.params["start_date"] == "2022-08-10"
+    assert route.call_count == 2
+
+    store.record(
+        watermark_key("user_account/analytics"),
+        {"2022-08-10": "READY", "2022-08-11": "READY"},
+    )
+    assert (
+        api.user_account.sync_analytics(
+            store, start_date="2022-08-09", end_date="2022-08-11"
+        )
+        is None
+    )
+    assert route.call_count == 2
+
+
+@respx.mock
+@pytest.mark.asyncio
+async def test_async_sync_ad_analytics(async_api):
+    route = respx.get(
+        f"{pin.Api.DEFAULT_API_URL}ad_accounts/549755885175/ads/analytics"
+    ).mock(
+        side_effect=lambda request: httpx.Response(
+            200, json=[{"AD_ID": "1", "DATE": "2022-08-01", "SPEND_IN_DOLLAR": 1}]
+        )
+    )
+    store = WatermarkStore()
+    kwargs = dict(
+        ad_account_id="549755885175",
+        ad_ids=["1"],
+        start_date="2022-08-01",
+        end_date="2022-08-02",
+        columns="SPEND_IN_DOLLAR",
+    )
+    rows = await async_api.ad_accounts.sync_ad_analytics(store, **kwargs)
+    assert rows[0]["AD_ID"] == "1"
+    assert await async_api.ad_accounts.sync_ad_analytics(store, **kwargs) == []
+    assert route.call_count == 1